@@ -1,33 +1,28 @@
-const fs = require('fs-extra');
-const path = require('path');
 const cheerio = require('cheerio');
+const { listSavedPages, readSavedPage } = require('./saved-pages');
 
 async function analyzeSavedFiles() {
   console.log('🔍 Analyzing saved HTML files...');
   
-  const dataDir = path.join(__dirname, '../data');
-  
   try {
-    // Получаем список всех HTML файлов
-    const files = await fs.readdir(dataDir);
-    const htmlFiles = files.filter(file => file.endsWith('.html'));
+    // Последние снимки всех сохраненных страниц из хранилища
+    const pages = listSavedPages();
     
-    if (htmlFiles.length === 0) {
-      console.log('❌ No HTML files found in data directory');
+    if (pages.length === 0) {
+      console.log('❌ No saved pages found in snapshot store');
       return;
     }
     
-    console.log(`📁 Found ${htmlFiles.length} HTML files:`);
-    htmlFiles.forEach((file, index) => {
-      console.log(`   ${index + 1}. ${file}`);
+    console.log(`📁 Found ${pages.length} saved pages:`);
+    pages.forEach((page, index) => {
+      console.log(`   ${index + 1}. ${page.name}`);
     });
     
-    // Анализируем каждый файл
-    for (const file of htmlFiles) {
-      console.log(`\n📄 Analyzing: ${file}`);
+    // Анализируем каждую страницу
+    for (const page of pages) {
+      console.log(`\n📄 Analyzing: ${page.name}`);
       
-      const filePath = path.join(dataDir, file);
-      const content = await fs.readFile(filePath, 'utf-8');
+      const content = readSavedPage(page);
       
       console.log(`📊 Size: ${(content.length / 1024).toFixed(2)} KB`);
       
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Бенчмарк fetch-бэкендов на локальном сервере с записанными страницами.
+
+Страницы листинга отдает meshok_fetch.fixture_server (последние снимки из
+хранилища или --synthetic), бэкенды направляются на него через
+MESHOK_BASE_URL, настоящий сайт не трогается. Каждый бэкенд и уровень
+конкурентности запускается в отдельном процессе; измеряются p50/p95
+задержки запроса, байты на проводе (считает сервер, включая прогревочные
+запросы бэкенда), CPU процесса с потомками и пиковый RSS дерева процессов
+(для браузерных бэкендов - вместе с Chrome).
+
+    python3 scripts/bench-backends.py --synthetic
+    python3 scripts/bench-backends.py -b session httpx -c 1 8 --requests 50
+    python3 scripts/bench-backends.py --output data/bench/backends.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from meshok_fetch.backends import BACKENDS
+from meshok_fetch.fixture_server import FixtureServer, snapshot_pages, synthetic_pages
+
+WORKER = '''
+import json, os, resource, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from meshok_fetch.backends import load_backend
+from meshok_fetch.browser_pool import process_tree_rss_mb
+from meshok_fetch.common import build_url
+
+backend, concurrency, requests = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+category_ids = sys.argv[4].split(',')
+report = sys.stdout
+sys.stdout = open(os.devnull, 'w')  # прогресс бэкендов не нужен
+
+peak = [0.0]
+stop = threading.Event()
+def sample():
+    while not stop.wait(0.05):
+        peak[0] = max(peak[0], process_tree_rss_mb(os.getpid()))
+threading.Thread(target=sample, daemon=True).start()
+
+try:
+    module = load_backend(backend)
+except ImportError as e:
+    print(json.dumps({'missing': str(e)}), file=report)
+    sys.exit(0)
+
+pool = None
+if getattr(module, 'SUPPORTS_BROWSER_POOL', False):
+    from meshok_fetch.browser_pool import BrowserPool
+    pool = BrowserPool(module.start_driver, concurrency)
+options = {'pool': pool} if pool else {}
+latencies, errors = [], []
+
+def fetch_one(i):
+    started = time.perf_counter()
+    try:
+        module.fetch_page(build_url(category_ids[i % len(category_ids)]), **options)
+    except Exception as e:
+        errors.append(f'{type(e).__name__}: {e}')
+        return
+    latencies.append(time.perf_counter() - started)
+
+started = time.perf_counter()
+with ThreadPoolExecutor(concurrency) as executor:
+    list(executor.map(fetch_one, range(requests)))
+wall = time.perf_counter() - started
+if pool:
+    pool.close()
+stop.set()
+peak[0] = max(peak[0], process_tree_rss_mb(os.getpid()),
+              resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+print(json.dumps({'latencies': latencies, 'errors': errors[:5], 'failed': len(errors),
+                  'wall_s': wall, 'peak_rss_mb': peak[0]}), file=report)
+'''
+
+CATEGORY_RE = re.compile(r'^/good/([^/?]+)')
+
+
+def percentile(values, q):
+    """Перцентиль по ближайшему рангу; None для пустого списка"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+
+def _ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def _cpu_children():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_level(server, name, concurrency, requests, category_ids, timeout):
+    """Один бэкенд на одном уровне конкурентности в отдельном процессе"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Свой пустой DATA_DIR на каждый прогон: он не пишет в хранилище проекта, а cookies
+        # и HTTP-кэш предыдущего бэкенда не достаются следующему (не экономят ему прогрев);
+        # лимиты планировщика сняты - измеряется цена бэкенда, а не вежливость
+        env = dict(os.environ, MESHOK_BASE_URL=server.url, MESHOK_DATA_DIR=data_dir,
+                   MESHOK_RATE='0', MESHOK_MAX_IN_FLIGHT='0')
+        server.take_stats()
+        cpu_before = _cpu_children()
+        try:
+            result = subprocess.run([sys.executable, '-c', WORKER, name, str(concurrency), str(requests),
+                                     ','.join(category_ids)],
+                                    capture_output=True, text=True, cwd=script_dir, env=env, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'error': f'timed out after {timeout}s'}
+    cpu = _cpu_children() - cpu_before
+    traffic = server.take_stats()
+    if result.returncode != 0:
+        return {'error': (result.stderr.strip().splitlines() or ['worker failed'])[-1]}
+    data = json.loads(result.stdout)
+    if 'missing' in data:
+        return data
+
+    latencies = data['latencies']
+    ok = len(latencies)
+    return {
+        'requests': requests,
+        'ok': ok,
+        'failed': data['failed'],
+        'errors': data['errors'],
+        'p50_ms': _ms(percentile(latencies, 50)),
+        'p95_ms': _ms(percentile(latencies, 95)),
+        'throughput_rps': ok / data['wall_s'] if data['wall_s'] else None,
+        'http_requests': traffic['requests'],
+        'wire_bytes': traffic['bytes'],
+        'wire_bytes_per_page': traffic['bytes'] / ok if ok else None,
+        'cpu_s': cpu,
+        'cpu_ms_per_page': cpu * 1000 / ok if ok else None,
+        'peak_rss_mb': data['peak_rss_mb']
+    }
+
+
+def browser_available():
+    from meshok_fetch.browser_probe import probe
+
+    chrome = probe()['chrome']
+    return bool(chrome and chrome['headless'])
+
+
+def load_pages(args):
+    if args.synthetic:
+        return synthetic_pages(lots=args.lots), 'synthetic'
+    pages = snapshot_pages(category_id=args.category)
+    if not pages:
+        sys.exit('❌ No snapshots recorded; fetch some pages first or use --synthetic')
+    return pages, 'snapshots'
+
+
+def print_results(report):
+    print(f"🧪 {report['pages']} {report['source']} pages, {report['requests']} requests per level")
+    for name, levels in report['results'].items():
+        for concurrency, r in levels.items():
+            label = f'{name} x{concurrency}'
+            if 'missing' in r:
+                print(f"⏭️  {label}: skipped ({r['missing']})")
+            elif 'error' in r:
+                print(f"❌ {label}: {r['error']}")
+            elif not r['ok']:
+                print(f"❌ {label}: all {r['failed']} requests failed ({r['errors'][0]})")
+            else:
+                failed = f", {r['failed']} failed" if r['failed'] else ''
+                print(f"⏱️  {label:<22} p50 {r['p50_ms']:8.1f} ms  p95 {r['p95_ms']:8.1f} ms  "
+                      f"{r['throughput_rps']:7.1f} req/s  {r['wire_bytes_per_page'] / 1024:7.1f} KB/page "
+                      f"({r['http_requests']} HTTP)  CPU {r['cpu_ms_per_page']:7.1f} ms/page  "
+                      f"RSS {r['peak_rss_mb']:6.1f} MB{failed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fetch backends against a local fixture server')
+    parser.add_argument('-b', '--backends', nargs='+', choices=sorted(BACKENDS), default=list(BACKENDS))
+    parser.add_argument('-c', '--concurrency', nargs='+', type=int, default=[1, 4, 8])
+    parser.add_argument('--requests', type=int, default=20, help='page fetches per backend and level')
+    parser.add_argument('--category', help='serve only snapshots of this category')
+    parser.add_argument('--synthetic', action='store_true', help='serve a synthetic listing instead of snapshots')
+    parser.add_argument('--lots', type=int, default=50, help='lots per synthetic page')
+    parser.add_argument('--timeout', type=int, default=600, help='seconds per backend and level')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    parser.add_argument('--output', help='also write JSON results to this file')
+    args = parser.parse_args()
+
+    pages, source = load_pages(args)
+    category_ids = sorted({CATEGORY_RE.match(target)[1] for target in pages if CATEGORY_RE.match(target)})
+    browsers = None
+    report = {
+        'timestamp': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'source': source,
+        'pages': len(pages),
+        'page_bytes': sum(len(data) for data in pages.values()),
+        'requests': args.requests,
+        'results': {}
+    }
+
+    with FixtureServer(pages) as server:
+        for name in args.backends:
+            levels = report['results'][name] = {}
+            if 'selenium' in BACKENDS[name].requires:
+                if browsers is None:
+                    browsers = browser_available()
+                if not browsers:
+                    levels.update({str(c): {'missing': 'headless Chrome not available (check:chrome)'}
+                                   for c in args.concurrency})
+                    continue
+            for concurrency in args.concurrency:
+                started = time.perf_counter()
+                levels[str(concurrency)] = run_level(server, name, concurrency, args.requests,
+                                                     category_ids, args.timeout)
+                if not args.json:
+                    print(f'✅ {name} x{concurrency} done in {time.perf_counter() - started:.1f}s',
+                          file=sys.stderr)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_results(report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Экономия трафика от профилей блокировки ресурсов в браузерных бэкендах.
+
+Каждая страница загружается в одном Chrome дважды с выключенным кэшем:
+без блокировки и с выбранным профилем. Разница принятых байтов - экономия
+на странице; время до готовности списка лотов показывает выигрыш рендера.
+
+    python3 scripts/bench-blocking.py 252 1106
+    python3 scripts/bench-blocking.py 252 --profile strict --backend undetected --json
+"""
+
+import argparse
+import json
+import sys
+
+from meshok_fetch.backends import load_backend
+from meshok_fetch.common import BLOCK_PROFILES, build_url
+
+
+def measure(driver, url, profile, timeout):
+    from meshok_fetch.backends._chrome import load_page
+
+    result = load_page(driver, url, max_wait=timeout, block=profile)
+    return {
+        'bytes': result.meta.get('browser_bytes', 0),
+        'blocked': sum(result.meta.get('blocked', {}).values()),
+        'ready_s': round(result.meta['elapsed'], 3),
+        'state': result.meta['ready']
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure bytes saved by a resource blocking profile')
+    parser.add_argument('categories', nargs='*', default=['252'])
+    parser.add_argument('--profile', choices=sorted(set(BLOCK_PROFILES) - {'off'}), default='media')
+    parser.add_argument('--backend', choices=['selenium', 'undetected', 'undetected_fixed'], default='selenium')
+    parser.add_argument('--timeout', type=int, default=120)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    module = load_backend(args.backend)
+    driver = module.start_driver()
+    pages = []
+    try:
+        # Кэш выключен, иначе вторая загрузка получила бы ресурсы первой бесплатно
+        driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        for category_id in args.categories:
+            url = build_url(category_id)
+            full = measure(driver, url, 'off', args.timeout)
+            blocked = measure(driver, url, args.profile, args.timeout)
+            pages.append({'category_id': category_id, 'url': url, 'off': full, args.profile: blocked,
+                          'saved_bytes': full['bytes'] - blocked['bytes']})
+    finally:
+        driver.quit()
+
+    if args.json:
+        print(json.dumps({'backend': args.backend, 'profile': args.profile, 'pages': pages}, indent=2))
+        return 0
+
+    print(f'🌐 {args.backend}, profile {args.profile!r}:')
+    for page in pages:
+        full, blocked = page['off'], page[args.profile]
+        share = page['saved_bytes'] / full['bytes'] * 100 if full['bytes'] else 0
+        print(f"📄 {page['category_id']}: {full['bytes'] / 1024:8.1f} KB -> {blocked['bytes'] / 1024:8.1f} KB "
+              f"(saved {page['saved_bytes'] / 1024:.1f} KB, {share:.0f}%), "
+              f"{blocked['blocked']} requests blocked, ready {full['ready_s']:.2f}s -> {blocked['ready_s']:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Сравнение запуска fetch на каждый вызов с запросами к резидентному демону.
+
+Листинг отдает локальный meshok_fetch.fixture_server, демон запускается
+в отдельном процессе с временным DATA_DIR. Для каждого бэкенда
+измеряются: холодный вызов (`python3 -m meshok_fetch --json`, новый
+интерпретатор и соединения), теплый fetch через сокет демона и накладные
+расходы диспетчеризации (RPC status без загрузки).
+
+    python3 scripts/bench-daemon.py
+    python3 scripts/bench-daemon.py -b session httpx --requests 100 --cold 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from meshok_fetch.backends import BACKENDS
+from meshok_fetch.daemon import Client
+from meshok_fetch.fixture_server import FixtureServer, synthetic_pages
+
+START_TIMEOUT = 15
+
+
+def percentile(values, q):
+    """Перцентиль по ближайшему рангу"""
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))]
+
+
+def timed_calls(call, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def start_daemon(socket_path, env, backends):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, '-m', 'meshok_fetch.daemon', '--socket', socket_path, 'serve',
+                                '--preload', *backends],
+                               cwd=script_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'daemon exited: {process.stderr.read().decode().strip()}')
+        try:
+            Client(socket_path).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f'daemon did not listen on {socket_path} within {START_TIMEOUT}s')
+
+
+def cold_call(backend, env):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run([sys.executable, '-m', 'meshok_fetch', '252', '-b', backend, '--json', '--no-save'],
+                            cwd=script_dir, env=env, capture_output=True, text=True)
+    record = json.loads(result.stdout)
+    if not record['ok']:
+        raise RuntimeError(f"{backend}: {record['error']}")
+
+
+def print_row(label, latencies):
+    print(f'⏱️  {label:<28} p50 {percentile(latencies, 50) * 1000:8.2f} ms  '
+          f'p95 {percentile(latencies, 95) * 1000:8.2f} ms  ({len(latencies)} calls)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-call fetch processes against the fetch daemon')
+    parser.add_argument('-b', '--backends', nargs='+', choices=sorted(BACKENDS), default=['session', 'httpx'])
+    parser.add_argument('--requests', type=int, default=50, help='warm fetches through the daemon per backend')
+    parser.add_argument('--cold', type=int, default=5, help='fresh-process fetches per backend')
+    args = parser.parse_args()
+
+    with FixtureServer(synthetic_pages()) as server, tempfile.TemporaryDirectory() as data_dir:
+        socket_path = os.path.join(data_dir, 'meshok_fetch.sock')
+        # Лимиты планировщика сняты: измеряется цена вызова, а не вежливость
+        env = dict(os.environ, MESHOK_BASE_URL=server.url, MESHOK_DATA_DIR=data_dir, MESHOK_RATE='0',
+                   MESHOK_MAX_IN_FLIGHT='0')
+        daemon = start_daemon(socket_path, env, args.backends)
+        try:
+            with Client(socket_path) as client:
+                print_row('RPC dispatch (status)', timed_calls(lambda: client.call('status'), args.requests))
+                for backend in args.backends:
+                    params = {'category_id': '252', 'backend': backend, 'save': False}
+                    record = client.call('fetch', params)
+                    if not record['ok']:
+                        print(f"⏭️  {backend}: skipped ({record['error']['type']}: {record['error']['message']})")
+                        continue
+                    print_row(f'{backend} cold process', timed_calls(lambda: cold_call(backend, env), args.cold))
+                    print_row(f'{backend} daemon', timed_calls(lambda: client.call('fetch', params), args.requests))
+        finally:
+            daemon.terminate()
+            daemon.wait(10)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
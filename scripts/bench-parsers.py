@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Бенчмарк движков разбора meshok_fetch.parsers.
+
+Для каждого установленного движка в отдельном процессе измеряются
+медианное время разбора одной страницы, пик Python-аллокаций
+(tracemalloc) и прирост пикового RSS (учитывает и C-память lxml/selectolax).
+
+    python3 scripts/bench-parsers.py                 # синтетическая страница
+    python3 scripts/bench-parsers.py page.html
+    python3 scripts/bench-parsers.py --category 252  # последний снимок категории
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from meshok_fetch.fixture_server import synthetic_page
+from meshok_fetch.parsers import ENGINES, available_engines
+
+PROBE = '''
+import json, resource, statistics, sys, time, tracemalloc
+from meshok_fetch.parsers import load_engine
+engine = load_engine(sys.argv[1])
+with open(sys.argv[2], 'rb') as f:
+    content = f.read()
+if not getattr(engine, 'ACCEPTS_BYTES', False):
+    content = content.decode('utf-8')
+runs = int(sys.argv[3])
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+engine.extract(content)
+times = []
+for _ in range(runs):
+    t = time.perf_counter()
+    summary = engine.extract(content)
+    times.append((time.perf_counter() - t) * 1000)
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+engine.extract(content)
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({
+    'median_ms': statistics.median(times),
+    'min_ms': min(times),
+    'py_peak_kb': peak / 1024,
+    'rss_growth_kb': rss_after - rss_before,
+    'item_links': len(summary['item_links']),
+    'prices': len(summary['prices'])
+}))
+'''
+
+
+def load_page(args):
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            return f.read(), args.file
+    if args.category:
+        from meshok_fetch.storage import default_store
+
+        store = default_store()
+        entry = store.latest(args.category)
+        if entry is None:
+            sys.exit(f'❌ No snapshots for category {args.category}')
+        return store.get(entry['hash']), f"snapshot {entry['hash'][:12]}"
+    return synthetic_page(args.lots), f'synthetic page with {args.lots} lots'
+
+
+def bench(path, engines, runs):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name in engines:
+        result = subprocess.run([sys.executable, '-c', PROBE, name, path, str(runs)],
+                                capture_output=True, text=True, cwd=script_dir)
+        if result.returncode != 0:
+            results[name] = {'error': result.stderr.strip().splitlines()[-1]}
+        else:
+            results[name] = json.loads(result.stdout)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parser engines')
+    parser.add_argument('file', nargs='?', help='HTML file to parse')
+    parser.add_argument('--category', help='use the latest stored snapshot of this category')
+    parser.add_argument('--lots', type=int, default=2000, help='lots on the synthetic page')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    content, source = load_page(args)
+    engines = available_engines()
+    with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as f:
+        f.write(content)
+    try:
+        results = bench(f.name, engines, args.runs)
+    finally:
+        os.remove(f.name)
+
+    if args.json:
+        print(json.dumps({'source': source, 'size': len(content), 'results': results}, indent=2))
+        return
+
+    print(f'📄 {source}: {len(content) / 1024:.2f} KB, {args.runs} runs per engine')
+    for name in ENGINES:
+        if name not in results:
+            print(f'⏭️  {name}: not installed')
+            continue
+        r = results[name]
+        if 'error' in r:
+            print(f"❌ {name}: {r['error']}")
+            continue
+        print(f"⏱️  {name:<11} {r['median_ms']:8.2f} ms median  {r['py_peak_kb']:9.0f} KB py peak  "
+              f"{r['rss_growth_kb']:7d} KB RSS growth  ({r['item_links']} links, {r['prices']} prices)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,114 +1,64 @@
 #!/usr/bin/env python3
+"""Проверка Chrome и ChromeDriver для браузерных бэкендов.
 
+Результат кэшируется (data/browser-probe.json) и пересчитывается, только
+когда бинарники Chrome или ChromeDriver изменились; --refresh - принудительно.
+
+    python3 scripts/check-chrome.py
+    python3 scripts/check-chrome.py --refresh --json
+"""
+
+import argparse
+import json
 import sys
-import os
-import subprocess
-import shutil
 
-def check_chrome():
-    print('🔍 Checking Chrome installation...')
-    
-    # Проверяем, где находится Chrome
-    chrome_paths = [
-        '/usr/bin/google-chrome',
-        '/usr/bin/google-chrome-stable',
-        '/usr/bin/chromium-browser',
-        '/usr/bin/chromium',
-        '/snap/bin/chromium',
-        '/usr/bin/chrome',
-        '/opt/google/chrome/chrome'
-    ]
-    
-    chrome_found = False
-    chrome_path = None
-    
-    for path in chrome_paths:
-        if os.path.exists(path):
-            print(f'✅ Found Chrome at: {path}')
-            chrome_found = True
-            chrome_path = path
-            break
-    
-    if not chrome_found:
-        print('❌ Chrome not found in standard locations')
-        
-        # Пробуем найти через which
-        try:
-            result = subprocess.run(['which', 'google-chrome'], capture_output=True, text=True)
-            if result.returncode == 0:
-                chrome_path = result.stdout.strip()
-                print(f'✅ Found Chrome via which: {chrome_path}')
-                chrome_found = True
-        except:
-            pass
-        
-        try:
-            result = subprocess.run(['which', 'chromium-browser'], capture_output=True, text=True)
-            if result.returncode == 0:
-                chrome_path = result.stdout.strip()
-                print(f'✅ Found Chromium via which: {chrome_path}')
-                chrome_found = True
-        except:
-            pass
-    
-    if not chrome_found:
+from meshok_fetch.browser_probe import probe
+
+
+def print_probe(report):
+    print('🔍 Checking Chrome installation...' + (' (cached)' if report['cached'] else ''))
+    chrome = report['chrome']
+    if chrome is None:
         print('❌ Chrome not found anywhere')
-        return False
-    
-    # Проверяем версию Chrome
-    try:
-        result = subprocess.run([chrome_path, '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f'📊 Chrome version: {result.stdout.strip()}')
+    else:
+        print(f"✅ Found Chrome at: {chrome['path']}")
+        if chrome['version']:
+            print(f"📊 Chrome version: {chrome['version']}")
         else:
-            print(f'⚠️  Could not get Chrome version: {result.stderr}')
-    except Exception as e:
-        print(f'⚠️  Error getting Chrome version: {e}')
-    
-    # Проверяем, можем ли запустить Chrome в headless режиме
-    try:
-        print('🧪 Testing Chrome headless mode...')
-        result = subprocess.run([
-            chrome_path,
-            '--headless',
-            '--no-sandbox',
-            '--disable-gpu',
-            '--disable-dev-shm-usage',
-            '--dump-dom',
-            'https://example.com'
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
+            print(f"⚠️  Could not get Chrome version: {chrome['version_error']}")
+        if chrome['headless']:
             print('✅ Chrome headless mode works')
-            print(f'📊 Output size: {len(result.stdout)} characters')
         else:
-            print(f'❌ Chrome headless mode failed: {result.stderr}')
-    except subprocess.TimeoutExpired:
-        print('⚠️  Chrome headless test timed out')
-    except Exception as e:
-        print(f'❌ Error testing Chrome: {e}')
-    
-    # Проверяем ChromeDriver
+            print(f"❌ Chrome headless mode failed: {chrome['headless_error']}")
+
     print('\n🔍 Checking ChromeDriver...')
-    try:
-        result = subprocess.run(['chromedriver', '--version'], capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f'✅ ChromeDriver found: {result.stdout.strip()}')
-        else:
-            print('❌ ChromeDriver not found')
-    except:
+    driver = report['chromedriver']
+    if driver and driver['version']:
+        print(f"✅ ChromeDriver found: {driver['version']}")
+    elif driver:
+        print(f"⚠️  ChromeDriver at {driver['path']} failed: {driver['version_error']}")
+    else:
         print('❌ ChromeDriver not found')
-    
-    # Проверяем, какие браузеры доступны
+
     print('\n🔍 Available browsers:')
-    browsers = ['google-chrome', 'chromium-browser', 'chromium', 'firefox', 'safari']
-    for browser in browsers:
-        if shutil.which(browser):
-            print(f'✅ {browser}: {shutil.which(browser)}')
-        else:
-            print(f'❌ {browser}: not found')
-    
-    return chrome_found
+    for name, path in report['browsers'].items():
+        print(f'✅ {name}: {path}' if path else f'❌ {name}: not found')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check Chrome and ChromeDriver for browser backends')
+    parser.add_argument('--refresh', action='store_true', help='ignore the cached probe result')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    report = probe(refresh=args.refresh)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_probe(report)
+    chrome = report['chrome']
+    return 0 if chrome and chrome['headless'] else 1
+
 
 if __name__ == '__main__':
-    check_chrome()
+    sys.exit(main())
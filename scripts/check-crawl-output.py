@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Проверка, что stdout обхода (--crawl) остается чистым NDJSON.
+
+Локальный сервер с синтетическим листингом отвечает на одну из страниц
+ошибкой (500 - повтор политикой retry, 429 - пауза планировщика), после
+чего отдает ее как обычно. Каждая строка stdout должна разбираться как
+запись лота, число лотов - совпасть с обходом без ошибок, а сообщения о
+повторе и паузе - уйти в stderr.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from meshok_fetch.common import build_url
+from meshok_fetch.fixture_server import FixtureServer, _target, synthetic_pages
+
+PAGES = 5
+LOTS = 50
+
+# Имя проверки -> (страница, статусы перед ней, маркер сообщения в stderr)
+FAULTS = {
+    'clean': (None, [], None),
+    'retry': (2, [500], '🔁'),
+    'throttle': (3, [429], '⏳')
+}
+
+
+def run(server, page, statuses, env):
+    server.faults.clear()
+    if page is not None:
+        server.faults[_target(build_url('252', True, page))] = list(statuses)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return subprocess.run([sys.executable, '-m', 'meshok_fetch', '252', '--crawl', '-c', '1', '--no-save'],
+                          capture_output=True, text=True, cwd=script_dir, env=env)
+
+
+def invalid_lines(stdout):
+    """Строки stdout, которые не являются записью лота"""
+    bad = []
+    for line in stdout.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            bad.append(line)
+            continue
+        if not isinstance(record, dict) or 'item_id' not in record:
+            bad.append(line)
+    return bad
+
+
+def check_crawl_output():
+    print('🧾 Checking that --crawl stdout stays NDJSON through retries and throttling...')
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp, FixtureServer(synthetic_pages(lots=LOTS, pages=PAGES)) as server:
+        env = dict(os.environ, MESHOK_DATA_DIR=tmp, MESHOK_BASE_URL=server.url, MESHOK_RATE='0')
+        for name, (page, statuses, marker) in FAULTS.items():
+            result = run(server, page, statuses, env)
+            bad = invalid_lines(result.stdout)
+            count = len(result.stdout.splitlines())
+            if result.returncode != 0:
+                failures += 1
+                print(f'❌ {name}: exit code {result.returncode}: {result.stderr.strip()}')
+            elif bad:
+                failures += 1
+                print(f'❌ {name}: {len(bad)} non-NDJSON lines on stdout, first: {bad[0][:80]!r}')
+            elif count != PAGES * LOTS:
+                failures += 1
+                print(f'❌ {name}: {count} lots instead of {PAGES * LOTS}')
+            elif marker and marker not in result.stderr:
+                failures += 1
+                print(f'❌ {name}: fault was not exercised (no {marker} message on stderr)')
+            else:
+                print(f'✅ {name}: {count} NDJSON lots on stdout')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_crawl_output() else 0)
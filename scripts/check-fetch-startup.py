@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Проверка бюджета времени старта для каждого бэкенда meshok_fetch.
+
+Каждый бэкенд импортируется в отдельном чистом интерпретаторе, берется
+лучшее время из нескольких запусков и сравнивается с startup_budget_ms
+из реестра. Дополнительно проверяется, что бэкенд не тянет чужие тяжелые
+зависимости (selenium, bs4, httpx, ...).
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from meshok_fetch.backends import BACKENDS
+
+HEAVY_MODULES = ('selenium', 'bs4', 'httpx', 'cloudscraper', 'requests', 'undetected_chromedriver')
+RUNS = 5
+
+PROBE = '''
+import json, sys, time
+t = time.perf_counter()
+from meshok_fetch.backends import load_backend
+try:
+    load_backend(sys.argv[1])
+except ImportError as e:
+    print(json.dumps({'missing': str(e)}))
+    sys.exit(0)
+elapsed = (time.perf_counter() - t) * 1000
+heavy = [m for m in sys.argv[2:] if m in sys.modules]
+print(json.dumps({'ms': elapsed, 'heavy': heavy}))
+'''
+
+
+def probe(name):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(RUNS):
+        result = subprocess.run([sys.executable, '-c', PROBE, name, *HEAVY_MODULES],
+                                capture_output=True, text=True, cwd=script_dir)
+        if result.returncode != 0:
+            return {'error': result.stderr.strip().splitlines()[-1]}
+        data = json.loads(result.stdout)
+        if 'missing' in data:
+            return data
+        if best is None or data['ms'] < best['ms']:
+            best = data
+    return best
+
+
+def check_startup():
+    print('⏱️  Checking backend startup budgets...')
+    failures = 0
+
+    for name, backend in BACKENDS.items():
+        data = probe(name)
+        if 'missing' in data:
+            print(f'⏭️  {name}: skipped ({data["missing"]})')
+            continue
+        if 'error' in data:
+            print(f'❌ {name}: {data["error"]}')
+            failures += 1
+            continue
+
+        unexpected = [m for m in data['heavy'] if m not in backend.requires]
+        within = data['ms'] <= backend.startup_budget_ms
+        status = '✅' if within and not unexpected else '❌'
+        print(f'{status} {name}: {data["ms"]:.1f} ms (budget {backend.startup_budget_ms} ms)')
+        if unexpected:
+            print(f'   💡 unexpected heavy imports: {", ".join(unexpected)}')
+        if not within or unexpected:
+            failures += 1
+
+    return failures == 0
+
+
+if __name__ == '__main__':
+    sys.exit(0 if check_startup() else 1)
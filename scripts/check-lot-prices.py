@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Проверка разбора цены карточки лота (meshok_fetch.lots.parse_card_price).
+
+Цена ищется назад от маркера валюты (₽ или "руб"), поэтому числа и слова
+в названии лота не должны ее подменять: "1 рубль 1924 года" с ценой
+"1 500 руб." - это 1500 рублей, а не 1. Карточки проверяются и как HTML
+листинга, и как innerText из браузера (lots_from_cards).
+"""
+
+import sys
+
+from meshok_fetch.lots import MISSING, lots_from_cards, parse_card_price
+
+# Имя проверки -> (HTML карточки, innerText карточки, цена в копейках)
+CASES = {
+    'ruble sign': ('<a href="/item/1">Монета</a><td class="price">1 500 ₽</td>',
+                   'Монета\n1 500 ₽', 150000),
+    'rub abbreviation': ('<a href="/item/1">Монета</a><td class="price">1 500 руб.</td>',
+                         'Монета\n1 500 руб.', 150000),
+    'kopecks': ('<a href="/item/1">Монета</a><td class="price">1 200,50 руб</td>',
+                'Монета\n1 200,50 руб', 120050),
+    'non-breaking spaces': ('<a href="/item/1">Монета</a><td class="price">12&nbsp;000&nbsp;₽</td>',
+                            'Монета\n12\xa0000\xa0₽', 1200000),
+    '"рубль" in title': ('<a href="/item/1">1 рубль 1924 года</a><td class="price">1 500 руб.</td>',
+                         '1 рубль 1924 года\n1 500 руб.', 150000),
+    '"рублей" in title': ('<a href="/item/1">5 рублей 1898 года АГ</a><td class="price">42 000 руб.</td>',
+                          '5 рублей 1898 года АГ\n42 000 руб.', 4200000),
+    'no price': ('<a href="/item/1">1 рубль 1924 года</a><td>нет ставок</td>',
+                 '1 рубль 1924 года\nнет ставок', MISSING)
+}
+
+
+def check_lot_prices():
+    print('💰 Checking lot card price parsing...')
+    failures = 0
+    for name, (html, text, expected) in CASES.items():
+        from_html = parse_card_price(html.encode('utf-8'))
+        from_text = lots_from_cards([(1, '/item/1', None, text, None)])[0].price
+        if from_html == from_text == expected:
+            print(f'✅ {name}: {expected}')
+        else:
+            failures += 1
+            print(f'❌ {name}: html {from_html}, text {from_text}, expected {expected}')
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_lot_prices() else 0)
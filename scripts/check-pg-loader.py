@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Проверка загрузки лотов в Postgres (meshok_fetch.pg_loader) на локальной базе.
+
+Нужны DATABASE_URL и psycopg2; без них проверка пропускается. Лоты
+пишутся под отдельным auction_number и удаляются в конце. Проверяются:
+первая загрузка (все строки вставлены), повторная загрузка тех же записей
+(ничего не меняется) и загрузка с изменениями - в том числе переход
+NULL <-> значение и перенос значения в соседнюю пустую колонку, которые
+должны менять content_hash.
+
+    DATABASE_URL=postgresql://postgres@localhost/wolmar_test python3 scripts/check-pg-loader.py
+"""
+
+import os
+import sys
+
+from meshok_fetch.lots import MISSING, LotTable
+
+END_TIME = 1759505400  # 2025-10-03T15:30:00
+
+
+def make_lots(changed=False):
+    lots = LotTable()
+    # Обычный лот: меняется цена
+    lots.append(900000001, '/item/900000001_coin', 'Монета 1 года', 150050 if changed else 150000, 3, END_TIME,
+                252, 1)
+    # Число ставок появляется: NULL -> значение
+    lots.append(900000002, '/item/900000002_coin', 'Монета 2 года', 20000, 4 if changed else MISSING, END_TIME,
+                252, 1)
+    # Текст переезжает из названия в цену: concat_ws дал бы тот же hash
+    if changed:
+        lots.append(900000003, '/item/900000003_coin', None, 100, MISSING, END_TIME, 252, 1)
+    else:
+        lots.append(900000003, '/item/900000003_coin', '1.00', MISSING, MISSING, END_TIME, 252, 1)
+    return lots
+
+
+def check_pg_loader():
+    print('🐘 Checking Postgres lot loader...')
+    if not os.environ.get('DATABASE_URL'):
+        print('⏭️  skipped: DATABASE_URL is not set')
+        return 0
+    try:
+        from meshok_fetch.pg_loader import connect, ensure_schema, load_lots
+        conn = connect()
+    except ImportError as e:
+        print(f'⏭️  skipped: {e}')
+        return 0
+
+    auction_number = f'meshok-check-{os.getpid()}'
+    steps = [
+        ('first load', make_lots(), (3, 0)),
+        ('reload unchanged', make_lots(), (0, 0)),
+        ('load changed rows', make_lots(changed=True), (0, 3)),
+        ('reload changed', make_lots(changed=True), (0, 0))
+    ]
+    failures = 0
+    try:
+        ensure_schema(conn)
+        for name, lots, expected in steps:
+            counts = load_lots(conn, lots, auction_number=auction_number)
+            if tuple(counts) == expected:
+                print(f'✅ {name}: {counts[0]} inserted, {counts[1]} updated')
+            else:
+                failures += 1
+                print(f'❌ {name}: (inserted, updated) = {tuple(counts)}, expected {expected}')
+
+        with conn.cursor() as cur:
+            cur.execute('SELECT lot_number, coin_description, winning_bid, bids_count FROM auction_lots '
+                        'WHERE auction_number = %s ORDER BY lot_number', (auction_number,))
+            rows = [(lot, title, None if bid is None else str(bid), bids) for lot, title, bid, bids in cur]
+        expected_rows = [('900000001', 'Монета 1 года', '1500.50', 3), ('900000002', 'Монета 2 года', '200.00', 4),
+                         ('900000003', None, '1.00', None)]
+        if rows == expected_rows:
+            print('✅ stored rows match the last load')
+        else:
+            failures += 1
+            print(f'❌ stored rows differ: {rows}')
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute('DELETE FROM auction_lot_urls WHERE auction_number = %s', (auction_number,))
+            cur.execute('DELETE FROM auction_lots WHERE auction_number = %s', (auction_number,))
+        conn.commit()
+        conn.close()
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if check_pg_loader() else 0)
@@ -1,30 +1,25 @@
-const fs = require('fs-extra');
-const path = require('path');
 const cheerio = require('cheerio');
+const { listSavedPages, readSavedPage } = require('./saved-pages');
 
 async function findHiddenApi() {
   console.log('🔍 Searching for hidden API endpoints...');
   
-  const dataDir = path.join(__dirname, '../data');
-  
   try {
-    // Получаем список всех HTML файлов
-    const files = await fs.readdir(dataDir);
-    const htmlFiles = files.filter(file => file.endsWith('.html'));
+    // Последние снимки всех сохраненных страниц из хранилища
+    const pages = listSavedPages();
     
-    if (htmlFiles.length === 0) {
-      console.log('❌ No HTML files found in data directory');
+    if (pages.length === 0) {
+      console.log('❌ No saved pages found in snapshot store');
       return;
     }
     
-    console.log(`📁 Analyzing ${htmlFiles.length} HTML files for API endpoints...`);
+    console.log(`📁 Analyzing ${pages.length} saved pages for API endpoints...`);
     
-    // Анализируем каждый файл
-    for (const file of htmlFiles) {
-      console.log(`\n📄 Analyzing: ${file}`);
+    // Анализируем каждую страницу
+    for (const page of pages) {
+      console.log(`\n📄 Analyzing: ${page.name}`);
       
-      const filePath = path.join(dataDir, file);
-      const content = await fs.readFile(filePath, 'utf-8');
+      const content = readSavedPage(page);
       
       // Поиск API endpoints
       const apiPatterns = [
@@ -0,0 +1,146 @@
+#!/usr/bin/env node
+
+// Клиент резидентного fetch-демона (python3 -m scripts.meshok_fetch.daemon serve).
+// Одно соединение с Unix-сокетом на клиент, запросы JSON-RPC идут конкурентно.
+//
+//   const { MeshokFetchClient } = require('./meshok-fetch-client');
+//   const client = new MeshokFetchClient();
+//   const page = await client.fetch('252', { backend: 'httpx' });
+//   console.log(page.lot_count, page.snapshot);
+//   client.close();
+//
+//   node scripts/meshok-fetch-client.js fetch 252 --backend httpx
+//   node scripts/meshok-fetch-client.js status
+
+const net = require('net');
+const path = require('path');
+
+const DEFAULT_SOCKET = process.env.MESHOK_SOCKET ||
+  path.join(process.env.MESHOK_DATA_DIR || 'data', 'meshok_fetch.sock');
+
+class MeshokFetchClient {
+  constructor(socketPath = DEFAULT_SOCKET) {
+    this.socketPath = socketPath;
+    this.socket = null;
+    this.nextId = 0;
+    this.pending = new Map();
+    this.buffer = '';
+  }
+
+  connect() {
+    if (this.socket) {
+      return this.connected;
+    }
+    this.socket = net.createConnection(this.socketPath);
+    this.socket.setEncoding('utf8');
+    this.connected = new Promise((resolve, reject) => {
+      this.socket.once('connect', resolve);
+      this.socket.once('error', reject);
+    });
+    this.socket.on('data', (chunk) => this.onData(chunk));
+    this.socket.on('error', (error) => this.failAll(error));
+    this.socket.on('close', () => this.failAll(new Error('fetch daemon closed the connection')));
+    return this.connected;
+  }
+
+  onData(chunk) {
+    this.buffer += chunk;
+    let newline;
+    while ((newline = this.buffer.indexOf('\n')) !== -1) {
+      const line = this.buffer.slice(0, newline);
+      this.buffer = this.buffer.slice(newline + 1);
+      if (!line.trim()) {
+        continue;
+      }
+      const response = JSON.parse(line);
+      const request = this.pending.get(response.id);
+      if (!request) {
+        continue;
+      }
+      this.pending.delete(response.id);
+      if (response.error) {
+        const error = new Error(`RPC error ${response.error.code}: ${response.error.message}`);
+        error.code = response.error.code;
+        error.data = response.error.data;
+        request.reject(error);
+      } else {
+        request.resolve(response.result);
+      }
+    }
+  }
+
+  failAll(error) {
+    for (const request of this.pending.values()) {
+      request.reject(error);
+    }
+    this.pending.clear();
+    this.socket = null;
+  }
+
+  async call(method, params = {}) {
+    await this.connect();
+    const id = ++this.nextId;
+    const result = new Promise((resolve, reject) => this.pending.set(id, { resolve, reject }));
+    this.socket.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    return result;
+  }
+
+  // Запись meshok_fetch.page/1: status, snapshot, timings, lots, error
+  fetch(categoryId, options = {}) {
+    return this.call('fetch', { category_id: String(categoryId), ...options });
+  }
+
+  fetchBatch(categoryIds, options = {}) {
+    return this.call('fetch_batch', { category_ids: categoryIds.map(String), ...options });
+  }
+
+  status() {
+    return this.call('status');
+  }
+
+  close() {
+    if (this.socket) {
+      this.socket.end();
+      this.socket = null;
+    }
+  }
+}
+
+function parseOptions(args) {
+  const options = {};
+  for (let i = 0; i < args.length; i += 2) {
+    const name = args[i].replace(/^--/, '').replace(/-/g, '_');
+    const value = args[i + 1];
+    options[name] = /^\d+$/.test(value) ? Number(value) : value === 'false' ? false : value === 'true' ? true : value;
+  }
+  return options;
+}
+
+async function main() {
+  const [command = 'status', ...args] = process.argv.slice(2);
+  const client = new MeshokFetchClient();
+  try {
+    let result;
+    if (command === 'fetch') {
+      result = await client.fetch(args[0] || '252', parseOptions(args.slice(1)));
+    } else if (command === 'batch') {
+      const firstOption = args.findIndex((arg) => arg.startsWith('--'));
+      const ids = firstOption === -1 ? args : args.slice(0, firstOption);
+      result = await client.fetchBatch(ids, parseOptions(args.slice(ids.length)));
+    } else {
+      result = await client.call(command, parseOptions(args));
+    }
+    console.log(JSON.stringify(result, null, 2));
+  } catch (error) {
+    console.error(`❌ ${error.message}`);
+    process.exitCode = 1;
+  } finally {
+    client.close();
+  }
+}
+
+module.exports = { MeshokFetchClient, DEFAULT_SOCKET };
+
+if (require.main === module) {
+  main();
+}
@@ -0,0 +1,16 @@
+"""Единый движок загрузки листингов meshok.net.
+
+    from meshok_fetch import fetch
+    result = fetch('252', finished=True, backend='session')
+
+CLI: python3 -m meshok_fetch 252 --backend httpx
+"""
+
+from .backends import BACKENDS, DEFAULT_BACKEND, load_backend
+from .common import build_url
+from .engine import fetch
+from .lots import Lot, LotTable, extract_lots
+from .result import PageResult
+
+__all__ = ['BACKENDS', 'DEFAULT_BACKEND', 'Lot', 'LotTable', 'PageResult', 'build_url', 'extract_lots', 'fetch',
+           'load_backend']
@@ -0,0 +1,183 @@
+import argparse
+import sys
+from contextlib import redirect_stdout
+
+from .backends import BACKENDS, DEFAULT_BACKEND, load_backend
+from .browser_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB
+from .common import BLOCK_PROFILES, DEFAULT_BLOCK_PROFILE
+from .engine import error_record, fetch, page_record, report_error, write_record
+from .parsers import DEFAULT_ENGINE, ENGINES
+from .retry import DEFAULT_ATTEMPT_DEADLINE, DEFAULT_RETRIES
+from .scheduler import DEFAULT_BURST, DEFAULT_MAX_IN_FLIGHT, DEFAULT_RATE, configure
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='meshok_fetch', description='Fetch meshok.net category listing')
+    parser.add_argument('category_id', nargs='?', default='252')
+    parser.add_argument('finished', nargs='?', default='true',
+                        help="'false' for active lots (default: finished, opt=2)")
+    parser.add_argument('-b', '--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument('--no-save', action='store_true', help='do not write HTML to data/')
+    parser.add_argument('--no-analyze', action='store_true', help='skip content analysis')
+    parser.add_argument('-p', '--parser', choices=sorted(ENGINES), default=DEFAULT_ENGINE,
+                        help='HTML parser engine for content analysis')
+    parser.add_argument('--block', choices=sorted(BLOCK_PROFILES), default=DEFAULT_BLOCK_PROFILE,
+                        help='resources blocked by browser backends (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='always download the full page (no If-None-Match / If-Modified-Since)')
+    parser.add_argument('--json', action='store_true',
+                        help='print one NDJSON record per page (status, snapshot, timings, lots) on stdout; '
+                             'progress goes to stderr')
+
+    polite = parser.add_argument_group('politeness and retries (per host; defaults from MESHOK_RATE / MESHOK_BURST / '
+                                       'MESHOK_MAX_IN_FLIGHT / MESHOK_RETRIES / MESHOK_ATTEMPT_TIMEOUT)')
+    polite.add_argument('--rate', type=float, help=f'requests per second, 0 = unlimited (default {DEFAULT_RATE:g})')
+    polite.add_argument('--burst', type=int, help=f'requests allowed back to back (default {DEFAULT_BURST})')
+    polite.add_argument('--max-in-flight', type=int,
+                        help=f'concurrent requests, 0 = unlimited (default {DEFAULT_MAX_IN_FLIGHT})')
+    polite.add_argument('--retries', type=int,
+                        help=f'retries after network errors and 5xx, with jittered backoff (default {DEFAULT_RETRIES})')
+    polite.add_argument('--attempt-timeout', type=float,
+                        help=f'deadline of one attempt in seconds (default {DEFAULT_ATTEMPT_DEADLINE:g})')
+
+    archive = parser.add_mutually_exclusive_group()
+    archive.add_argument('--record', metavar='ARCHIVE', help='record every response into a replay archive (zip)')
+    archive.add_argument('--replay', metavar='ARCHIVE',
+                         help='serve responses from a recorded archive instead of the network')
+
+    metrics = parser.add_argument_group('metrics (OpenMetrics text: requests, bytes, status codes, stage latencies)')
+    metrics.add_argument('--metrics-file', metavar='PATH',
+                         help='write metrics to this file on exit (default from MESHOK_METRICS_FILE)')
+    metrics.add_argument('--metrics-port', type=int, metavar='PORT',
+                         help='serve metrics on http://127.0.0.1:PORT/metrics while running')
+
+    batch = parser.add_argument_group('batch mode (one httpx connection pool, or a browser pool for selenium backends)')
+    batch.add_argument('--categories', nargs='+', metavar='ID', help='fetch these categories concurrently')
+    batch.add_argument('--all-categories', action='store_true',
+                       help='fetch every category from config/categories.json')
+    batch.add_argument('-c', '--concurrency', type=int, default=8)
+    batch.add_argument('--http2', action='store_true', help='negotiate HTTP/2 (needs the h2 package)')
+    batch.add_argument('--browsers', type=int, default=2,
+                       help='Chrome instances kept warm when --backend is a selenium backend')
+    batch.add_argument('--recycle-pages', type=int, default=DEFAULT_MAX_PAGES,
+                       help='restart a pooled browser after this many pages')
+    batch.add_argument('--recycle-rss-mb', type=int, default=DEFAULT_MAX_RSS_MB,
+                       help='restart a pooled browser when its process tree exceeds this RSS')
+    batch.add_argument('--crawl', action='store_true',
+                       help='walk every listing page and stream lot records as NDJSON to stdout')
+    batch.add_argument('--max-pages', type=int, help='limit pages per category in --crawl mode')
+    batch.add_argument('--load-db', action='store_true',
+                       help='with --crawl: load lot records into Postgres instead of printing NDJSON')
+    batch.add_argument('--incremental', action='store_true',
+                       help='with --crawl: emit only new or changed lots and stop a category at the first '
+                            'page without any (remembered in data/seen-lots.idx)')
+    batch.add_argument('--seen-index', metavar='PATH', help='seen-lot index file for --incremental')
+    args = parser.parse_args(argv)
+    if args.json and args.crawl:
+        parser.error('--crawl already streams lot records as NDJSON; drop --json')
+    if (args.incremental or args.seen_index) and not args.crawl:
+        parser.error('--incremental works with --crawl only')
+    return args
+
+
+def write_results(results, category_ids, finished, backend, out):
+    """Записи --json пакетного режима в порядке category_ids"""
+    for category_id in category_ids:
+        result = results.get(category_id)
+        if isinstance(result, Exception):
+            write_record(error_record(result, category_id, finished, backend), out)
+        elif result is not None:
+            write_record(page_record(result, category_id, finished), out)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.json:
+        out = sys.stdout
+        # stdout отдан записям: прогресс и отчеты уходят в stderr
+        with redirect_stdout(sys.stderr):
+            return run(args, out)
+    return run(args)
+
+
+def run(args, out=None):
+    """Выполняет разобранную команду; out - поток для записей --json или None"""
+    finished = args.finished != 'false'
+    limits = (args.rate, args.burst, args.max_in_flight, args.retries, args.attempt_timeout)
+    if any(value is not None for value in limits):
+        configure(*limits)
+    if args.metrics_file or args.metrics_port:
+        from . import metrics
+
+        if args.metrics_file:
+            metrics.write_at_exit(args.metrics_file)
+        if args.metrics_port:
+            server = metrics.serve(args.metrics_port)
+            print(f'📈 Metrics: http://127.0.0.1:{server.server_port}/metrics', file=sys.stderr)
+    try:
+        if args.record or args.replay:
+            from .backends import set_archive
+            from .replay import open_archive
+
+            set_archive(open_archive(args.replay or args.record, 'replay' if args.replay else 'record'))
+
+        if args.crawl:
+            from .batch import load_category_ids
+            from .pagination import crawl
+
+            category_ids = args.categories or (load_category_ids() if args.all_categories
+                                               else [args.category_id])
+            seen = None
+            if args.incremental or args.seen_index:
+                from .seen_index import SeenIndex
+
+                seen = SeenIndex(args.seen_index)
+            if args.load_db:
+                from .pagination import collect
+                from .pg_loader import load
+
+                lots, failed = collect(category_ids, finished, concurrency=args.concurrency,
+                                       max_pages=args.max_pages, save=not args.no_save, seen=seen)
+                load(lots, finished)
+                # Индекс сохраняется только после загрузки: при ошибке лоты придут снова
+                if seen is not None:
+                    seen.checkpoint()
+                return 1 if failed else 0
+            _, failed = crawl(category_ids, finished, concurrency=args.concurrency, max_pages=args.max_pages,
+                              save=not args.no_save, seen=seen)
+            return 1 if failed else 0
+
+        if args.categories or args.all_categories:
+            from .batch import fetch_batch, fetch_batch_browser, load_category_ids
+
+            category_ids = args.categories or load_category_ids()
+            if getattr(load_backend(args.backend), 'SUPPORTS_BROWSER_POOL', False):
+                results = fetch_batch_browser(category_ids, args.backend, finished, browsers=args.browsers,
+                                              max_pages=args.recycle_pages, max_rss_mb=args.recycle_rss_mb,
+                                              save=not args.no_save, analyze=not args.no_analyze,
+                                              parser=args.parser, block=args.block)
+                backend = args.backend
+            else:
+                results = fetch_batch(category_ids, finished, concurrency=args.concurrency, http2=args.http2,
+                                      save=not args.no_save, analyze=not args.no_analyze,
+                                      use_cache=not args.no_cache, parser=args.parser)
+                backend = 'httpx'
+            if out is not None:
+                write_results(results, category_ids, finished, backend, out)
+            return 1 if any(isinstance(r, Exception) for r in results.values()) else 0
+
+        result = fetch(args.category_id, finished, backend=args.backend,
+                       save=not args.no_save, analyze=not args.no_analyze, use_cache=not args.no_cache,
+                       parser=args.parser, block=args.block, verbose=out is None)
+        if out is not None:
+            write_record(page_record(result, args.category_id, finished), out)
+    except Exception as e:
+        report_error(e)
+        if out is not None and not (args.categories or args.all_categories):
+            write_record(error_record(e, args.category_id, finished, args.backend), out)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
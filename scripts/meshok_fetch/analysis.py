@@ -0,0 +1,62 @@
+"""Анализ страницы листинга: сводка выбранным движком разбора, пагинация."""
+
+from itertools import islice
+
+from .lots import MISSING
+from .parsers import DEFAULT_ENGINE, extract
+from .scanner import scan
+
+
+def analyze_content(content, engine=DEFAULT_ENGINE):
+    """Сводка по странице: заголовок, ссылки на лоты, цены, таблицы, формы, JSON"""
+    return extract(content, engine)
+
+
+def page_count(content):
+    """Число страниц листинга по ссылкам пагинации (1, если пагинации нет)"""
+    return scan(content).max_page
+
+
+def print_report(summary, base_url):
+    """Печать сводки в формате прежних fetch-скриптов"""
+    if summary['title']:
+        print(f"📋 Page title: {summary['title']}")
+
+    item_links = summary['item_links']
+    print(f'🔗 Item links found: {len(item_links)}')
+
+    if item_links:
+        print('🎉 Successfully obtained auction data!')
+        print('📋 First 5 item links:')
+        for i, link in enumerate(item_links[:5]):
+            print(f"   {i + 1}. {link if link.startswith('http') else base_url + link}")
+    else:
+        print('⚠️  No auction links found')
+
+    prices = summary['prices']
+    if prices:
+        print(f'💰 Prices found: {len(prices)}')
+        print('📋 Sample prices:')
+        for i, price in enumerate(prices[:3]):
+            print(f'   {i + 1}. {price}')
+
+    print(f"📊 Tables found: {summary['tables']}")
+    print(f"📝 Forms found: {summary['forms']}")
+
+    json_matches = summary['json']
+    if json_matches:
+        print(f'📜 JSON data found: {len(json_matches)} matches')
+        print('📋 Sample JSON:')
+        for i, json_data in enumerate(json_matches[:2]):
+            print(f'   {i + 1}. {json_data[:100]}...')
+    else:
+        print('📜 No JSON data found')
+
+
+def print_lots(lots, limit=3):
+    """Число извлеченных записей лотов и первые из них"""
+    print(f'🧾 Lot records extracted: {len(lots)}')
+    for i, lot in enumerate(islice(lots, limit)):
+        price = 'no price' if lot.price == MISSING else f'{lot.price / 100:,.2f} ₽'.replace(',', ' ')
+        bids = '' if lot.bids == MISSING else f', {lot.bids} bids'
+        print(f'   {i + 1}. #{lot.item_id} {lot.title or "(no title)"} - {price}{bids}')
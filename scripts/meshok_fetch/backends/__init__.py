@@ -0,0 +1,55 @@
+"""Реестр fetch-бэкендов.
+
+Модуль бэкенда импортируется только при выборе, поэтому запуск через
+urllib не платит за импорт selenium, bs4 или httpx. Для каждого бэкенда
+задан бюджет времени старта (импорт модуля в чистом интерпретаторе),
+его проверяет scripts/check-fetch-startup.py.
+
+С активным архивом (set_archive или MESHOK_RECORD / MESHOK_REPLAY, см.
+meshok_fetch.replay) load_backend отдает записывающую обертку модуля или
+воспроизведение из архива вместо него.
+"""
+
+import importlib
+import os
+from collections import namedtuple
+
+Backend = namedtuple('Backend', 'module prefix requires startup_budget_ms')
+
+BACKENDS = {
+    'simple_python': Backend('simple_python', 'simple_python', (), 100),
+    'session': Backend('session', 'session', (), 100),
+    'simple_requests': Backend('simple_requests', 'simple_requests', (), 100),
+    'httpx': Backend('httpx_async', 'httpx', ('httpx',), 600),
+    'cloudscraper': Backend('cloudscraper_session', 'cloudscraper', ('cloudscraper', 'requests'), 1200),
+    'selenium': Backend('selenium_chrome', 'python_selenium', ('selenium',), 1500),
+    'undetected': Backend('undetected_chrome', 'undetected_chrome', ('undetected_chromedriver', 'selenium'), 2000),
+    'undetected_fixed': Backend('undetected_fixed', 'undetected_fixed', ('undetected_chromedriver', 'selenium'), 2000)
+}
+
+DEFAULT_BACKEND = 'simple_python'
+
+_archive = None
+
+
+def set_archive(archive):
+    """Запись или воспроизведение ответов всех бэкендов процесса; None - выключить"""
+    global _archive
+    _archive = archive
+
+
+def load_backend(name):
+    """Импортирует модуль бэкенда по имени из реестра"""
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend '{name}', expected one of: {', '.join(BACKENDS)}") from None
+
+    def load():
+        return importlib.import_module(f'{__name__}.{backend.module}')
+
+    archive = _archive
+    if archive is None and (os.environ.get('MESHOK_RECORD') or os.environ.get('MESHOK_REPLAY')):
+        from ..replay import archive_from_env
+        archive = archive_from_env()
+    return archive.backend(name, load) if archive is not None else load()
@@ -0,0 +1,241 @@
+"""Общий цикл загрузки страницы в Chrome для selenium-бэкендов."""
+
+import json
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from ..common import BLOCK_PROFILES, CLOUDFLARE_MARKERS, DEFAULT_BLOCK_PROFILE
+from ..cookie_store import default_cookie_store, from_cdp, to_cdp
+from ..metrics import timed
+from ..result import PageResult
+from ..scheduler import default_scheduler
+
+# Контейнер списка лотов: страница готова, как только появилась первая ссылка
+READY_SELECTOR = 'a[href*="/item/"]'
+
+# Если лотов нет (пустая категория), страница считается готовой через
+# столько миллисекунд после load без заглушки Cloudflare
+SETTLE_MS = 1500
+
+# Ждет готовности внутри браузера: MutationObserver и readystatechange
+# вызывают проверку на каждое изменение DOM, без опроса с нашей стороны.
+# Возвращает 'items' (найден селектор) или 'loaded' (лотов нет).
+READY_SCRIPT = '''
+const [selector, markers, settleMs, done] = arguments;
+let settle = null;
+let finished = false;
+const challenge = () => markers.some(m => document.title.includes(m));
+const finish = state => {
+    finished = true;
+    observer.disconnect();
+    clearTimeout(settle);
+    done(state);
+};
+const check = () => {
+    if (finished) {
+        return;
+    } else if (challenge()) {
+        clearTimeout(settle);
+        settle = null;
+    } else if (document.querySelector(selector)) {
+        finish('items');
+    } else if (document.readyState === 'complete' && settle === null) {
+        settle = setTimeout(() => finish('loaded'), settleMs);
+    }
+};
+const observer = new MutationObserver(check);
+observer.observe(document, {childList: true, subtree: true});
+document.addEventListener('readystatechange', check);
+check();
+'''
+
+
+# Все карточки лотов за один вызов: [id, href, название, текст карточки, datetime].
+# Карточка - наибольший предок первой ссылки на лот, не содержащий ссылок
+# на другие лоты; цену и ставки из ее текста разбирает lots_from_cards.
+EXTRACT_SCRIPT = r'''
+const selector = arguments[0];
+const itemId = a => (/\/item\/(\d+)/.exec(a.getAttribute('href')) || [])[1];
+const cards = new Map();
+for (const a of document.querySelectorAll(selector)) {
+    const id = itemId(a);
+    if (!id) continue;
+    let card = cards.get(id);
+    if (!card) {
+        card = {id, path: a.getAttribute('href'), title: '', node: a};
+        cards.set(id, card);
+    }
+    if (!card.title) card.title = a.textContent.trim();
+}
+const foreign = (node, id) => Array.from(node.querySelectorAll(selector)).some(a => itemId(a) !== id);
+return Array.from(cards.values(), card => {
+    let node = card.node;
+    while (node.parentElement && node.parentElement !== document.body && !foreign(node.parentElement, card.id)) {
+        node = node.parentElement;
+    }
+    const time = node.querySelector('time[datetime]');
+    return [card.id, card.path, card.title, node.innerText, time ? time.getAttribute('datetime') : null];
+});
+'''
+
+
+def enable_network_log(options):
+    """Performance-лог Chrome: по нему считаются переданные и заблокированные запросы"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+def apply_block_profile(driver, profile=DEFAULT_BLOCK_PROFILE):
+    """Включает профиль блокировки; 'off' снимает блокировку с драйвера из пула"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(BLOCK_PROFILES[profile])})
+
+
+def load_cookies(driver, store=None):
+    """Кладет в браузер непросроченные cookies из общего хранилища"""
+    cookies = [to_cdp(cookie) for cookie in (store or default_cookie_store()).load()]
+    if cookies:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+    return len(cookies)
+
+
+def save_cookies(driver, store=None):
+    """Записывает cookies браузера (в том числе cf_clearance) в общее хранилище"""
+    store = store or default_cookie_store()
+    cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    for data in cookies:
+        store.put(from_cdp(data))
+    return len(cookies)
+
+
+def network_stats(driver):
+    """Байты, принятые страницей, и заблокированные запросы по типам ресурса"""
+    try:
+        entries = driver.get_log('performance')
+    except WebDriverException:
+        return None
+    types = {}
+    transferred = 0
+    blocked = {}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        params = message.get('params', {})
+        method = message['method']
+        if method == 'Network.requestWillBeSent':
+            types[params['requestId']] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            transferred += params.get('encodedDataLength', 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            kind = params.get('type') or types.get(params['requestId'], 'Other')
+            blocked[kind] = blocked.get(kind, 0) + 1
+    return {'transferred': transferred, 'blocked': blocked}
+
+
+def extract_cards(driver, selector=READY_SELECTOR):
+    """Карточки лотов страницы за один round trip WebDriver"""
+    return driver.execute_script(EXTRACT_SCRIPT, selector)
+
+
+def wait_ready(driver, max_wait=120, selector=READY_SELECTOR, settle_ms=SETTLE_MS):
+    """Ждет списка лотов (или загрузки без Cloudflare) до max_wait секунд.
+
+    Возвращает 'items', 'loaded' или 'timeout'. Прохождение Cloudflare
+    перезагружает документ и обрывает скрипт; WebDriverWait запускает его
+    заново в новом документе. Каждый запуск получает script timeout по
+    остатку общего срока, так что ожидание не длится дольше max_wait.
+    """
+    deadline = time.monotonic() + max_wait
+    markers = list(CLOUDFLARE_MARKERS)
+
+    def ready(d):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        d.set_script_timeout(remaining)
+        try:
+            return d.execute_async_script(READY_SCRIPT, selector, markers, settle_ms)
+        except TimeoutException:
+            # Script timeout selenium сообщает как TimeoutException (ScriptTimeoutException
+            # в нем нет): срок вышел, и WebDriverWait завершится на следующей проверке
+            return False
+
+    wait = WebDriverWait(driver, max_wait, poll_frequency=0.1, ignored_exceptions=(JavascriptException,))
+    try:
+        return wait.until(ready)
+    except TimeoutException:
+        return 'timeout'
+
+
+def load_page(driver, url, max_wait=120, block=DEFAULT_BLOCK_PROFILE):
+    """Открывает страницу и ждет прохождения Cloudflare до max_wait секунд"""
+    apply_block_profile(driver, block)
+    # Лог копится с прошлой страницы драйвера из пула: сбрасываем его
+    network_stats(driver)
+    try:
+        if load_cookies(driver):
+            print('🍪 Reusing stored session cookies')
+    except WebDriverException as e:
+        print(f'⚠️  Could not load stored cookies: {e.msg}')
+
+    print('📄 Opening page...')
+    timings = {}
+    started = time.perf_counter()
+    # Статус документа WebDriver не отдает: планировщик здесь только ограничивает скорость
+    with timed(timings, 'browser_navigate'):
+        default_scheduler().call(url, lambda: driver.get(url), status=lambda _: None)
+
+    print('⏳ Waiting for Cloudflare challenge...')
+    try:
+        with timed(timings, 'browser_wait'):
+            state = wait_ready(driver, max_wait)
+    except WebDriverException as e:
+        print(f'⚠️  Readiness wait failed: {e.msg}')
+        state = 'timeout'
+
+    elapsed = time.perf_counter() - started
+    if state == 'timeout':
+        print(f'⚠️  Page not ready after {max_wait}s, capturing as is')
+    else:
+        print(f"✅ Cloudflare challenge passed! ({'lot list' if state == 'items' else 'page'} "
+              f'ready in {elapsed:.1f}s)')
+
+    # Весь DOM передается по WebDriver один раз, после готовности
+    result = PageResult(driver.current_url, 200, driver.page_source, title=driver.title)
+    try:
+        save_cookies(driver)
+    except WebDriverException as e:
+        print(f'⚠️  Could not save browser cookies: {e.msg}')
+    result.meta['ready'] = state
+    stats = network_stats(driver)
+    if stats is not None:
+        result.meta['browser_bytes'] = stats['transferred']
+        result.meta['blocked'] = stats['blocked']
+        result.meta['block_profile'] = block
+    if state != 'timeout':
+        try:
+            with timed(timings, 'browser_extract'):
+                result.meta['cards'] = extract_cards(driver)
+        except WebDriverException as e:
+            # Без карточек лоты разберет extract_lots из page_source
+            print(f'⚠️  In-browser extraction failed: {e.msg}')
+    result.meta['elapsed'] = elapsed
+    result.meta['timings'] = timings
+    return result
+
+
+def fetch_with_driver(start_driver, url, pool=None, **wait):
+    """load_page в драйвере из пула или в Chrome, запущенном только для этой страницы"""
+    if pool is not None:
+        with pool.acquire() as driver:
+            return load_page(driver, url, **wait)
+
+    driver = None
+    try:
+        driver = start_driver()
+        return load_page(driver, url, **wait)
+    finally:
+        if driver:
+            driver.quit()
+            print('🏁 Browser closed')
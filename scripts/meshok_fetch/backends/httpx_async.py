@@ -0,0 +1,82 @@
+"""Асинхронный httpx-клиент."""
+
+import asyncio
+import time
+
+import httpx
+
+from ..common import browser_headers
+from ..cookie_store import default_cookie_store
+from ..result import PageResult
+from ..scheduler import default_scheduler
+
+LABEL = '🌐 Using httpx for Cloudflare bypass...'
+SUPPORTS_HTTP_CACHE = True
+
+# События httpcore (extensions['trace']) -> этапы meshok_fetch.metrics;
+# DNS httpcore не выделяет, он входит в connect
+TRACE_STAGES = {
+    'connection.connect_tcp': 'connect',
+    'connection.start_tls': 'tls',
+    'http11.receive_response_headers': 'ttfb',
+    'http2.receive_response_headers': 'ttfb',
+    'http11.receive_response_body': 'download',
+    'http2.receive_response_body': 'download'
+}
+
+
+def make_client(timeout=30, max_connections=10, http2=False):
+    """AsyncClient с keep-alive пулом и cookies из общего хранилища; один клиент на весь обход"""
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections)
+    # httpx.Cookies работает поверх переданного CookieJar, так что новые cookies сразу попадают в файл
+    return httpx.AsyncClient(headers=browser_headers(), timeout=timeout, limits=limits,
+                             http2=http2, follow_redirects=True, cookies=default_cookie_store().jar())
+
+
+def _tracer(timings):
+    """Callback trace для httpcore: копит длительности этапов в timings"""
+    started = {}
+
+    async def trace(event, info):
+        name, _, phase = event.rpartition('.')
+        stage = TRACE_STAGES.get(name)
+        if stage is None:
+            return
+        if phase == 'started':
+            started[name] = time.perf_counter()
+        elif phase == 'complete' and name in started:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started.pop(name)
+
+    return trace
+
+
+async def get_page(client, url, cache=None):
+    request = client.build_request('GET', url)
+    if cache:
+        request.headers = httpx.Headers(cache.prepare(url, dict(request.headers)))
+    timings = {}
+    request.extensions['trace'] = _tracer(timings)
+    response = await default_scheduler().call_async(url, lambda: client.send(request, follow_redirects=True),
+                                                    status=lambda r: r.status_code,
+                                                    errors=(httpx.TransportError,))
+    meta = {'http_version': response.http_version, 'not_modified': False,
+            'headers': response.headers.multi_items(), 'timings': timings}
+
+    if cache and response.status_code == 304:
+        meta['not_modified'] = True
+        return PageResult(str(response.url), 304, cache.cached_body(url), meta=meta)
+
+    if cache and response.status_code == 200:
+        cache.update(url, response.headers, response.content)
+    return PageResult(str(response.url), response.status_code, response.content, meta=meta)
+
+
+async def fetch_page_async(url, timeout=30, cache=None):
+    async with make_client(timeout) as client:
+        print('⏳ Making request with httpx...')
+        return await get_page(client, url, cache)
+
+
+def fetch_page(url, timeout=30, cache=None):
+    return asyncio.run(fetch_page_async(url, timeout, cache))
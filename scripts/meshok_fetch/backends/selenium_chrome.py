@@ -0,0 +1,37 @@
+"""Headless Chrome через selenium."""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from ..common import CHROME_ARGS, DEFAULT_BLOCK_PROFILE
+from ._chrome import enable_network_log, fetch_with_driver
+
+LABEL = '🐍 Using Python Selenium for Cloudflare bypass...'
+SUPPORTS_BROWSER_POOL = True
+SUPPORTS_RESOURCE_BLOCKING = True
+
+
+def build_options():
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    for arg in CHROME_ARGS:
+        chrome_options.add_argument(arg)
+
+    # Скрытие автоматизации
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    return enable_network_log(chrome_options)
+
+
+def start_driver():
+    print('🚀 Starting Chrome driver...')
+    driver = webdriver.Chrome(options=build_options())
+
+    # Скрытие webdriver свойств
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
+
+def fetch_page(url, timeout=120, pool=None, block=DEFAULT_BLOCK_PROFILE):
+    return fetch_with_driver(start_driver, url, pool, max_wait=timeout, block=block)
@@ -0,0 +1,24 @@
+"""Cookie-сессия: главная страница (если нет сохраненной сессии), затем листинг."""
+
+from ..common import browser_headers, home_url
+from ..cookie_store import has_session
+from ..transport import Session, page_result
+
+LABEL = '🍪 Using session-based approach...'
+SUPPORTS_HTTP_CACHE = True
+
+
+def fetch_page(url, cache=None):
+    session = Session(cache=cache)
+
+    # Главная страница нужна только для получения cookies, если их нет в хранилище
+    if has_session(session.cookie_jar, url):
+        print('🍪 Reusing stored session cookies')
+    else:
+        print('⏳ Getting main page for session...')
+        main_content = session.get(home_url(), headers=browser_headers(), use_cache=False).text()
+        print(f'✅ Main page loaded: {len(main_content) / 1024:.2f} KB')
+
+    print('⏳ Making request to target page with session...')
+    response = session.get(url, headers=browser_headers(site='same-origin', referer=home_url()))
+    return page_result(response, session.pool)
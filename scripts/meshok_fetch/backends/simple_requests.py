@@ -0,0 +1,14 @@
+"""Одиночный запрос без захода на главную через общий пул соединений."""
+
+from ..common import browser_headers
+from ..transport import Session, page_result
+
+LABEL = '🌐 Using simple urllib for Cloudflare bypass...'
+SUPPORTS_HTTP_CACHE = True
+
+
+def fetch_page(url, cache=None):
+    print('⏳ Making request with pooled http.client...')
+    session = Session(cache=cache)
+    response = session.get(url, headers=browser_headers())
+    return page_result(response, session.pool)
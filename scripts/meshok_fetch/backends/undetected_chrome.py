@@ -0,0 +1,28 @@
+"""undetected-chromedriver с Chrome, найденным самим драйвером."""
+
+import undetected_chromedriver as uc
+
+from ..common import CHROME_ARGS, DEFAULT_BLOCK_PROFILE
+from ._chrome import enable_network_log, fetch_with_driver
+
+LABEL = '🥷 Using undetected-chromedriver for Cloudflare bypass...'
+SUPPORTS_BROWSER_POOL = True
+SUPPORTS_RESOURCE_BLOCKING = True
+
+
+def build_options(binary_location=None):
+    options = uc.ChromeOptions()
+    if binary_location:
+        options.binary_location = binary_location
+    for arg in CHROME_ARGS:
+        options.add_argument(arg)
+    return enable_network_log(options)
+
+
+def start_driver():
+    print('🚀 Starting undetected Chrome...')
+    return uc.Chrome(options=build_options())
+
+
+def fetch_page(url, timeout=180, pool=None, block=DEFAULT_BLOCK_PROFILE):
+    return fetch_with_driver(start_driver, url, pool, max_wait=timeout, block=block)
@@ -0,0 +1,26 @@
+"""undetected-chromedriver с явным путем к бинарнику Chrome."""
+
+import undetected_chromedriver as uc
+
+from ..browser_probe import cached_chrome_path
+from ..common import DEFAULT_BLOCK_PROFILE
+from ._chrome import fetch_with_driver
+from .undetected_chrome import build_options
+
+LABEL = '🥷 Using fixed undetected-chromedriver for Cloudflare bypass...'
+SUPPORTS_BROWSER_POOL = True
+SUPPORTS_RESOURCE_BLOCKING = True
+
+
+def start_driver():
+    chrome_path = cached_chrome_path()
+    if not chrome_path:
+        raise RuntimeError('Chrome not found!')
+    print(f'✅ Found Chrome at: {chrome_path}')
+
+    print('🚀 Starting undetected Chrome with correct path...')
+    return uc.Chrome(options=build_options(chrome_path), driver_executable_path=None)
+
+
+def fetch_page(url, timeout=180, pool=None, block=DEFAULT_BLOCK_PROFILE):
+    return fetch_with_driver(start_driver, url, pool, max_wait=timeout, block=block)
@@ -0,0 +1,139 @@
+"""Пакетный обход нескольких категорий через один пул httpx-соединений.
+
+Все категории загружаются в одном процессе, конкурентно, с ограничением
+concurrency; соединения переиспользуются (keep-alive, по желанию HTTP/2),
+так что полный обход каталога стоит несколько TLS-рукопожатий вместо
+сотен холодных запусков. Для selenium-бэкендов то же дает пул браузеров
+(fetch_batch_browser).
+"""
+
+import asyncio
+import json
+import time
+from functools import partial
+
+from .backends import load_backend
+from .browser_pool import DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB, BrowserPool
+from .common import CATEGORIES_FILE, DEFAULT_BLOCK_PROFILE, build_url
+from .engine import process_result
+from .metrics import observe_error
+from .parsers import DEFAULT_ENGINE
+
+BACKEND = 'httpx'
+
+
+def print_line(category_id, result, detail):
+    links = len(result.meta['summary']['item_links']) if 'summary' in result.meta else '-'
+    mark = '♻️ ' if result.meta.get('not_modified') else '✅' if result.status < 400 else '⚠️ '
+    print(f"{mark} {category_id}: {result.status}, {result.size / 1024:.2f} KB, "
+          f"{links} item links, {result.meta['elapsed']:.2f}s ({detail})")
+
+
+def load_category_ids(path=CATEGORIES_FILE):
+    """ID категорий из config/categories.json"""
+    with open(path, encoding='utf-8') as f:
+        return list(json.load(f)['categories'])
+
+
+async def fetch_batch_async(category_ids, finished=True, concurrency=8, http2=False,
+                            save=True, analyze=True, timeout=30, use_cache=True, parser=DEFAULT_ENGINE):
+    """Загружает категории конкурентно; возвращает {category_id: PageResult | Exception}"""
+    backend = load_backend(BACKEND)
+    cache = None
+    if use_cache:
+        from .http_cache import default_cache
+        cache = default_cache(save)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {}
+
+    async def fetch_one(client, category_id):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await backend.get_page(client, build_url(category_id, finished), cache)
+            except Exception as e:
+                results[category_id] = e
+                observe_error(BACKEND, e)
+                print(f'❌ {category_id}: {type(e).__name__}: {e}')
+                return
+            result.backend = BACKEND
+            result.meta['elapsed'] = time.perf_counter() - started
+
+        # Сохранение и анализ вне семафора, чтобы не держать слот соединения, и в пуле
+        # потоков, чтобы разбор и запись на диск не останавливали остальные загрузки
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, partial(
+                process_result, result, category_id, finished, save=save, analyze=analyze, verbose=False,
+                parser=parser))
+        except Exception as e:
+            # Ошибка разбора или записи одной категории не должна прерывать весь gather
+            results[category_id] = e
+            print(f'❌ {category_id}: {type(e).__name__}: {e}')
+            return
+        results[category_id] = result
+        print_line(category_id, result, result.meta.get('http_version', 'replayed'))
+
+    async with backend.make_client(timeout, max_connections=concurrency, http2=http2) as client:
+        await asyncio.gather(*(fetch_one(client, category_id) for category_id in category_ids))
+
+    return results
+
+
+def fetch_batch(category_ids, finished=True, concurrency=8, http2=False, save=True, analyze=True,
+                use_cache=True, parser=DEFAULT_ENGINE):
+    print(f'📦 Batch fetching {len(category_ids)} categories '
+          f"(concurrency {concurrency}{', HTTP/2' if http2 else ''})...")
+    started = time.perf_counter()
+    results = asyncio.run(fetch_batch_async(category_ids, finished, concurrency, http2,
+                                            save=save, analyze=analyze, use_cache=use_cache,
+                                            parser=parser))
+    failed = sum(1 for r in results.values() if isinstance(r, Exception))
+    print(f'🏁 Done: {len(results) - failed} ok, {failed} failed in {time.perf_counter() - started:.2f}s')
+    return results
+
+
+def fetch_batch_browser(category_ids, backend, finished=True, browsers=2, max_pages=DEFAULT_MAX_PAGES,
+                        max_rss_mb=DEFAULT_MAX_RSS_MB, save=True, analyze=True, parser=DEFAULT_ENGINE,
+                        block=DEFAULT_BLOCK_PROFILE):
+    """Категории через пул Chrome: браузер запускается browsers раз, а не на каждую категорию"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    module = load_backend(backend)
+    print(module.LABEL)
+    print(f'📦 Browser batch: {len(category_ids)} categories, {browsers} browsers '
+          f'(recycle after {max_pages} pages or {max_rss_mb} MB)...')
+    started = time.perf_counter()
+    results = {}
+
+    def fetch_one(category_id):
+        page_started = time.perf_counter()
+        try:
+            result = module.fetch_page(build_url(category_id, finished), pool=pool, block=block)
+        except Exception as e:
+            results[category_id] = e
+            observe_error(backend, e)
+            print(f'❌ {category_id}: {type(e).__name__}: {e}')
+            return
+        result.backend = backend
+        result.meta['elapsed'] = time.perf_counter() - page_started
+        try:
+            process_result(result, category_id, finished, save=save, analyze=analyze, verbose=False,
+                           parser=parser)
+        except Exception as e:
+            results[category_id] = e
+            print(f'❌ {category_id}: {type(e).__name__}: {e}')
+            return
+        results[category_id] = result
+        detail = backend
+        if 'browser_bytes' in result.meta:
+            detail += f", {result.meta['browser_bytes'] / 1024:.0f} KB, {sum(result.meta['blocked'].values())} blocked"
+        print_line(category_id, result, detail)
+
+    with BrowserPool(module.start_driver, browsers, max_pages, max_rss_mb) as pool:
+        with ThreadPoolExecutor(browsers) as executor:
+            list(executor.map(fetch_one, category_ids))
+
+    failed = sum(1 for r in results.values() if isinstance(r, Exception))
+    print(f"🏁 Done: {len(results) - failed} ok, {failed} failed in {time.perf_counter() - started:.2f}s; "
+          f"{pool.stats['launched']} browser launches, {pool.stats['recycled']} recycled")
+    return results
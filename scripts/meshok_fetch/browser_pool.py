@@ -0,0 +1,174 @@
+"""Пул долгоживущих экземпляров Chrome для selenium-бэкендов.
+
+Запуск Chrome стоит секунды и сотни мегабайт, поэтому пул держит до size
+запущенных драйверов и отдает их под загрузку страниц. Экземпляр
+перезапускается после max_pages страниц или когда RSS дерева процессов
+браузера превышает max_rss_mb: долгоживущий Chrome постепенно
+раздувается, а свежий процесс дешевле, чем деградация всех загрузок.
+
+    with BrowserPool(module.start_driver, size=2) as pool:
+        result = module.fetch_page(url, pool=pool)
+"""
+
+import threading
+from contextlib import contextmanager
+
+DEFAULT_MAX_PAGES = 50
+DEFAULT_MAX_RSS_MB = 1500
+
+
+def _children(pid):
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def _rss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss_mb(pid):
+    """RSS процесса и всех его потомков в МБ (Linux /proc; 0, если недоступно)"""
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_kb(current)
+        stack.extend(_children(current))
+    return total / 1024
+
+
+def driver_rss_mb(driver):
+    """RSS chromedriver и браузера со всеми рендерерами"""
+    pids = []
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    if process is not None:
+        pids.append(process.pid)
+    # undetected-chromedriver запускает браузер сам, не потомком chromedriver
+    if getattr(driver, 'browser_pid', None):
+        pids.append(driver.browser_pid)
+    return sum(process_tree_rss_mb(pid) for pid in pids)
+
+
+class _Instance:
+    __slots__ = ('driver', 'pages')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+
+class BrowserPool:
+    """До size драйверов, общих для всех загрузок процесса"""
+
+    def __init__(self, factory, size=2, max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.stats = {'launched': 0, 'recycled': 0, 'pages': 0}
+        self._idle = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _take(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError('browser pool is closed')
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    # Слот занят до запуска, запуск - вне блокировки
+                    self._count += 1
+                    return None
+                self._cond.wait()
+
+    def _release_slot(self):
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
+
+    def _launch(self):
+        try:
+            driver = self.factory()
+        except BaseException:
+            self._release_slot()
+            raise
+        with self._cond:
+            self.stats['launched'] += 1
+        return _Instance(driver)
+
+    def _worn_out(self, instance):
+        if self.max_pages and instance.pages >= self.max_pages:
+            return f'{instance.pages} pages'
+        if self.max_rss_mb:
+            rss = driver_rss_mb(instance.driver)
+            if rss > self.max_rss_mb:
+                return f'{rss:.0f} MB RSS'
+        return None
+
+    def _discard(self, instance, reason=None):
+        try:
+            instance.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._count -= 1
+            if reason:
+                self.stats['recycled'] += 1
+            self._cond.notify()
+        if reason:
+            print(f'♻️  Browser recycled after {reason}')
+
+    @contextmanager
+    def acquire(self):
+        """Драйвер на время загрузки одной страницы"""
+        instance = self._take() or self._launch()
+        broken = False
+        try:
+            yield instance.driver
+        except BaseException:
+            # После ошибки состояние браузера неизвестно (висящая навигация,
+            # упавшая вкладка): такой экземпляр в пул не возвращаем
+            broken = True
+            raise
+        finally:
+            instance.pages += 1
+            with self._cond:
+                self.stats['pages'] += 1
+            if broken or self._closed:
+                self._discard(instance)
+            else:
+                reason = self._worn_out(instance)
+                if reason:
+                    self._discard(instance, reason)
+                else:
+                    with self._cond:
+                        self._idle.append(instance)
+                        self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for instance in idle:
+            self._discard(instance)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
@@ -0,0 +1,140 @@
+"""Проверка Chrome и chromedriver с кэшем результата.
+
+Версии и запуск headless проверяются параллельно, headless - на локальной
+file://-странице, без сети. Результат кэшируется в data/browser-probe.json
+с ключом по пути, mtime и размеру бинарников: пока Chrome и chromedriver
+не обновлялись, повторная проверка стоит несколько stat().
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from .common import DATA_DIR
+
+CHROME_PATHS = [
+    '/usr/bin/google-chrome',
+    '/usr/bin/google-chrome-stable',
+    '/usr/bin/chromium-browser',
+    '/usr/bin/chromium',
+    '/snap/bin/chromium',
+    '/usr/bin/chrome',
+    '/opt/google/chrome/chrome'
+]
+CHROME_NAMES = ['google-chrome', 'chromium-browser', 'chromium']
+
+CACHE_FILE = os.path.join(DATA_DIR, 'browser-probe.json')
+
+PROBE_MARKER = 'meshok-probe-ok'
+PROBE_PAGE = f'<html><body><a href="/item/1">{PROBE_MARKER}</a></body></html>'
+
+
+def find_chrome_path():
+    """Первый найденный Chrome/Chromium: стандартные пути, затем PATH"""
+    for path in CHROME_PATHS:
+        if os.path.exists(path):
+            return path
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def binary_key(path):
+    """Ключ кэша: путь, mtime и размер; None, если файла нет"""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return f'{os.path.realpath(path)}:{st.st_mtime_ns}:{st.st_size}'
+
+
+def _version(path, timeout=10):
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return None, str(e)
+    if result.returncode != 0:
+        return None, (result.stderr or result.stdout).strip()
+    return result.stdout.strip(), None
+
+
+def _headless(path, timeout=20):
+    """Chrome в headless открывает локальную страницу и отдает ее DOM"""
+    with tempfile.NamedTemporaryFile('w', suffix='.html', delete=False) as f:
+        f.write(PROBE_PAGE)
+    try:
+        result = subprocess.run([path, '--headless', '--no-sandbox', '--disable-gpu', '--disable-dev-shm-usage',
+                                 '--dump-dom', f'file://{f.name}'],
+                                capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return False, str(e)
+    finally:
+        os.remove(f.name)
+    if PROBE_MARKER in result.stdout:
+        return True, None
+    return False, (result.stderr.strip().splitlines() or ['empty DOM'])[-1]
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cache(path, report):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+
+
+def probe(refresh=False, cache_file=CACHE_FILE):
+    """Возможности браузера: пути, версии, работа headless. Из кэша, если бинарники не менялись"""
+    chrome = find_chrome_path()
+    driver = shutil.which('chromedriver')
+    key = {'chrome': binary_key(chrome), 'chromedriver': binary_key(driver)}
+
+    cached = None if refresh else _load_cache(cache_file)
+    if cached and cached.get('key') == key:
+        cached['cached'] = True
+        return cached
+
+    with ThreadPoolExecutor(3) as executor:
+        chrome_version = executor.submit(_version, chrome) if chrome else None
+        headless = executor.submit(_headless, chrome) if chrome else None
+        driver_version = executor.submit(_version, driver) if driver else None
+
+        report = {'key': key, 'chrome': None, 'chromedriver': None}
+        if chrome:
+            version, version_error = chrome_version.result()
+            ok, headless_error = headless.result()
+            report['chrome'] = {'path': chrome, 'version': version, 'version_error': version_error,
+                                'headless': ok, 'headless_error': headless_error}
+        if driver:
+            version, version_error = driver_version.result()
+            report['chromedriver'] = {'path': driver, 'version': version, 'version_error': version_error}
+
+    report['browsers'] = {name: shutil.which(name) for name in CHROME_NAMES + ['firefox', 'safari']}
+    try:
+        _save_cache(cache_file, report)
+    except OSError:
+        pass
+    report['cached'] = False
+    return report
+
+
+def cached_chrome_path(cache_file=CACHE_FILE):
+    """Путь к Chrome из кэша пробы, если он еще существует; иначе поиск"""
+    cached = _load_cache(cache_file)
+    path = ((cached or {}).get('chrome') or {}).get('path')
+    if path and os.path.exists(path):
+        return path
+    return find_chrome_path()
@@ -0,0 +1,157 @@
+"""Общие части всех fetch-бэкендов: URL, заголовки, признаки Cloudflare."""
+
+import os
+import random
+
+from .decoding import ACCEPT_ENCODING
+
+BASE_URL = os.environ.get('MESHOK_BASE_URL', 'https://meshok.net')
+
+DATA_DIR = os.environ.get('MESHOK_DATA_DIR', 'data')
+
+CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'categories.json')
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0'
+]
+
+CLIENT_IPS = [
+    '192.168.1.100',
+    '192.168.1.101',
+    '192.168.1.102',
+    '10.0.0.100',
+    '10.0.0.101',
+    '172.16.0.100',
+    '172.16.0.101'
+]
+
+CLOUDFLARE_MARKERS = ('Just a moment', 'Один момент')
+
+# Флаги Chrome, общие для selenium и undetected-chromedriver
+CHROME_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-web-security',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-ipc-flooding-protection',
+    '--disable-hang-monitor',
+    '--disable-prompt-on-repost',
+    '--disable-sync',
+    '--disable-translate',
+    '--disable-logging',
+    '--disable-permissions-api',
+    '--disable-presentation-api',
+    '--disable-print-preview',
+    '--disable-speech-api',
+    '--disable-file-system',
+    '--disable-notifications',
+    '--disable-geolocation',
+    '--disable-media-session-api',
+    '--disable-background-networking',
+    '--disable-default-apps',
+    '--disable-sync-preferences',
+    '--disable-component-extensions-with-background-pages',
+    '--disable-client-side-phishing-detection',
+    '--disable-component-update',
+    '--disable-domain-reliability',
+    '--disable-features=VizDisplayCompositor,TranslateUI,BlinkGenPropertyTrees,'
+    'WebRtcHideLocalIpsWithMdns,WebRtcUseMinMaxVEADimensions',
+    f'--user-agent={DEFAULT_USER_AGENT}'
+]
+
+# Профили блокировки ресурсов в браузерных бэкендах (шаблоны Network.setBlockedURLs).
+# Для листинга нужны только документ и скрипты, которые рисуют список лотов,
+# и скрипты проверки Cloudflare: они никогда не блокируются.
+_MEDIA_PATTERNS = (
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3', '*.ogg', '*.m4a'
+)
+_TRACKER_PATTERNS = (
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+    '*mc.yandex.ru*', '*top-fwz1.mail.ru*', '*vk.com/rtrg*', '*connect.facebook.net*'
+)
+BLOCK_PROFILES = {
+    'off': (),
+    'media': _MEDIA_PATTERNS + _TRACKER_PATTERNS,
+    'strict': _MEDIA_PATTERNS + _TRACKER_PATTERNS + ('*.css',)
+}
+DEFAULT_BLOCK_PROFILE = 'media'
+
+
+def build_url(category_id, finished=True, page=1):
+    """URL страницы листинга категории"""
+    params = []
+    if finished:
+        params.append('opt=2')
+    if page > 1:
+        params.append(f'page={page}')
+    return f"{BASE_URL}/good/{category_id}{'?' + '&'.join(params) if params else ''}"
+
+
+def home_url():
+    return f'{BASE_URL}/'
+
+
+def get_random_user_agent():
+    """Получение случайного User-Agent"""
+    return random.choice(USER_AGENTS)
+
+
+def get_random_ip():
+    """Получение случайного IP"""
+    return random.choice(CLIENT_IPS)
+
+
+def browser_headers(user_agent=DEFAULT_USER_AGENT, site='none', referer=None,
+                    accept_language='en-US,en;q=0.9'):
+    """Набор заголовков обычной навигации браузера"""
+    headers = {
+        'User-Agent': user_agent,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': accept_language,
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': site,
+        'Sec-Fetch-User': '?1',
+        'Upgrade-Insecure-Requests': '1',
+        'DNT': '1'
+    }
+    if referer:
+        headers['Referer'] = referer
+    return headers
+
+
+def spoofed_ip_headers(client_ip):
+    """Заголовки с подменой клиентского IP"""
+    return {
+        'Client-IP': client_ip,
+        'X-Forwarded-For': client_ip,
+        'X-Real-IP': client_ip
+    }
+
+
+def is_cloudflare_challenge(content):
+    """Страница-заглушка Cloudflare вместо листинга"""
+    return any(marker in content for marker in CLOUDFLARE_MARKERS)
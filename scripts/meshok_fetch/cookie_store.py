@@ -0,0 +1,213 @@
+"""Общее для процессов хранилище cookies с учетом срока жизни.
+
+Раньше каждый запуск session/simple_python получал cookies заново:
+запрос главной страницы в одноразовый CookieJar перед каждым листингом.
+Теперь cookies лежат в data/cookies.sqlite: каждая Session (и клиенты
+httpx и cloudscraper) начинает с непросроченных cookies из файла, а все
+новые cookies из ответов сразу записываются обратно. Главная страница
+запрашивается, только если для сайта нет действующей сессии (has_session).
+Selenium-бэкенды передают cookies в Chrome через DevTools перед открытием
+страницы и забирают их после (to_cdp / from_cdp, см. backends._chrome).
+
+SQLite в режиме WAL с таймаутом блокировки позволяет писать из нескольких
+процессов одновременно. Cookie без срока (сессионная cookie браузера)
+считается действительной SESSION_COOKIE_TTL после последнего получения.
+
+    python3 -m meshok_fetch.cookie_store list
+    python3 -m meshok_fetch.cookie_store clear
+"""
+
+import http.cookiejar
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+from .common import DATA_DIR
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cookies (
+    domain TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    expires INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (domain, path, name)
+)
+'''
+
+SESSION_COOKIE_TTL = 30 * 60
+
+# Поля http.cookiejar.Cookie, из которых она восстанавливается
+COOKIE_FIELDS = ('version', 'name', 'value', 'port', 'port_specified', 'domain', 'domain_specified',
+                 'domain_initial_dot', 'path', 'path_specified', 'secure', 'expires', 'discard',
+                 'comment', 'comment_url', 'rfc2109')
+
+
+def _cookie_data(cookie):
+    data = {field: getattr(cookie, field) for field in COOKIE_FIELDS}
+    data['rest'] = cookie._rest
+    return data
+
+
+class CookieStore:
+    """Cookies в SQLite по (domain, path, name); потокобезопасно и безопасно между процессами"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, 'cookies.sqlite')
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def load(self, now=None):
+        """Непросроченные cookies; просроченные заодно удаляются из файла"""
+        now = int(time.time() if now is None else now)
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM cookies WHERE expires <= ?', (now,))
+            rows = self._db.execute('SELECT data FROM cookies').fetchall()
+        return [http.cookiejar.Cookie(**json.loads(data)) for data, in rows]
+
+    def put(self, cookie, now=None):
+        now = time.time() if now is None else now
+        expires = cookie.expires if cookie.expires is not None else now + SESSION_COOKIE_TTL
+        if expires <= now:
+            self.delete(cookie.domain, cookie.path, cookie.name)
+            return
+        updated_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO cookies (domain, path, name, expires, data, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (cookie.domain, cookie.path, cookie.name, int(expires), json.dumps(_cookie_data(cookie)),
+                 updated_at)
+            )
+
+    def delete(self, domain=None, path=None, name=None):
+        """Удаляет cookies по тем же аргументам, что и CookieJar.clear"""
+        query = 'DELETE FROM cookies'
+        params = [value for value in (domain, path, name) if value is not None]
+        conditions = [f'{column} = ?' for column, value in zip(('domain', 'path', 'name'), (domain, path, name))
+                      if value is not None]
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        with self._lock, self._db:
+            self._db.execute(query, params)
+
+    def entries(self):
+        with self._lock:
+            return self._db.execute('SELECT domain, path, name, expires, updated_at FROM cookies '
+                                    'ORDER BY domain, path, name').fetchall()
+
+    def jar(self):
+        """CookieJar с cookies из файла, записывающий изменения обратно"""
+        return PersistentCookieJar(self)
+
+
+class PersistentCookieJar(http.cookiejar.CookieJar):
+    """CookieJar, каждая установка и удаление cookie которого сразу попадает в CookieStore"""
+
+    def __init__(self, store, policy=None):
+        super().__init__(policy)
+        self.store = store
+        for cookie in store.load():
+            super().set_cookie(cookie)
+
+    def set_cookie(self, cookie):
+        super().set_cookie(cookie)
+        self.store.put(cookie)
+
+    def clear(self, domain=None, path=None, name=None):
+        try:
+            super().clear(domain, path, name)
+        finally:
+            # Cookie могла появиться в файле от другого процесса уже после загрузки jar
+            self.store.delete(domain, path, name)
+
+
+def to_cdp(cookie):
+    """CookieParam для DevTools Network.setCookies из http.cookiejar.Cookie"""
+    scheme = 'https' if cookie.secure else 'http'
+    param = {'name': cookie.name, 'value': cookie.value or '', 'path': cookie.path,
+             'secure': cookie.secure, 'httpOnly': cookie.has_nonstandard_attr('HttpOnly')}
+    # Cookie для домена с поддоменами - с точкой; без нее Chrome ставит cookie только хосту по url
+    if cookie.domain.startswith('.'):
+        param['domain'] = cookie.domain
+    else:
+        param['url'] = f'{scheme}://{cookie.domain}{cookie.path}'
+    if cookie.expires is not None:
+        param['expires'] = cookie.expires
+    same_site = cookie.get_nonstandard_attr('SameSite')
+    if same_site in ('Strict', 'Lax', 'None'):
+        param['sameSite'] = same_site
+    return param
+
+
+def from_cdp(data):
+    """http.cookiejar.Cookie из cookie DevTools (Network.getAllCookies)"""
+    domain = data['domain']
+    session = data.get('session', False) or data.get('expires', -1) < 0
+    rest = {}
+    if data.get('httpOnly'):
+        rest['HttpOnly'] = None
+    if data.get('sameSite'):
+        rest['SameSite'] = data['sameSite']
+    return http.cookiejar.Cookie(
+        0, data['name'], data['value'], None, False, domain, domain.startswith('.'), domain.startswith('.'),
+        data.get('path', '/'), True, data.get('secure', False), None if session else int(data['expires']),
+        session, None, None, rest
+    )
+
+
+def has_session(jar, url):
+    """Есть ли в jar действующие cookies, которые уйдут с запросом на url"""
+    request = urllib.request.Request(url)
+    jar.add_cookie_header(request)
+    return request.has_header('Cookie')
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_cookie_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = CookieStore()
+        return _default_store
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='meshok_fetch.cookie_store', description='Shared cookie store tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='print stored cookies with their expiry (values are not shown)')
+    clear = sub.add_parser('clear', help='forget stored cookies so the next fetch warms up a new session')
+    clear.add_argument('--domain', help='only cookies of this domain')
+    args = parser.parse_args(argv)
+
+    store = default_cookie_store()
+    if args.command == 'list':
+        store.load()
+        for domain, path, name, expires, updated_at in store.entries():
+            until = datetime.fromtimestamp(expires, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            print(f'🍪 {domain}{path} {name} (expires {until}, updated {updated_at})')
+    elif args.command == 'clear':
+        store.delete(args.domain)
+        print('✅ Cookies cleared')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
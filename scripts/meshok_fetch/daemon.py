@@ -0,0 +1,451 @@
+"""Резидентный fetch-сервис: JSON-RPC 2.0 поверх Unix-сокета.
+
+Каждый запуск fetch-*.py платит за старт интерпретатора, импорт
+бэкенда и новые соединения ради одной страницы. Демон держит все это
+прогретым: модули бэкендов и движок разбора импортированы, пул
+http.client-соединений и клиент httpx живут между запросами, браузерные
+бэкенды получают пул Chrome (BrowserPool). Node-серверы и cron-задачи
+отправляют запросы в сокет и получают те же записи, что и --json.
+
+    python3 -m meshok_fetch.daemon serve --preload httpx session
+    python3 -m meshok_fetch.daemon call fetch '{"category_id": "252", "backend": "httpx"}'
+    python3 -m meshok_fetch.daemon call status
+
+Протокол: JSON-RPC 2.0, по одному JSON-объекту (или массиву-пакету) на
+строку в обе стороны. Запросы одного соединения выполняются конкурентно,
+ответ приходит по готовности с id запроса. Методы:
+
+    fetch(category_id, finished=true, backend, page=1, save=true, analyze=true,
+          use_cache=true, parser, block)               -> запись meshok_fetch.page/1
+    fetch_batch(category_ids, finished=true, backend='httpx', concurrency=8, ...)
+                                                       -> {"pages": [...], "ok": n, "failed": n}
+    status()                                           -> состояние пулов и счетчики
+
+Ошибка загрузки возвращается записью с полем error, а не ошибкой RPC:
+ошибки RPC означают неверный запрос (код -32600..-32700).
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+
+from .backends import BACKENDS, DEFAULT_BACKEND, load_backend
+from .common import DATA_DIR, DEFAULT_BLOCK_PROFILE, build_url
+from .engine import error_record, fetch, page_record, process_result
+from .metrics import observe_error
+from .parsers import DEFAULT_ENGINE, ENGINES, load_engine
+
+SOCKET_ENV = 'MESHOK_SOCKET'
+DEFAULT_SOCKET = os.environ.get(SOCKET_ENV) or os.path.join(DATA_DIR, 'meshok_fetch.sock')
+DEFAULT_WORKERS = 8
+DEFAULT_CONCURRENCY = 8
+# Пакет из всех категорий с лотами помещается в одну строку
+MAX_LINE = 16 * 1024 * 1024
+
+# Бэкенд с асинхронным клиентом: его запросы идут через общий AsyncClient демона
+ASYNC_BACKEND = 'httpx'
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class RpcError(Exception):
+    """Ошибка JSON-RPC с кодом; у клиента - ответ демона с полем error"""
+
+    def __init__(self, code, message, data=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def as_dict(self):
+        error = {'code': self.code, 'message': self.message}
+        if self.data is not None:
+            error['data'] = self.data
+        return error
+
+
+def _response(request_id, result=None, error=None):
+    if error is not None:
+        return {'jsonrpc': '2.0', 'id': request_id, 'error': error.as_dict()}
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+class FetchDaemon:
+    """Сервер JSON-RPC с прогретыми бэкендами; блокирующие загрузки идут в пул потоков"""
+
+    def __init__(self, path=DEFAULT_SOCKET, workers=DEFAULT_WORKERS, browsers=2, http2=False):
+        self.path = path
+        self.browsers = browsers
+        self.http2 = http2
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='fetch')
+        self.started_at = datetime.now(timezone.utc)
+        self.stats = {'connections': 0, 'requests': {}, 'rpc_errors': 0}
+        self.in_flight = 0
+        self.methods = {'fetch': self.fetch, 'fetch_batch': self.fetch_batch, 'status': self.status}
+        self._backends = set()
+        self._client = None
+        self._client_lock = None
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+    # --- прогретые ресурсы ---
+
+    def _backend(self, name):
+        if name not in BACKENDS:
+            raise RpcError(INVALID_PARAMS, f"Unknown backend '{name}', expected one of: {', '.join(BACKENDS)}")
+        module = load_backend(name)
+        self._backends.add(name)
+        return module
+
+    async def _async_client(self, module):
+        """Один AsyncClient на демон: keep-alive соединения переживают запросы"""
+        async with self._client_lock:
+            if self._client is None:
+                self._client = module.make_client(max_connections=DEFAULT_CONCURRENCY, http2=self.http2)
+                await self._client.__aenter__()
+            return self._client
+
+    def _browser_pool(self, name, module):
+        if not getattr(module, 'SUPPORTS_BROWSER_POOL', False):
+            return None
+        from .browser_pool import BrowserPool
+
+        with self._pools_lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                pool = self._pools[name] = BrowserPool(module.start_driver, self.browsers)
+            return pool
+
+    def preload(self, names, parser=DEFAULT_ENGINE):
+        """Импортирует бэкенды и движок разбора до первого запроса"""
+        load_engine(parser)
+        for name in names:
+            try:
+                self._backend(name)
+            except ImportError as e:
+                print(f'⚠️  Backend {name} not preloaded: {e}')
+                continue
+            print(f'🔥 Preloaded backend {name}')
+
+    # --- методы RPC ---
+
+    async def _fetch_page(self, category_id, finished, backend, page, save, analyze, use_cache, parser, block):
+        """PageResult одной страницы: httpx - в цикле событий, остальные - в пуле потоков"""
+        module = self._backend(backend)
+        loop = asyncio.get_running_loop()
+        if backend != ASYNC_BACKEND or not hasattr(module, 'make_client'):
+            call = partial(fetch, category_id, finished, backend=backend, save=save, analyze=analyze,
+                           use_cache=use_cache, parser=parser, block=block, verbose=False, page=page,
+                           pool=self._browser_pool(backend, module))
+            return await loop.run_in_executor(self.executor, call)
+
+        cache = None
+        if use_cache:
+            from .http_cache import default_cache
+            cache = default_cache(save)
+        client = await self._async_client(module)
+        started = time.perf_counter()
+        try:
+            result = await module.get_page(client, build_url(category_id, finished, page), cache)
+        except Exception as e:
+            observe_error(backend, e)
+            raise
+        result.backend = backend
+        result.meta['elapsed'] = time.perf_counter() - started
+        # Разбор - в пуле потоков, чтобы не задерживать остальные запросы
+        return await loop.run_in_executor(self.executor, partial(
+            process_result, result, category_id, finished, save=save, analyze=analyze, verbose=False,
+            parser=parser, page=page))
+
+    async def fetch(self, category_id, finished=True, backend=DEFAULT_BACKEND, page=1, save=True, analyze=True,
+                    use_cache=True, parser=DEFAULT_ENGINE, block=DEFAULT_BLOCK_PROFILE):
+        """Запись meshok_fetch.page/1 для страницы листинга"""
+        if parser not in ENGINES:
+            raise RpcError(INVALID_PARAMS, f"Unknown parser engine '{parser}'")
+        try:
+            result = await self._fetch_page(category_id, finished, backend, page, save, analyze,
+                                            use_cache, parser, block)
+        except RpcError:
+            raise
+        except Exception as e:
+            print(f'❌ {category_id}: {type(e).__name__}: {e}')
+            return error_record(e, category_id, finished, backend, page)
+        return page_record(result, category_id, finished, page)
+
+    async def fetch_batch(self, category_ids, finished=True, backend=ASYNC_BACKEND, concurrency=DEFAULT_CONCURRENCY,
+                          save=True, analyze=True, use_cache=True, parser=DEFAULT_ENGINE,
+                          block=DEFAULT_BLOCK_PROFILE):
+        """Записи для категорий в порядке category_ids, не больше concurrency загрузок сразу"""
+        if not isinstance(category_ids, list):
+            raise RpcError(INVALID_PARAMS, 'category_ids must be a list')
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(category_id):
+            async with semaphore:
+                return await self.fetch(category_id, finished, backend, save=save, analyze=analyze,
+                                        use_cache=use_cache, parser=parser, block=block)
+
+        pages = await asyncio.gather(*(fetch_one(category_id) for category_id in category_ids))
+        failed = sum(1 for record in pages if not record['ok'])
+        return {'pages': pages, 'ok': len(pages) - failed, 'failed': failed}
+
+    async def status(self):
+        """Счетчики демона, пулов соединений и браузеров, планировщика"""
+        state = {
+            'pid': os.getpid(),
+            'socket': self.path,
+            'started_at': self.started_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'uptime_s': round((datetime.now(timezone.utc) - self.started_at).total_seconds(), 3),
+            'in_flight': self.in_flight,
+            'connections': self.stats['connections'],
+            'requests': dict(self.stats['requests']),
+            'rpc_errors': self.stats['rpc_errors'],
+            'backends': sorted(self._backends),
+            'async_client': self._client is not None,
+            'browser_pools': {name: dict(pool.stats) for name, pool in self._pools.items()}
+        }
+        transport = sys.modules.get(__package__ + '.transport')
+        if transport is not None and transport._default_pool is not None:
+            state['http_pool'] = dict(transport._default_pool.stats)
+        scheduler = sys.modules.get(__package__ + '.scheduler')
+        if scheduler is not None and scheduler._default_scheduler is not None:
+            state['scheduler'] = dict(scheduler._default_scheduler.stats,
+                                      **scheduler._default_scheduler.retry.stats)
+        return state
+
+    # --- протокол ---
+
+    async def _call(self, request):
+        """Ответ на один объект запроса; None для уведомления (без id)"""
+        if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' \
+                or not isinstance(request.get('method'), str):
+            self.stats['rpc_errors'] += 1
+            request_id = request.get('id') if isinstance(request, dict) else None
+            return _response(request_id, error=RpcError(INVALID_REQUEST, 'Invalid Request'))
+        request_id = request.get('id')
+        notification = 'id' not in request
+        name = request['method']
+        try:
+            method = self.methods.get(name)
+            if method is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Method '{name}' not found", sorted(self.methods))
+            params = request.get('params', {})
+            args, kwargs = (params, {}) if isinstance(params, list) else ((), params)
+            if not isinstance(kwargs, dict):
+                raise RpcError(INVALID_PARAMS, 'params must be an object or an array')
+            try:
+                inspect.signature(method).bind(*args, **kwargs)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e)) from None
+
+            self.stats['requests'][name] = self.stats['requests'].get(name, 0) + 1
+            self.in_flight += 1
+            try:
+                result = await method(*args, **kwargs)
+            finally:
+                self.in_flight -= 1
+        except RpcError as e:
+            self.stats['rpc_errors'] += 1
+            return None if notification else _response(request_id, error=e)
+        except Exception as e:
+            self.stats['rpc_errors'] += 1
+            print(f'❌ {name}: {type(e).__name__}: {e}')
+            error = RpcError(INTERNAL_ERROR, f'{type(e).__name__}: {e}')
+            return None if notification else _response(request_id, error=error)
+        return None if notification else _response(request_id, result)
+
+    async def dispatch(self, line):
+        """Ответ на строку протокола (объект или пакет) или None, если отвечать не нужно"""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.stats['rpc_errors'] += 1
+            return _response(None, error=RpcError(PARSE_ERROR, f'Parse error: {e}'))
+        if isinstance(request, list):
+            if not request:
+                return _response(None, error=RpcError(INVALID_REQUEST, 'Empty batch'))
+            responses = [r for r in await asyncio.gather(*(self._call(item) for item in request)) if r is not None]
+            return responses or None
+        return await self._call(request)
+
+    async def _answer(self, line, writer, write_lock):
+        response = await self.dispatch(line)
+        if response is None:
+            return
+        data = json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n'
+        async with write_lock:
+            writer.write(data)
+            await writer.drain()
+
+    async def _serve_connection(self, reader, writer):
+        self.stats['connections'] += 1
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            # Клиент закрыл запись: доотвечаем на начатые запросы
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, ValueError):
+            # ValueError - строка длиннее MAX_LINE
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    def _claim_socket(self):
+        """Убирает сокет упавшего демона; живой демон на том же пути - ошибка"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+        else:
+            raise RuntimeError(f'another fetch daemon is listening on {self.path}')
+        finally:
+            probe.close()
+
+    async def serve(self):
+        """Принимает соединения до SIGINT/SIGTERM"""
+        self._claim_socket()
+        self._client_lock = asyncio.Lock()
+        server = await asyncio.start_unix_server(self._serve_connection, path=self.path, limit=MAX_LINE)
+        os.chmod(self.path, 0o600)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        print(f'🛰️  Fetch daemon listening on {self.path} (pid {os.getpid()})')
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            await self.close()
+        print('🏁 Fetch daemon stopped')
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.__aexit__(None, None, None)
+            self._client = None
+        for pool in self._pools.values():
+            pool.close()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class Client:
+    """Синхронный клиент демона: одно соединение, запросы по очереди"""
+
+    def __init__(self, path=DEFAULT_SOCKET, timeout=None):
+        self.path = path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(path)
+        self._file = self._socket.makefile('rwb')
+        self._next_id = 0
+
+    def call(self, method, params=None, **kwargs):
+        """Результат метода; ошибка RPC поднимается как RpcError"""
+        self._next_id += 1
+        request = {'jsonrpc': '2.0', 'id': self._next_id, 'method': method,
+                   'params': params if params is not None else kwargs}
+        self._file.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError(f'fetch daemon at {self.path} closed the connection')
+        response = json.loads(line)
+        if 'error' in response:
+            error = response['error']
+            raise RpcError(error['code'], error['message'], error.get('data'))
+        return response['result']
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='meshok_fetch.daemon', description='Resident fetch service (JSON-RPC)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help=f'Unix socket path (default: %(default)s, or {SOCKET_ENV})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve', help='run the daemon until SIGINT/SIGTERM')
+    serve.add_argument('--preload', nargs='*', choices=sorted(BACKENDS), default=[ASYNC_BACKEND, DEFAULT_BACKEND],
+                       metavar='BACKEND', help='backends imported at startup (default: %(default)s)')
+    serve.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help='threads for blocking backends and parsing')
+    serve.add_argument('--browsers', type=int, default=2,
+                       help='Chrome instances kept warm per selenium backend')
+    serve.add_argument('--http2', action='store_true', help='negotiate HTTP/2 in the shared httpx client')
+    serve.add_argument('--metrics-port', type=int, metavar='PORT',
+                       help='also serve OpenMetrics on http://127.0.0.1:PORT/metrics')
+    call = sub.add_parser('call', help='send one request and print the JSON result')
+    call.add_argument('method')
+    call.add_argument('params', nargs='?', default='{}', help='JSON object or array of params')
+    args = parser.parse_args(argv)
+
+    if args.command == 'call':
+        try:
+            with Client(args.socket) as client:
+                result = client.call(args.method, json.loads(args.params))
+        except RpcError as e:
+            print(f'❌ RPC error {e.code}: {e.message}', file=sys.stderr)
+            return 1
+        except OSError as e:
+            print(f'❌ Fetch daemon is not reachable at {args.socket}: {e}', file=sys.stderr)
+            return 1
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    daemon = FetchDaemon(args.socket, args.workers, args.browsers, args.http2)
+    daemon.preload(args.preload)
+    if args.metrics_port:
+        from .metrics import serve as serve_metrics
+
+        serve_metrics(args.metrics_port)
+    try:
+        asyncio.run(daemon.serve())
+    except RuntimeError as e:
+        print(f'❌ {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Потоковая распаковка Content-Encoding (gzip, deflate, br).
+
+Тело распаковывается кусками по мере чтения из сокета, так что в памяти
+не держатся одновременно сжатая и распакованная копии страницы. brotli
+используется, только если установлен пакет brotli или brotlicffi.
+"""
+
+import importlib
+import importlib.util
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+
+_BROTLI_MODULE = next((name for name in ('brotli', 'brotlicffi')
+                       if importlib.util.find_spec(name)), None)
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if _BROTLI_MODULE else 'gzip, deflate'
+
+
+class _IdentityDecoder:
+    def decompress(self, data):
+        return data
+
+    def flush(self):
+        return b''
+
+
+class _ZlibDecoder:
+    def __init__(self, wbits):
+        self._obj = zlib.decompressobj(wbits)
+
+    def decompress(self, data):
+        return self._obj.decompress(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+
+class _DeflateDecoder:
+    """deflate бывает и с zlib-оберткой, и "сырым" - пробуем оба варианта"""
+
+    def __init__(self):
+        self._obj = zlib.decompressobj()
+        self._first = True
+
+    def decompress(self, data):
+        if self._first:
+            self._first = False
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+
+class _BrotliDecoder:
+    def __init__(self):
+        brotli = importlib.import_module(_BROTLI_MODULE)
+        self._obj = brotli.Decompressor()
+        self._decompress = getattr(self._obj, 'process', None) or self._obj.decompress
+
+    def decompress(self, data):
+        return self._decompress(data)
+
+    def flush(self):
+        return b''
+
+
+def make_decoder(content_encoding):
+    encoding = (content_encoding or '').strip().lower()
+    if encoding in ('', 'identity'):
+        return _IdentityDecoder()
+    if encoding in ('gzip', 'x-gzip'):
+        return _ZlibDecoder(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return _DeflateDecoder()
+    if encoding == 'br' and _BROTLI_MODULE:
+        return _BrotliDecoder()
+    raise ValueError(f'Unsupported Content-Encoding: {content_encoding}')
+
+
+def read_decoded(response, chunk_size=CHUNK_SIZE):
+    """Читает http.client-ответ кусками с распаковкой; возвращает (тело, байт по сети).
+
+    Тело - bytearray, в который писались куски: без итоговой копии в bytes.
+    PageResult, сканер и хранилище снимков принимают его как есть.
+    """
+    decoder = make_decoder(response.getheader('Content-Encoding'))
+    body = bytearray()
+    wire_bytes = 0
+    while True:
+        chunk = response.read(chunk_size)
+        if not chunk:
+            break
+        wire_bytes += len(chunk)
+        body += decoder.decompress(chunk)
+    body += decoder.flush()
+    return body, wire_bytes
@@ -0,0 +1,229 @@
+"""Единая точка загрузки листинга: URL, бэкенд, сохранение и анализ."""
+
+import json
+import sys
+import time
+from contextlib import redirect_stdout
+from urllib.error import HTTPError, URLError
+
+from .analysis import analyze_content, print_lots, print_report
+from .backends import BACKENDS, DEFAULT_BACKEND, load_backend
+from .common import BASE_URL, DEFAULT_BLOCK_PROFILE, build_url, is_cloudflare_challenge
+from .lots import extract_lots, lots_from_cards
+from .metrics import observe_error, observe_page, timed
+from .parsers import DEFAULT_ENGINE
+from .storage import save_snapshot
+
+
+# Схема записей --json; поля меняются только с новой версией в имени
+RECORD_SCHEMA = 'meshok_fetch.page/1'
+RECORD_FIELDS = ('schema', 'category_id', 'finished', 'page', 'url', 'final_url', 'backend', 'status', 'ok',
+                 'not_modified', 'cloudflare', 'title', 'snapshot', 'snapshot_changed', 'size', 'wire_bytes',
+                 'elapsed_s', 'timings', 'lot_count', 'lots', 'error')
+
+
+def fetch(category_id='252', finished=True, backend=DEFAULT_BACKEND, save=True, analyze=True,
+          use_cache=True, parser=DEFAULT_ENGINE, block=DEFAULT_BLOCK_PROFILE, verbose=True, page=1, pool=None):
+    """Загружает листинг категории выбранным бэкендом.
+
+    Возвращает PageResult; сводка анализа (если analyze=True) лежит
+    в result.meta['summary'], записи лотов (LotTable) - в result.meta['lots'],
+    hash снимка в хранилище - в result.meta['snapshot'].
+    С use_cache HTTP-бэкенды отправляют условный запрос, и на 304 анализ
+    пропускается (result.meta['not_modified']). parser - движок разбора
+    из meshok_fetch.parsers, block - профиль блокировки ресурсов для
+    браузерных бэкендов (common.BLOCK_PROFILES). verbose=False отключает
+    итоговый отчет (режим --json). page - номер страницы листинга, pool -
+    BrowserPool для браузерных бэкендов (иначе Chrome запускается на загрузку).
+    """
+    module = load_backend(backend)
+    print(module.LABEL)
+
+    url = build_url(category_id, finished, page)
+    print(f'📄 Fetching: {url}')
+
+    started = time.perf_counter()
+    try:
+        if use_cache and getattr(module, 'SUPPORTS_HTTP_CACHE', False):
+            from .http_cache import default_cache
+            result = module.fetch_page(url, cache=default_cache(save))
+        elif getattr(module, 'SUPPORTS_RESOURCE_BLOCKING', False):
+            result = module.fetch_page(url, block=block, pool=pool)
+        else:
+            result = module.fetch_page(url)
+    except Exception as e:
+        observe_error(backend, e)
+        raise
+    result.backend = backend
+    result.meta['elapsed'] = time.perf_counter() - started
+    return process_result(result, category_id, finished, save=save, analyze=analyze, verbose=verbose,
+                          parser=parser, page=page)
+
+
+def process_result(result, category_id, finished=True, save=True, analyze=True, verbose=True,
+                   parser=DEFAULT_ENGINE, page=1):
+    """Общая обработка ответа любого бэкенда: сохранение, анализ и отчет.
+
+    Время записи снимка и разбора добавляется в result.meta['timings'],
+    страница учитывается в метриках процесса (meshok_fetch.metrics).
+    """
+    timings = result.meta.setdefault('timings', {})
+    if save:
+        with timed(timings, 'write'):
+            digest, changed = save_snapshot(result.raw, BACKENDS[result.backend].prefix,
+                                            category_id, finished, page)
+        result.meta['snapshot'] = digest
+        result.meta['snapshot_changed'] = changed
+
+    # Неизменная страница (304) уже разбиралась при прошлой загрузке
+    if analyze and not result.meta.get('not_modified'):
+        with timed(timings, 'parse'):
+            summary = analyze_content(result.raw, parser)
+            if result.title and not summary['title']:
+                summary['title'] = result.title
+            result.meta['summary'] = summary
+            # Браузерные бэкенды уже собрали карточки лотов одним вызовом скрипта
+            cards = result.meta.pop('cards', None)
+            if cards is not None:
+                result.meta['lots'] = lots_from_cards(cards, category_id, page)
+            else:
+                result.meta['lots'] = extract_lots(result.raw, category_id, page)
+    observe_page(result)
+
+    if verbose:
+        print_result(result)
+    return result
+
+
+def print_result(result):
+    print(f'📊 Status code: {result.status}')
+    print(f'📊 Response size: {result.size / 1024:.2f} KB')
+    if 'wire_bytes' in result.meta:
+        print(f"📦 Transferred: {result.meta['wire_bytes'] / 1024:.2f} KB "
+              f"({result.meta['content_encoding']})")
+    if 'blocked' in result.meta:
+        blocked = result.meta['blocked']
+        kinds = ', '.join(f'{kind} {count}' for kind, count in sorted(blocked.items(), key=lambda i: -i[1]))
+        print(f"🌐 Browser traffic: {result.meta['browser_bytes'] / 1024:.2f} KB, "
+              f"{sum(blocked.values())} requests blocked by profile '{result.meta['block_profile']}'"
+              f"{f' ({kinds})' if kinds else ''}")
+    if 'connections' in result.meta:
+        connections = result.meta['connections']
+        print(f"🔌 Connections: {connections['opened']} opened, {connections['reused']} reused")
+
+    if is_cloudflare_challenge(result.content):
+        print('⚠️  Cloudflare challenge detected')
+        print('💡 This site may have very strong protection')
+    else:
+        print('✅ No Cloudflare challenge detected')
+
+    if result.meta.get('not_modified'):
+        print('♻️  Not modified (304): served cached body, analysis skipped')
+
+    if 'snapshot' in result.meta:
+        state = 'new content' if result.meta['snapshot_changed'] else 'unchanged, deduplicated'
+        print(f"✅ Saved snapshot: {result.meta['snapshot'][:12]} ({state})")
+
+    if 'summary' in result.meta:
+        print_report(result.meta['summary'], BASE_URL)
+
+    if 'lots' in result.meta:
+        print_lots(result.meta['lots'])
+
+
+def page_record(result, category_id, finished=True, page=1, url=None):
+    """Запись страницы для --json (схема RECORD_SCHEMA).
+
+    lots - записи Lot.as_dict() или null, если страница не разбиралась
+    (--no-analyze или 304 Not Modified); snapshot - null без сохранения;
+    timings - секунды по этапам из meshok_fetch.metrics.STAGES.
+    """
+    meta = result.meta
+    lots = meta.get('lots')
+    return {
+        'schema': RECORD_SCHEMA,
+        'category_id': str(category_id),
+        'finished': finished,
+        'page': page,
+        'url': url or build_url(category_id, finished, page),
+        'final_url': result.url,
+        'backend': result.backend,
+        'status': result.status,
+        'ok': result.status < 400,
+        'not_modified': bool(meta.get('not_modified')),
+        'cloudflare': is_cloudflare_challenge(result.content),
+        'title': meta['summary']['title'] if 'summary' in meta else result.title,
+        'snapshot': meta.get('snapshot'),
+        'snapshot_changed': meta.get('snapshot_changed'),
+        'size': len(result.raw),
+        'wire_bytes': meta.get('wire_bytes'),
+        'elapsed_s': round(meta['elapsed'], 6) if 'elapsed' in meta else None,
+        'timings': {stage: round(seconds, 6) for stage, seconds in meta.get('timings', {}).items()},
+        'lot_count': len(lots) if lots is not None else None,
+        'lots': [lot.as_dict() for lot in lots] if lots is not None else None,
+        'error': None
+    }
+
+
+def error_record(error, category_id, finished=True, backend=None, page=1):
+    """Запись --json для страницы, загрузка которой завершилась исключением; поля ответа - null"""
+    record = dict.fromkeys(RECORD_FIELDS)
+    record.update({
+        'schema': RECORD_SCHEMA,
+        'category_id': str(category_id),
+        'finished': finished,
+        'page': page,
+        'url': build_url(category_id, finished, page),
+        'backend': backend,
+        'ok': False,
+        'error': {'type': type(error).__name__, 'message': str(error)}
+    })
+    return record
+
+
+def write_record(record, out):
+    """Одна строка NDJSON"""
+    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    out.flush()
+
+
+def report_error(e):
+    """Печать ошибки загрузки в формате прежних fetch-скриптов"""
+    if isinstance(e, HTTPError):
+        print(f'❌ HTTP Error: {e.code} - {e.reason}')
+        if e.code == 403:
+            print('💡 403 Forbidden - Cloudflare is blocking requests')
+            print('💡 Try using a different approach or proxy')
+    elif isinstance(e, URLError):
+        print(f'❌ URL Error: {e.reason}')
+    elif isinstance(e, ImportError):
+        print(f'❌ Import error: {e}')
+        print('💡 Install Python deps: ./scripts/install-python-deps.sh')
+    else:
+        print(f'❌ Error: {e}')
+
+
+def run_cli(backend, argv):
+    """Запуск в стиле fetch-*.py: argv = [category_id, 'true'|'false'] и, по желанию, --json"""
+    json_mode = '--json' in argv
+    argv = [arg for arg in argv if arg != '--json']
+    category_id = argv[0] if len(argv) > 0 else '252'
+    finished = argv[1] != 'false' if len(argv) > 1 else True
+    if json_mode:
+        out = sys.stdout
+        # stdout отдан записи: прогресс бэкенда уходит в stderr
+        with redirect_stdout(sys.stderr):
+            try:
+                result = fetch(category_id, finished, backend=backend, verbose=False)
+            except Exception as e:
+                report_error(e)
+                write_record(error_record(e, category_id, finished, backend), out)
+                return 1
+        write_record(page_record(result, category_id, finished), out)
+        return 0
+    try:
+        fetch(category_id, finished, backend=backend)
+    except Exception as e:
+        report_error(e)
+        return 1
+    return 0
@@ -0,0 +1,204 @@
+"""Локальный HTTP-сервер с записанными страницами листинга для бенчмарков.
+
+Отдает сохраненные снимки meshok.net (последний снимок каждой страницы
+из хранилища), HTML-файлы или синтетический листинг. Бэкенды направляются
+на него через MESHOK_BASE_URL, так что замеры не трогают настоящий сайт.
+Сервер считает запросы и переданные байты (заголовки и тело, как на проводе),
+отвечает gzip, если клиент его принимает, и 304 на совпавший If-None-Match.
+
+    with FixtureServer(snapshot_pages()) as server:
+        os.environ['MESHOK_BASE_URL'] = server.url
+"""
+
+import gzip
+import hashlib
+import http.server
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+from .common import build_url
+
+HOME_PAGE = (b'<html><head><title>Meshok</title></head><body>'
+             b'<a href="/good/252">Coins</a></body></html>')
+
+
+def synthetic_page(lots=2000, page=1, pages=1):
+    """Страница листинга с заданным числом карточек лотов"""
+    first = 300000000 + (page - 1) * lots
+    parts = ['<html><head><title>Монеты</title></head><body><form></form><table>']
+    for i in range(lots):
+        parts.append(
+            f'<tr class="lot"><td><a href="/item/{first + i}_coin"><img src="/i/{i}.jpg"></a></td>'
+            f'<td><a href="/item/{first + i}_coin">Монета {i} года, серебро</a></td>'
+            f'<td class="price">{i % 97 + 1} {i % 1000:03d} ₽</td><td>{i % 30} ставок</td>'
+            f'<td><time datetime="2025-10-03T15:30:00">03.10.2025 15:30</time></td></tr>'
+        )
+    parts.append('</table>')
+    parts.extend(f'<a href="?opt=2&page={n}">{n}</a>' for n in range(2, pages + 1))
+    parts.append('<script>window.pageData = {"page": 1, "total": 40};</script></body></html>')
+    return ''.join(parts)
+
+
+def _target(url):
+    parts = urlsplit(url)
+    return f'{parts.path}?{parts.query}' if parts.query else parts.path
+
+
+def snapshot_pages(store=None, category_id=None):
+    """{путь запроса: HTML} из последних снимков хранилища"""
+    if store is None:
+        from .storage import default_store
+        store = default_store()
+    pages = {}
+    for entry in store.latest_pages():
+        if category_id is not None and entry['category_id'] != str(category_id):
+            continue
+        url = build_url(entry['category_id'], entry['opt'] == 2, entry['page'])
+        pages[_target(url)] = store.get(entry['hash']).encode('utf-8')
+    return pages
+
+
+def synthetic_pages(category_id='252', lots=50, pages=5):
+    """{путь запроса: HTML} синтетического листинга из pages страниц"""
+    return {_target(build_url(category_id, True, page)): synthetic_page(lots, page, pages).encode('utf-8')
+            for page in range(1, pages + 1)}
+
+
+class _Body:
+    __slots__ = ('plain', 'gzip', 'etag')
+
+    def __init__(self, data):
+        self.plain = data
+        self.gzip = gzip.compress(data, compresslevel=6)
+        self.etag = f'"{hashlib.sha1(data).hexdigest()[:16]}"'
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело уходят двумя write: без TCP_NODELAY тело ждет ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        fault = self.server.take_fault(self.path)
+        if fault is not None:
+            self._reply(fault, b'injected fault', {'Content-Type': 'text/plain', 'Retry-After': '0'})
+            return
+        body = self.server.lookup(self.path)
+        if body is None:
+            self._reply(404, b'not found', {'Content-Type': 'text/plain'})
+            return
+        headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': body.etag,
+                   'Set-Cookie': 'fixture_session=1; Path=/; Max-Age=3600'}
+        if self.headers.get('If-None-Match') == body.etag:
+            self._reply(304, b'', headers)
+            return
+        data = body.plain
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            data = body.gzip
+            headers['Content-Encoding'] = 'gzip'
+        self._reply(200, data, headers)
+
+    def _reply(self, status, data, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        # До end_headers заголовки лежат в буфере: их размер и есть байты на проводе
+        header_bytes = sum(len(line) for line in self._headers_buffer) + 2
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.count(header_bytes + len(data))
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    """Отдает pages {путь: HTML}; неизвестные листинги - одну из записанных страниц"""
+
+    daemon_threads = True
+
+    def __init__(self, pages, host='127.0.0.1', port=0):
+        if not pages:
+            raise ValueError('no pages to serve')
+        super().__init__((host, port), _Handler)
+        self.pages = {target: _Body(data) for target, data in pages.items()}
+        self._listing = [self.pages[target] for target in sorted(self.pages)]
+        self._home = _Body(HOME_PAGE)
+        self._stats_lock = threading.Lock()
+        self.stats = {'requests': 0, 'bytes': 0}
+        # {путь: [статус, ...]} - ответы-ошибки, которые отдаются до настоящей страницы
+        self.faults = {}
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def lookup(self, target):
+        if target in self.pages:
+            return self.pages[target]
+        if target == '/':
+            return self._home
+        if target.startswith('/good/'):
+            # Стабильный выбор: одна и та же категория всегда получает одну страницу
+            return self._listing[zlib.crc32(target.encode()) % len(self._listing)]
+        return None
+
+    def take_fault(self, target):
+        """Следующий статус-ошибка для target из faults или None"""
+        with self._stats_lock:
+            statuses = self.faults.get(target)
+            return statuses.pop(0) if statuses else None
+
+    def count(self, sent):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['bytes'] += sent
+
+    def take_stats(self):
+        """Счетчики с прошлого вызова; сбрасывает их"""
+        with self._stats_lock:
+            stats, self.stats = self.stats, {'requests': 0, 'bytes': 0}
+        return stats
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='fixture_server', description='Serve recorded listing pages locally')
+    parser.add_argument('--port', type=int, default=8768)
+    parser.add_argument('--category', help='serve only snapshots of this category')
+    parser.add_argument('--synthetic', action='store_true', help='serve a synthetic 5-page listing')
+    args = parser.parse_args(argv)
+
+    pages = synthetic_pages() if args.synthetic else snapshot_pages(category_id=args.category)
+    if not pages:
+        print('❌ No snapshots recorded; fetch some pages first or use --synthetic')
+        return 1
+    server = FixtureServer(pages, port=args.port)
+    print(f'🧪 Serving {len(pages)} pages at {server.url} (MESHOK_BASE_URL={server.url})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
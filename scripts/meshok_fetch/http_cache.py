@@ -0,0 +1,117 @@
+"""Кэш условных HTTP-запросов (ETag / Last-Modified) для страниц листинга.
+
+Для каждого URL хранятся валидаторы ответа и hash тела в хранилище
+снимков. При повторной загрузке отправляются If-None-Match /
+If-Modified-Since; на 304 тело берется из хранилища, и неизменная
+категория в периодическом обходе стоит несколько сотен байт. С --no-save
+кэш только читается (ReadOnlyCache): новые ответы в хранилище не пишутся.
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from .storage import default_store
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    hash TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+)
+'''
+
+# Заголовки, которые запрещают валидацию кэша и не нужны при условном запросе
+NO_CACHE_HEADERS = ('cache-control', 'pragma')
+
+
+class HttpCache:
+    def __init__(self, store=None, path=None):
+        self.store = store or default_store()
+        path = path or os.path.join(self.store.root, 'http-cache.sqlite')
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def lookup(self, url):
+        """(etag, last_modified, hash) для URL или None"""
+        with self._lock:
+            return self._db.execute('SELECT etag, last_modified, hash FROM http_cache WHERE url = ?',
+                                    (url,)).fetchone()
+
+    def prepare(self, url, headers):
+        """Заголовки запроса с валидаторами из кэша (без no-cache, если валидаторы есть)"""
+        entry = self.lookup(url)
+        if entry is None or self.store.find_object(entry[2]) is None:
+            return dict(headers)
+
+        etag, last_modified, _ = entry
+        headers = {k: v for k, v in headers.items() if k.lower() not in NO_CACHE_HEADERS}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def cached_body(self, url):
+        """Тело из кэша для ответа 304"""
+        entry = self.lookup(url)
+        if entry is None:
+            raise KeyError(url)
+        return self.store.get(entry[2])
+
+    def update(self, url, headers, content):
+        """Запоминает ответ 200, если у него есть валидаторы"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return None
+
+        digest, _, _ = self.store.put_object(content)
+        updated_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO http_cache (url, etag, last_modified, hash, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, etag, last_modified, digest, updated_at)
+            )
+        return digest
+
+    def readonly(self):
+        return ReadOnlyCache(self)
+
+
+class ReadOnlyCache:
+    """Кэш для --no-save: условные запросы по уже сохраненным ответам, без записи новых тел"""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def prepare(self, url, headers):
+        return self.cache.prepare(url, headers)
+
+    def cached_body(self, url):
+        return self.cache.cached_body(url)
+
+    def update(self, url, headers, content):
+        return None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache(save=True):
+    """Общий кэш процесса; save=False - без записи в хранилище снимков"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache if save else _default_cache.readonly()
@@ -0,0 +1,274 @@
+"""Структурированные записи лотов со страницы листинга.
+
+Карточка лота - участок документа от первой ссылки на /item/<id> до первой
+ссылки на следующий лот. Из карточки берутся название (текст ссылки),
+текущая цена в копейках, число ставок и время окончания.
+
+Записи хранятся по колонкам (LotTable): числовые поля - в array, строки -
+в списках, поэтому десятки тысяч лотов обхода категории занимают
+несколько мегабайт, а не сотни, как список словарей.
+"""
+
+import html
+import json
+import re
+from array import array
+from datetime import datetime, timedelta
+
+from .common import BASE_URL
+
+ITEM_ANCHOR_RE = re.compile(rb'href="(/item/(\d+)[^"]*)"[^>]*>([^<]*)')
+PRICE_TAIL_RE = re.compile(rb'\d(?:\d|[ ,.]|\xc2\xa0|&nbsp;)*$')
+PRICE_SEPARATORS_RE = re.compile(rb'\xc2\xa0|&nbsp;| ')
+KOPECKS_RE = re.compile(rb'^(.*?)[,.](\d{1,2})$')
+COUNT_TAIL_RE = re.compile(rb'(\d+)(?:\s|\xc2\xa0|&nbsp;)*$')
+DATE_TEXT_RE = re.compile(rb'(\d{2})\.(\d{2})\.(\d{4})\s+(\d{2}):(\d{2})')
+
+# "руб" - только отдельным словом ("руб.", "руб</span>"): за ним не идет кириллическая буква,
+# иначе "1 рубль 1924 года" в названии дает цену 1
+CURRENCY_MARKERS = (re.compile(re.escape('₽'.encode('utf-8'))),
+                    re.compile(re.escape('руб'.encode('utf-8')) + rb'(?![\xd0\xd1])'))
+BIDS_MARKER = re.compile(re.escape('став'.encode('utf-8')))  # ставка, ставки, ставок
+DATETIME_MARKER = b'datetime="'
+
+# Карточка длиннее этого не бывает; ограничение защищает последний лот страницы
+CARD_LIMIT = 8192
+
+# Значение отсутствующего числового поля в колонках
+MISSING = -1
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_price(raw):
+    """Цена карточки в копейках: b'1 500' -> 150000, b'1 500,50' -> 150050"""
+    digits = PRICE_SEPARATORS_RE.sub(b'', raw)
+    kopecks = 0
+    match = KOPECKS_RE.match(digits)
+    if match:
+        digits, kopecks = match.group(1), int(match.group(2).ljust(2, b'0'))
+    digits = digits.replace(b',', b'').replace(b'.', b'')
+    return int(digits) * 100 + kopecks
+
+
+def parse_end_time(card):
+    """Время окончания торгов в секундах от эпохи (время площадки, без зоны)"""
+    pos = card.find(DATETIME_MARKER)
+    if pos != -1:
+        pos += len(DATETIME_MARKER)
+        try:
+            value = datetime.fromisoformat(card[pos:card.find(b'"', pos)].decode('ascii')[:19])
+        except ValueError:
+            return MISSING
+    else:
+        match = DATE_TEXT_RE.search(card)
+        if not match:
+            return MISSING
+        day, month, year, hour, minute = map(int, match.groups())
+        value = datetime(year, month, day, hour, minute)
+    return int((value.replace(tzinfo=None) - _EPOCH).total_seconds())
+
+
+def _tail_before(card, marker, pattern, lookback=40):
+    """Число непосредственно перед маркером (валютой, словом "ставок")"""
+    found = marker.search(card)
+    if found is None:
+        return None
+    pos = found.start()
+    return pattern.search(card, max(0, pos - lookback), pos)
+
+
+def parse_card_price(card):
+    """Текущая цена карточки в копейках по первому числу перед ₽ или "руб" """
+    for marker in CURRENCY_MARKERS:
+        match = _tail_before(card, marker, PRICE_TAIL_RE)
+        if match:
+            return parse_price(match.group())
+    return MISSING
+
+
+def parse_card_bids(card):
+    match = _tail_before(card, BIDS_MARKER, COUNT_TAIL_RE)
+    return int(match.group(1)) if match else MISSING
+
+
+def format_end_time(seconds):
+    return None if seconds == MISSING else (_EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+def _seconds(value):
+    if value is None:
+        return MISSING
+    value = datetime.fromisoformat(value[:19])
+    return int((value - _EPOCH).total_seconds())
+
+
+class Lot:
+    """Один лот листинга; price - в копейках, end_time - в секундах от эпохи"""
+
+    __slots__ = ('item_id', 'path', 'title', 'price', 'bids', 'end_time', 'category_id', 'page')
+
+    def __init__(self, item_id, path, title, price=MISSING, bids=MISSING, end_time=MISSING,
+                 category_id=0, page=1):
+        self.item_id = item_id
+        self.path = path
+        self.title = title
+        self.price = price
+        self.bids = bids
+        self.end_time = end_time
+        self.category_id = category_id
+        self.page = page
+
+    @property
+    def url(self):
+        return self.path if self.path.startswith('http') else BASE_URL + self.path
+
+    def as_dict(self):
+        """Запись NDJSON; отсутствующие поля - null"""
+        return {
+            'item_id': self.item_id,
+            'url': self.url,
+            'title': self.title,
+            'price_kopecks': None if self.price == MISSING else self.price,
+            'bids': None if self.bids == MISSING else self.bids,
+            'end_time': format_end_time(self.end_time),
+            'category_id': str(self.category_id),
+            'page': self.page
+        }
+
+    def __repr__(self):
+        return f'<Lot {self.item_id} {self.title!r} {self.price}>'
+
+
+class LotTable:
+    """Колонки записей лотов: array для чисел, списки для строк"""
+
+    __slots__ = ('item_ids', 'paths', 'titles', 'prices', 'bids', 'end_times', 'category_ids', 'pages')
+
+    def __init__(self):
+        self.item_ids = array('Q')
+        self.paths = []
+        self.titles = []
+        self.prices = array('q')
+        self.bids = array('i')
+        self.end_times = array('q')
+        self.category_ids = array('I')
+        self.pages = array('I')
+
+    def append(self, item_id, path, title, price=MISSING, bids=MISSING, end_time=MISSING,
+               category_id=0, page=1):
+        self.item_ids.append(item_id)
+        self.paths.append(path)
+        self.titles.append(title)
+        self.prices.append(price)
+        self.bids.append(bids)
+        self.end_times.append(end_time)
+        self.category_ids.append(category_id)
+        self.pages.append(page)
+
+    def extend(self, other):
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def take(self, rows):
+        """Новая таблица из строк rows (номера по возрастанию)"""
+        table = LotTable()
+        for name in self.__slots__:
+            column = getattr(self, name)
+            getattr(table, name).extend(column[row] for row in rows)
+        return table
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    def __getitem__(self, index):
+        return Lot(*(getattr(self, name)[index] for name in self.__slots__))
+
+    def __iter__(self):
+        return map(Lot, *(getattr(self, name) for name in self.__slots__))
+
+    def write_ndjson(self, out):
+        """Запись лотов по одному JSON-объекту на строку; возвращает число записей"""
+        for lot in self:
+            out.write(json.dumps(lot.as_dict(), ensure_ascii=False) + '\n')
+        return len(self)
+
+
+def extract_lots(content, category_id=0, page=1, table=None):
+    """Лоты страницы (bytes или str) в порядке появления; дописывает в table, если задана"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    if table is None:
+        table = LotTable()
+    category_id = int(category_id)
+
+    # Начало карточки и название каждого лота; повторные ссылки на тот же лот
+    # (картинка, название, "подробнее") относятся к той же карточке
+    cards = []
+    seen = set()
+    for match in ITEM_ANCHOR_RE.finditer(content):
+        item_id = int(match.group(2))
+        text = match.group(3).strip()
+        if item_id in seen:
+            if cards and cards[-1][0] == item_id and not cards[-1][3] and text:
+                cards[-1][3] = text
+            continue
+        seen.add(item_id)
+        cards.append([item_id, match.start(), match.group(1), text])
+
+    for i, (item_id, start, path, text) in enumerate(cards):
+        end = cards[i + 1][1] if i + 1 < len(cards) else len(content)
+        card = content[start:min(end, start + CARD_LIMIT)]
+        table.append(
+            item_id,
+            path.decode('utf-8', errors='replace'),
+            html.unescape(text.decode('utf-8', errors='replace')) if text else None,
+            parse_card_price(card),
+            parse_card_bids(card),
+            parse_end_time(card),
+            category_id,
+            page
+        )
+    return table
+
+
+def read_ndjson(lines, table=None):
+    """LotTable из NDJSON, записанного write_ndjson (вывод --crawl)"""
+    if table is None:
+        table = LotTable()
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        price, bids = record.get('price_kopecks'), record.get('bids')
+        table.append(
+            record['item_id'],
+            record['url'],
+            record.get('title'),
+            MISSING if price is None else price,
+            MISSING if bids is None else bids,
+            _seconds(record.get('end_time')),
+            int(record.get('category_id') or 0),
+            record.get('page', 1)
+        )
+    return table
+
+
+def lots_from_cards(cards, category_id=0, page=1, table=None):
+    """LotTable из карточек, собранных в браузере: [(id, path, title, text, datetime), ...].
+
+    Цена, ставки и время берутся из текста карточки теми же правилами, что
+    и в extract_lots, поэтому записи браузерных и HTTP-бэкендов совпадают.
+    """
+    if table is None:
+        table = LotTable()
+    category_id = int(category_id)
+    for item_id, path, title, text, end_time in cards:
+        card = text.encode('utf-8')
+        try:
+            end = _seconds(end_time) if end_time else parse_end_time(card)
+        except ValueError:
+            end = MISSING
+        table.append(int(item_id), path, title or None, parse_card_price(card), parse_card_bids(card),
+                     end, category_id, page)
+    return table
@@ -0,0 +1,262 @@
+"""Счетчики и гистограммы загрузок в текстовом формате OpenMetrics.
+
+Каждый бэкенд кладет длительности этапов запроса в result.meta['timings']
+(секунды по имени этапа, см. STAGES): stdlib-транспорт - DNS, TCP, TLS,
+время до первого байта и скачивание тела, httpx - то же без отдельного DNS,
+браузерные бэкенды - навигацию, ожидание готовности и разбор карточек;
+process_result добавляет разбор HTML и запись снимка. observe_page
+переносит их в общий реестр процесса вместе со статусом и байтами ответа.
+
+Реестр выгружается в файл (--metrics-file или MESHOK_METRICS_FILE, пишется
+при выходе, формат textfile collector node_exporter) и/или отдается на
+локальном /metrics (--metrics-port) для Prometheus:
+
+    python3 -m meshok_fetch --all-categories --metrics-file data/metrics/fetch.prom
+    python3 -m meshok_fetch 252 --crawl --metrics-port 9464 > lots.ndjson
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+FILE_ENV = 'MESHOK_METRICS_FILE'
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Этапы запроса в порядке их прохождения
+STAGES = ('dns', 'connect', 'tls', 'ttfb', 'download',
+          'browser_navigate', 'browser_wait', 'browser_extract', 'parse', 'write')
+
+# Границы гистограмм, секунды: от кэша DNS до ожидания Cloudflare
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Монотонный счетчик с метками; в выводе к имени добавляется _total"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(), unit=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.unit = unit
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        labels = tuple(str(label) for label in labels)
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f'{self.name}_total{_labels(self.labelnames, labels)} {_number(value)}'
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами; бакеты в выводе накопительные"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=STAGE_BUCKETS, unit=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.unit = unit
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        labels = tuple(str(label) for label in labels)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0]
+            counts = series[0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield (f'{self.name}_bucket{_labels(self.labelnames, labels, [("le", _number(float(bound)))])} '
+                       f'{cumulative}')
+            yield f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}'
+            yield f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}'
+
+
+class Registry:
+    """Набор метрик процесса и коллекторы, читаемые в момент выгрузки"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def counter(self, name, documentation, labelnames=(), unit=None):
+        metric = Counter(name, documentation, labelnames, unit)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=STAGE_BUCKETS, unit=None):
+        metric = Histogram(name, documentation, labelnames, buckets, unit)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Текст OpenMetrics, заканчивающийся # EOF"""
+        lines = []
+        families = list(self.metrics)
+        for collect in self.collectors:
+            families.extend(collect())
+        for metric in families:
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            if metric.unit:
+                lines.append(f'# UNIT {metric.name} {metric.unit}')
+            lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+            lines.extend(metric.samples())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.counter('meshok_fetch_requests', 'Fetched pages by backend and HTTP status',
+                            ('backend', 'status'))
+ERRORS = REGISTRY.counter('meshok_fetch_errors', 'Fetches that raised instead of returning a page',
+                          ('backend', 'error'))
+RESPONSE_BYTES = REGISTRY.counter('meshok_fetch_response_bytes', 'Decoded page bytes', ('backend',), 'bytes')
+WIRE_BYTES = REGISTRY.counter('meshok_fetch_wire_bytes', 'Page bytes received on the wire before decoding',
+                              ('backend',), 'bytes')
+REQUEST_SECONDS = REGISTRY.histogram('meshok_fetch_request_seconds',
+                                     'Whole fetch of a page including scheduler waits and retries',
+                                     ('backend',), unit='seconds')
+STAGE_SECONDS = REGISTRY.histogram('meshok_fetch_stage_seconds', 'Duration of one stage of a page fetch',
+                                   ('backend', 'stage'), unit='seconds')
+
+
+def _scheduler_metrics():
+    """Счетчики планировщика и политики повторов, если они уже созданы в процессе"""
+    module = sys.modules.get(__package__ + '.scheduler')
+    if module is None or module._default_scheduler is None:
+        return []
+    scheduler = module._default_scheduler
+    values = [
+        ('meshok_fetch_scheduler_throttled', 'Responses 429/503 that paused a host', scheduler.stats['throttled']),
+        ('meshok_fetch_scheduler_retries', 'Attempts retried after errors or 5xx', scheduler.retry.stats['retries']),
+        ('meshok_fetch_scheduler_failed_fast', 'Requests refused by an open circuit',
+         scheduler.retry.stats['failed_fast']),
+        ('meshok_fetch_scheduler_wait_seconds', 'Time spent waiting for a host token or slot',
+         scheduler.stats['waited_s'])
+    ]
+    metrics = []
+    for name, documentation, value in values:
+        metric = Counter(name, documentation, unit='seconds' if name.endswith('_seconds') else None)
+        metric.inc(amount=value)
+        metrics.append(metric)
+    return metrics
+
+
+REGISTRY.collectors.append(_scheduler_metrics)
+
+
+@contextmanager
+def timed(timings, stage):
+    """Добавляет длительность блока к timings[stage]"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+def observe_page(result, backend=None):
+    """Учитывает полученную страницу: статус, байты, общее время и этапы из meta['timings']"""
+    backend = backend or result.backend or 'unknown'
+    meta = result.meta
+    REQUESTS.inc((backend, result.status))
+    # 304 отдает тело из кэша: по сети оно не передавалось
+    if not meta.get('not_modified'):
+        RESPONSE_BYTES.inc((backend,), len(result.raw))
+    if 'wire_bytes' in meta:
+        WIRE_BYTES.inc((backend,), meta['wire_bytes'])
+    if 'elapsed' in meta:
+        REQUEST_SECONDS.observe((backend,), meta['elapsed'])
+    for stage, seconds in meta.get('timings', {}).items():
+        STAGE_SECONDS.observe((backend, stage), seconds)
+
+
+def observe_error(backend, error):
+    ERRORS.inc((backend, type(error).__name__))
+
+
+def write_file(path, registry=REGISTRY):
+    """Атомарно записывает метрики в path (читатель не увидит половину файла)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
+
+
+def write_at_exit(path, registry=REGISTRY):
+    atexit.register(write_file, path, registry)
+
+
+def serve(port, host='127.0.0.1', registry=REGISTRY):
+    """HTTP-сервер с /metrics в фоновом потоке; возвращает сервер (shutdown() для остановки)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if os.environ.get(FILE_ENV):
+    write_at_exit(os.environ[FILE_ENV])
@@ -0,0 +1,194 @@
+"""Постраничный обход листинга категории.
+
+Первая страница дает число страниц, остальные загружаются параллельно
+с ограничением concurrency. Лоты каждой страницы (LotTable) отдаются по
+мере прихода страниц, не дожидаясь всей категории.
+
+С индексом известных лотов (seen, см. seen_index) страницы разбираются
+по порядку: отдаются только новые и изменившиеся лоты, а обход категории
+останавливается на первой странице без таковых. Часовой инкрементальный
+проход загружает несколько первых страниц вместо всего листинга.
+"""
+
+import asyncio
+import sys
+import time
+
+from .analysis import page_count
+from .backends import load_backend
+from .common import build_url
+from .lots import LotTable, extract_lots
+from .metrics import observe_error, observe_page, timed
+from .storage import save_snapshot
+
+BACKEND = 'httpx'
+
+
+async def crawl_listing(category_id, finished=True, concurrency=4, max_pages=None,
+                        client=None, save=False, log=None, seen=None):
+    """Асинхронный генератор LotTable по всем страницам категории (или до известных лотов с seen)"""
+    backend = load_backend(BACKEND)
+    log = log or (lambda message: None)
+
+    async def get(page):
+        started = time.perf_counter()
+        try:
+            result = await backend.get_page(client, build_url(category_id, finished, page))
+        except Exception as e:
+            observe_error(BACKEND, e)
+            raise
+        result.meta['elapsed'] = time.perf_counter() - started
+        if result.status >= 400:
+            observe_page(result, BACKEND)
+            raise RuntimeError(f'page {page}: HTTP {result.status}')
+        if save:
+            with timed(result.meta.setdefault('timings', {}), 'write'):
+                save_snapshot(result.raw, BACKEND, category_id, finished, page=page)
+        return page, result
+
+    def lots_of(page, result):
+        with timed(result.meta.setdefault('timings', {}), 'parse'):
+            lots = extract_lots(result.raw, category_id, page)
+        observe_page(result, BACKEND)
+        return lots
+
+    if client is None:
+        async with backend.make_client(max_connections=concurrency) as client:
+            async for lots in crawl_listing(category_id, finished, concurrency, max_pages,
+                                            client, save, log, seen):
+                yield lots
+        return
+
+    _, first = await get(1)
+    total = page_count(first.raw)
+    if max_pages:
+        total = min(total, max_pages)
+    log(f'📄 {category_id}: {total} pages')
+
+    if seen is not None:
+        async for lots in _crawl_new(category_id, total, concurrency, first, get, lots_of, log, seen):
+            yield lots
+        return
+
+    yield lots_of(1, first)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(page):
+        async with semaphore:
+            try:
+                return await get(page)
+            except Exception as e:
+                return page, e
+
+    tasks = [asyncio.ensure_future(bounded(page)) for page in range(2, total + 1)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            page, result = await next_done
+            if isinstance(result, Exception):
+                log(f'❌ {category_id}: page {page}/{total}: {result}')
+                continue
+            log(f'✅ {category_id}: page {page}/{total}')
+            yield lots_of(page, result)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _crawl_new(category_id, total, concurrency, first, get, lots_of, log, seen):
+    """Страницы 2..total в порядке номеров, не более concurrency загрузок наперед.
+
+    Страница, все лоты которой уже в seen с тем же отпечатком, завершает
+    обход: загрузки дальше нее отменяются. Лоты ошибочной страницы
+    неизвестны, поэтому после нее обход продолжается.
+    """
+    def fresh_of(page, result):
+        lots = lots_of(page, result)
+        rows = seen.update(lots)
+        return lots.take(rows) if len(rows) < len(lots) else lots
+
+    lots = fresh_of(1, first)
+    if not lots:
+        log(f'⏹️  {category_id}: page 1 has no new lots')
+        return
+    yield lots
+
+    tasks = {}
+    next_page = 2
+    try:
+        for page in range(2, total + 1):
+            while next_page <= total and next_page < page + concurrency:
+                tasks[next_page] = asyncio.ensure_future(get(next_page))
+                next_page += 1
+            try:
+                _, result = await tasks.pop(page)
+            except Exception as e:
+                log(f'❌ {category_id}: page {page}/{total}: {e}')
+                continue
+            lots = fresh_of(page, result)
+            if not lots:
+                log(f'⏹️  {category_id}: page {page}/{total} has no new lots, stopping')
+                return
+            log(f'✅ {category_id}: page {page}/{total}: {len(lots)} new or changed lots')
+            yield lots
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+async def _sweep(category_ids, finished, concurrency, max_pages, save, on_page, seen=None, checkpoint=True):
+    """Обходит категории по очереди; возвращает (число лотов, {category_id: ошибка})"""
+    def log(message):
+        print(message, file=sys.stderr)
+
+    count = 0
+    failed = {}
+    for category_id in category_ids:
+        try:
+            async for lots in crawl_listing(category_id, finished, concurrency, max_pages,
+                                            save=save, log=log, seen=seen):
+                on_page(lots)
+                count += len(lots)
+        except Exception as e:
+            # Недоступная первая страница (ошибка, HTTP 4xx/5xx) пропускает только эту категорию
+            failed[category_id] = e
+            log(f'❌ {category_id}: {type(e).__name__}: {e}')
+        # Индекс сохраняется после каждой категории: прерванный обход не повторит отданные лоты
+        if seen is not None and checkpoint:
+            seen.checkpoint()
+    return count, failed
+
+
+def _failed_note(failed):
+    return f', failed: {", ".join(map(str, failed))}' if failed else ''
+
+
+def crawl(category_ids, finished=True, concurrency=4, max_pages=None, save=False, out=sys.stdout,
+          seen=None):
+    """Обход категорий с выводом записей лотов в NDJSON (прогресс - в stderr).
+
+    Возвращает (число лотов, {category_id: ошибка}) для категорий без первой страницы.
+    """
+    started = time.perf_counter()
+    count, failed = asyncio.run(_sweep(category_ids, finished, concurrency, max_pages, save,
+                                       lambda lots: lots.write_ndjson(out), seen))
+    out.flush()
+    new = ' new or changed' if seen is not None else ''
+    print(f'🏁 {count}{new} lots in {time.perf_counter() - started:.2f}s{_failed_note(failed)}',
+          file=sys.stderr)
+    return count, failed
+
+
+def collect(category_ids, finished=True, concurrency=4, max_pages=None, save=False, seen=None):
+    """Обход категорий с накоплением всех лотов в одной LotTable.
+
+    Возвращает (LotTable, {category_id: ошибка}). Индекс seen здесь не
+    сохраняется: лоты еще никуда не записаны, и вызывающий делает
+    seen.checkpoint() только после их успешной загрузки.
+    """
+    table = LotTable()
+    _, failed = asyncio.run(_sweep(category_ids, finished, concurrency, max_pages, save, table.extend, seen,
+                                   checkpoint=False))
+    if failed:
+        print(f'⚠️  {len(table)} lots collected{_failed_note(failed)}', file=sys.stderr)
+    return table, failed
@@ -0,0 +1,59 @@
+"""Движки разбора страницы листинга.
+
+Все движки возвращают одинаковую сводку (см. new_summary) за один проход
+по документу. Модуль движка импортируется только при выборе, как и
+fetch-бэкенды; lxml и selectolax нужны только для одноименных движков.
+Движки с ACCEPTS_BYTES = True разбирают тело ответа без декодирования.
+"""
+
+import importlib
+
+ENGINES = {
+    'scan': 'scan_engine',
+    'regex': 'regex_engine',
+    'stdlib': 'stdlib_engine',
+    'lxml': 'lxml_engine',
+    'selectolax': 'selectolax_engine'
+}
+
+DEFAULT_ENGINE = 'scan'
+
+PRICE_MARKERS = ('₽', 'руб')
+
+
+def new_summary():
+    return {
+        'title': None,
+        'item_links': [],
+        'prices': [],
+        'tables': 0,
+        'forms': 0,
+        'json': []
+    }
+
+
+def load_engine(name):
+    try:
+        module = ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser engine '{name}', expected one of: {', '.join(ENGINES)}") from None
+    return importlib.import_module(f'{__name__}.{module}')
+
+
+def available_engines():
+    """Движки, зависимости которых установлены"""
+    names = []
+    for name in ENGINES:
+        try:
+            load_engine(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def extract(content, engine=DEFAULT_ENGINE):
+    module = load_engine(engine)
+    if isinstance(content, (bytes, bytearray)) and not getattr(module, 'ACCEPTS_BYTES', False):
+        content = content.decode('utf-8', errors='replace')
+    return module.extract(content)
@@ -0,0 +1,45 @@
+"""Разбор через lxml.html: один проход по дереву элементов."""
+
+import lxml.html
+
+from . import PRICE_MARKERS, new_summary
+from .regex_engine import JSON_RE
+
+
+def _add_price(summary, text):
+    if text:
+        text = text.strip()
+        if text and any(marker in text for marker in PRICE_MARKERS):
+            summary['prices'].append(text)
+
+
+def extract(content):
+    summary = new_summary()
+    root = lxml.html.fromstring(content)
+
+    for el in root.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            # Комментарии и processing instructions: учитываем только хвостовой текст
+            _add_price(summary, el.tail)
+            continue
+
+        if tag == 'a':
+            href = el.get('href')
+            if href and '/item/' in href:
+                summary['item_links'].append(href)
+        elif tag == 'title' and summary['title'] is None:
+            summary['title'] = el.text or ''
+        elif tag == 'table':
+            summary['tables'] += 1
+        elif tag == 'form':
+            summary['forms'] += 1
+
+        if tag == 'script':
+            if el.text:
+                summary['json'].extend(JSON_RE.findall(el.text))
+        elif tag not in ('style', 'title'):
+            _add_price(summary, el.text)
+        _add_price(summary, el.tail)
+
+    return summary
@@ -0,0 +1,26 @@
+"""Разбор регулярными выражениями по тексту документа, без построения DOM."""
+
+import re
+
+from . import new_summary
+
+ITEM_LINK_RE = re.compile(r'href="(/item/[^"]*)"')
+PRICE_RE = re.compile(r'[0-9,]+[ ]*₽|[0-9,]+[ ]*руб')
+JSON_RE = re.compile(r'\{[^{}]*"[^"]*"[^{}]*\}')
+
+
+def extract(content):
+    summary = new_summary()
+    title_start = content.find('<title>')
+    if title_start != -1:
+        title_start += 7
+        title_end = content.find('</title>', title_start)
+        if title_end > title_start:
+            summary['title'] = content[title_start:title_end]
+
+    summary['item_links'] = ITEM_LINK_RE.findall(content)
+    summary['prices'] = PRICE_RE.findall(content)
+    summary['tables'] = content.count('<table')
+    summary['forms'] = content.count('<form')
+    summary['json'] = JSON_RE.findall(content)
+    return summary
@@ -0,0 +1,10 @@
+"""Однопроходный сканер по байтам ответа (см. meshok_fetch.scanner)."""
+
+from ..scanner import scan
+
+# Движок принимает тело ответа без декодирования
+ACCEPTS_BYTES = True
+
+
+def extract(content):
+    return scan(content).summary()
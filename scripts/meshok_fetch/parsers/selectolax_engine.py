@@ -0,0 +1,38 @@
+"""Разбор через selectolax (lexbor, для старых версий - modest)."""
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    from selectolax.parser import HTMLParser
+
+from . import PRICE_MARKERS, new_summary
+from .regex_engine import JSON_RE
+
+
+def extract(content):
+    summary = new_summary()
+    tree = HTMLParser(content)
+
+    for node in tree.root.traverse(include_text=True):
+        tag = node.tag
+        if tag == '-text':
+            parent = node.parent
+            if parent is not None and parent.tag in ('script', 'style', 'title'):
+                continue
+            text = node.text(deep=False).strip()
+            if text and any(marker in text for marker in PRICE_MARKERS):
+                summary['prices'].append(text)
+        elif tag == 'a':
+            href = node.attributes.get('href')
+            if href and '/item/' in href:
+                summary['item_links'].append(href)
+        elif tag == 'title' and summary['title'] is None:
+            summary['title'] = node.text(deep=False)
+        elif tag == 'script':
+            summary['json'].extend(JSON_RE.findall(node.text(deep=False)))
+        elif tag == 'table':
+            summary['tables'] += 1
+        elif tag == 'form':
+            summary['forms'] += 1
+
+    return summary
@@ -0,0 +1,58 @@
+"""Потоковый разбор стандартным html.parser, без внешних зависимостей."""
+
+from html.parser import HTMLParser
+
+from . import PRICE_MARKERS, new_summary
+from .regex_engine import JSON_RE
+
+
+class _ListingParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.summary = new_summary()
+        self._in_title = False
+        self._in_script = False
+        self._title = []
+        self._script = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            for name, value in attrs:
+                if name == 'href' and value and '/item/' in value:
+                    self.summary['item_links'].append(value)
+                    break
+        elif tag == 'title':
+            self._in_title = True
+        elif tag == 'script':
+            self._in_script = True
+        elif tag == 'table':
+            self.summary['tables'] += 1
+        elif tag == 'form':
+            self.summary['forms'] += 1
+
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._in_title:
+            self._in_title = False
+            self.summary['title'] = ''.join(self._title)
+        elif tag == 'script' and self._in_script:
+            self._in_script = False
+            self.summary['json'].extend(JSON_RE.findall(''.join(self._script)))
+            self._script = []
+
+    def handle_data(self, data):
+        if self._in_script:
+            self._script.append(data)
+            return
+        if self._in_title:
+            self._title.append(data)
+            return
+        text = data.strip()
+        if text and any(marker in text for marker in PRICE_MARKERS):
+            self.summary['prices'].append(text)
+
+
+def extract(content):
+    parser = _ListingParser()
+    parser.feed(content)
+    parser.close()
+    return parser.summary
@@ -0,0 +1,258 @@
+"""Загрузка записей лотов в Postgres (auction_lots, auction_lot_urls).
+
+Таблицы создает Node-часть (wolmar-parser5.js); ensure_schema повторяет
+их определения для чистой базы и добавляет колонку content_hash. Данные
+идут через COPY во временную staging-таблицу, затем одним INSERT ... ON
+CONFLICT на таблицу: строка лота обновляется, только если изменился hash
+ее содержимого, так что повторная загрузка той же категории почти ничего
+не пишет.
+
+Нужен psycopg2 (pip install psycopg2-binary). Подключение: --dsn,
+DATABASE_URL или DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD, как в env.example.
+Проверка на локальной базе: scripts/check-pg-loader.py.
+"""
+
+import io
+import os
+import sys
+import time
+
+from .lots import MISSING, format_end_time
+
+AUCTION_NUMBER = os.environ.get('MESHOK_AUCTION_NUMBER', 'meshok')
+
+SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS auction_lots (
+        id SERIAL PRIMARY KEY,
+        lot_number VARCHAR(50),
+        auction_number VARCHAR(50),
+        coin_description TEXT,
+        avers_image_url TEXT,
+        avers_image_path TEXT,
+        revers_image_url TEXT,
+        revers_image_path TEXT,
+        winner_login VARCHAR(100),
+        winning_bid DECIMAL(12, 2),
+        auction_end_date TIMESTAMP,
+        currency VARCHAR(10) DEFAULT 'RUB',
+        parsed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        source_url TEXT,
+        bids_count INTEGER,
+        lot_status VARCHAR(20),
+        year INTEGER,
+        letters VARCHAR(10),
+        metal VARCHAR(10),
+        condition VARCHAR(20),
+        UNIQUE(lot_number, auction_number)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS auction_lot_urls (
+        id SERIAL PRIMARY KEY,
+        auction_number VARCHAR(50),
+        lot_url TEXT NOT NULL,
+        lot_number VARCHAR(50),
+        page_number INTEGER,
+        url_index INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(auction_number, lot_url)
+    )''',
+    'ALTER TABLE auction_lots ADD COLUMN IF NOT EXISTS content_hash TEXT'
+]
+
+LOT_COLUMNS = ('lot_number', 'auction_number', 'coin_description', 'winning_bid', 'bids_count',
+               'auction_end_date', 'lot_status', 'source_url', 'page_number', 'url_index')
+
+STAGE_LOTS = '''CREATE TEMP TABLE meshok_lots_stage (
+    lot_number VARCHAR(50),
+    auction_number VARCHAR(50),
+    coin_description TEXT,
+    winning_bid DECIMAL(12, 2),
+    bids_count INTEGER,
+    auction_end_date TIMESTAMP,
+    lot_status VARCHAR(20),
+    source_url TEXT,
+    page_number INTEGER,
+    url_index INTEGER
+) ON COMMIT DROP'''
+
+# Один лот может попасть в батч дважды (общая категория и подкатегория):
+# DISTINCT ON оставляет первую запись, иначе ON CONFLICT затронет строку дважды.
+# Hash берется от текста ROW(...): в нем NULL и пустая строка различаются, а значения
+# с разделителями экранируются (concat_ws пропускал NULL, и смена NULL <-> значение
+# или сдвиг значения в соседнюю пустую колонку не меняли hash)
+UPSERT_LOTS = '''
+WITH src AS (
+    SELECT DISTINCT ON (lot_number, auction_number) *,
+           md5(ROW(coin_description, winning_bid, bids_count,
+                   auction_end_date, lot_status, source_url)::text) AS content_hash
+    FROM meshok_lots_stage
+    ORDER BY lot_number, auction_number, page_number, url_index
+), upserted AS (
+    INSERT INTO auction_lots AS t (lot_number, auction_number, coin_description, winning_bid,
+                                   bids_count, auction_end_date, lot_status, source_url,
+                                   content_hash, parsed_at)
+    SELECT lot_number, auction_number, coin_description, winning_bid, bids_count,
+           auction_end_date, lot_status, source_url, content_hash, CURRENT_TIMESTAMP
+    FROM src
+    ON CONFLICT (lot_number, auction_number) DO UPDATE SET
+        coin_description = EXCLUDED.coin_description,
+        winning_bid = EXCLUDED.winning_bid,
+        bids_count = EXCLUDED.bids_count,
+        auction_end_date = EXCLUDED.auction_end_date,
+        lot_status = EXCLUDED.lot_status,
+        source_url = EXCLUDED.source_url,
+        content_hash = EXCLUDED.content_hash,
+        parsed_at = EXCLUDED.parsed_at
+    WHERE t.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+    RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+'''
+
+UPSERT_URLS = '''
+INSERT INTO auction_lot_urls AS t (auction_number, lot_url, lot_number, page_number, url_index)
+SELECT DISTINCT ON (auction_number, source_url) auction_number, source_url, lot_number,
+       page_number, url_index
+FROM meshok_lots_stage
+ORDER BY auction_number, source_url, page_number, url_index
+ON CONFLICT (auction_number, lot_url) DO UPDATE SET
+    lot_number = EXCLUDED.lot_number,
+    page_number = EXCLUDED.page_number,
+    url_index = EXCLUDED.url_index
+WHERE (t.lot_number, t.page_number, t.url_index)
+      IS DISTINCT FROM (EXCLUDED.lot_number, EXCLUDED.page_number, EXCLUDED.url_index)
+'''
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def connect(dsn=None):
+    try:
+        import psycopg2
+    except ImportError:
+        raise ImportError('psycopg2 is not installed: pip install psycopg2-binary') from None
+
+    dsn = dsn or os.environ.get('DATABASE_URL')
+    if dsn:
+        conn = psycopg2.connect(dsn)
+    else:
+        conn = psycopg2.connect(
+            host=os.environ.get('DB_HOST', 'localhost'),
+            port=int(os.environ.get('DB_PORT', 5432)),
+            dbname=os.environ.get('DB_NAME', 'wolmar_auctions'),
+            user=os.environ.get('DB_USER', 'postgres'),
+            password=os.environ.get('DB_PASSWORD', '')
+        )
+    # COPY передает текст как есть: кодировка клиента должна совпадать с нашей
+    conn.set_client_encoding('UTF8')
+    return conn
+
+
+def ensure_schema(conn):
+    """Создает недостающие таблицы и колонку content_hash"""
+    from psycopg2 import errors
+
+    with conn.cursor() as cur:
+        for statement in SCHEMA:
+            cur.execute('SAVEPOINT schema')
+            try:
+                cur.execute(statement)
+            except errors.InsufficientPrivilege:
+                # Как и в Node-парсерах: без прав DDL работаем с существующими таблицами
+                cur.execute('ROLLBACK TO SAVEPOINT schema')
+                name = statement.split('(')[0].strip()
+                print(f'⚠️  No DDL privileges, skipped: {name}', file=sys.stderr)
+    conn.commit()
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_rows(cur, table, columns, rows):
+    """COPY строк в таблицу в текстовом формате, одним потоком"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(map(_copy_value, row)))
+        buffer.write('\n')
+    buffer.seek(0)
+    cur.copy_expert(f'COPY {table} ({", ".join(columns)}) FROM STDIN', buffer)
+
+
+def _rubles(kopecks):
+    return None if kopecks == MISSING else f'{kopecks // 100}.{kopecks % 100:02d}'
+
+
+def lot_rows(lots, finished=True, auction_number=AUCTION_NUMBER):
+    """Строки staging-таблицы лотов; url_index - позиция лота на своей странице"""
+    status = 'closed' if finished else 'active'
+    positions = {}
+    for lot in lots:
+        key = (lot.category_id, lot.page)
+        positions[key] = index = positions.get(key, 0) + 1
+        yield (
+            str(lot.item_id),
+            auction_number,
+            lot.title,
+            _rubles(lot.price),
+            None if lot.bids == MISSING else lot.bids,
+            format_end_time(lot.end_time),
+            status,
+            lot.url,
+            lot.page,
+            index
+        )
+
+
+def load_lots(conn, lots, finished=True, auction_number=AUCTION_NUMBER):
+    """Загружает LotTable одной транзакцией; возвращает (вставлено, обновлено)"""
+    with conn.cursor() as cur:
+        cur.execute(STAGE_LOTS)
+        copy_rows(cur, 'meshok_lots_stage', LOT_COLUMNS, lot_rows(lots, finished, auction_number))
+        cur.execute(UPSERT_LOTS)
+        inserted, updated = cur.fetchone()
+        cur.execute(UPSERT_URLS)
+    conn.commit()
+    return inserted, updated
+
+
+def load(lots, finished=True, dsn=None, auction_number=AUCTION_NUMBER):
+    """Подключение, проверка схемы и загрузка LotTable с отчетом в stderr"""
+    started = time.perf_counter()
+    conn = connect(dsn)
+    try:
+        ensure_schema(conn)
+        inserted, updated = load_lots(conn, lots, finished, auction_number)
+    finally:
+        conn.close()
+    unchanged = len(lots) - inserted - updated
+    print(f'✅ {len(lots)} lots in {time.perf_counter() - started:.2f}s: '
+          f'{inserted} inserted, {updated} updated, {unchanged} unchanged or duplicate', file=sys.stderr)
+    return inserted, updated
+
+
+def main(argv=None):
+    import argparse
+
+    from .lots import read_ndjson
+
+    parser = argparse.ArgumentParser(prog='load-lots.py',
+                                     description='Load NDJSON lot records (--crawl output) into Postgres')
+    parser.add_argument('files', nargs='*', help='NDJSON files (default: stdin)')
+    parser.add_argument('--active', action='store_true', help='records are active lots (opt=1)')
+    parser.add_argument('--dsn', help='libpq connection string (default: DATABASE_URL or DB_* variables)')
+    parser.add_argument('--auction-number', default=AUCTION_NUMBER,
+                        help='auction_number of meshok lots (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    lots = None
+    for path in args.files or ['-']:
+        if path == '-':
+            lots = read_ndjson(sys.stdin, lots)
+        else:
+            with open(path, encoding='utf-8') as f:
+                lots = read_ndjson(f, lots)
+
+    load(lots, not args.active, args.dsn, args.auction_number)
+    return 0
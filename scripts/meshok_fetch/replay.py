@@ -0,0 +1,207 @@
+"""Запись ответов любого бэкенда в архив и воспроизведение без сети.
+
+В режиме записи load_backend отдает обертку над модулем бэкенда: каждый
+ответ fetch_page/get_page (URL запроса, статус, итоговый URL, заголовки
+и метаданные бэкенда, тело) дописывается в zip-архив. Тела лежат
+отдельно, по sha256, поэтому повторяющиеся страницы хранятся один раз.
+В режиме воспроизведения вместо бэкенда работает архив: модуль бэкенда
+даже не импортируется, прогрев, паузы и сеть пропускаются, а разбор
+получает те же байты и метаданные, что и при записи.
+
+    python3 -m meshok_fetch 252 -b session --record run.zip
+    python3 -m meshok_fetch 252 -b session --replay run.zip
+    MESHOK_REPLAY=run.zip python3 scripts/fetch-with-session.py 252
+
+Архив пишет один процесс; в нем может быть несколько ответов на один URL,
+воспроизводятся они в порядке записи (последний повторяется).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from datetime import datetime, timezone
+
+from .result import PageResult
+
+RECORD_ENV = 'MESHOK_RECORD'
+REPLAY_ENV = 'MESHOK_REPLAY'
+
+
+class ReplayMiss(LookupError):
+    """URL не записан в архиве"""
+
+
+def _entry_names(archive):
+    return sorted(name for name in archive.namelist() if name.startswith('entries/'))
+
+
+class Recorder:
+    """Дописывает ответы в архив (создает его при необходимости)"""
+
+    replaying = False
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._zip = zipfile.ZipFile(path, 'a', zipfile.ZIP_DEFLATED, compresslevel=6)
+        self._bodies = {name for name in self._zip.namelist() if name.startswith('bodies/')}
+        self._seq = len(_entry_names(self._zip))
+        self._lock = threading.Lock()
+        # Оглавление zip пишется при закрытии
+        atexit.register(self.close)
+
+    def record(self, url, result, backend):
+        raw = result.raw
+        text = isinstance(raw, str)
+        data = raw.encode('utf-8') if text else bytes(raw)
+        digest = hashlib.sha256(data).hexdigest()
+        entry = {
+            'method': 'GET',
+            'url': url,
+            'backend': backend,
+            'status': result.status,
+            'final_url': result.url,
+            'title': result.title,
+            'body': digest,
+            'text': text,
+            'meta': result.meta,
+            'recorded_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        }
+        with self._lock:
+            if self._zip is None:
+                return
+            body_name = f'bodies/{digest}'
+            if body_name not in self._bodies:
+                self._zip.writestr(body_name, data)
+                self._bodies.add(body_name)
+            self._seq += 1
+            self._zip.writestr(f'entries/{self._seq:08d}.json', json.dumps(entry, ensure_ascii=False))
+
+    def backend(self, name, load):
+        return _RecordingBackend(load(), name, self)
+
+    def close(self):
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+
+class Replayer:
+    """Отдает записанные ответы по URL запроса"""
+
+    replaying = True
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._entries = {}
+        for name in _entry_names(self._zip):
+            entry = json.loads(self._zip.read(name))
+            self._entries.setdefault(entry['url'], []).append(entry)
+        self._served = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get(self, url):
+        """PageResult записанного ответа на url"""
+        with self._lock:
+            entries = self._entries.get(url)
+            if not entries:
+                raise ReplayMiss(f'{url} is not recorded in {self.path}')
+            index = self._served.get(url, 0)
+            self._served[url] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+            data = self._zip.read(f"bodies/{entry['body']}")
+        content = data.decode('utf-8') if entry['text'] else data
+        meta = dict(entry['meta'], replayed=True)
+        # Сетевых этапов при воспроизведении не было
+        meta.pop('timings', None)
+        return PageResult(entry['final_url'], entry['status'], content, title=entry['title'], meta=meta)
+
+    def backend(self, name, load):
+        return _ReplayBackend(self, name)
+
+    def close(self):
+        self._zip.close()
+
+
+class _RecordingBackend:
+    """Модуль бэкенда, каждый ответ которого записывается в архив"""
+
+    def __init__(self, module, name, recorder):
+        self._module = module
+        self._name = name
+        self._recorder = recorder
+
+    def __getattr__(self, attr):
+        return getattr(self._module, attr)
+
+    def fetch_page(self, url, *args, **kwargs):
+        result = self._module.fetch_page(url, *args, **kwargs)
+        self._recorder.record(url, result, self._name)
+        return result
+
+    async def get_page(self, client, url, *args, **kwargs):
+        result = await self._module.get_page(client, url, *args, **kwargs)
+        self._recorder.record(url, result, self._name)
+        return result
+
+
+class _NullClient:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _ReplayBackend:
+    """Интерфейс бэкенда (fetch_page и make_client/get_page для пакетного режима) поверх архива"""
+
+    SUPPORTS_HTTP_CACHE = False
+    SUPPORTS_BROWSER_POOL = False
+    SUPPORTS_RESOURCE_BLOCKING = False
+
+    def __init__(self, replayer, name):
+        self._replayer = replayer
+        self.LABEL = f'📼 Replaying {name} responses from {replayer.path}...'
+
+    def fetch_page(self, url, *args, **kwargs):
+        return self._replayer.get(url)
+
+    def make_client(self, *args, **kwargs):
+        return _NullClient()
+
+    async def get_page(self, client, url, *args, **kwargs):
+        return self._replayer.get(url)
+
+
+def open_archive(path, mode):
+    """Recorder ('record') или Replayer ('replay') для архива path"""
+    if mode == 'record':
+        return Recorder(path)
+    if mode == 'replay':
+        return Replayer(path)
+    raise ValueError(f"Unknown archive mode '{mode}', expected 'record' or 'replay'")
+
+
+_env_archive = None
+_env_archive_lock = threading.Lock()
+
+
+def archive_from_env():
+    """Архив из MESHOK_REPLAY / MESHOK_RECORD (воспроизведение важнее) или None"""
+    global _env_archive
+    with _env_archive_lock:
+        if _env_archive is None:
+            if os.environ.get(REPLAY_ENV):
+                _env_archive = Replayer(os.environ[REPLAY_ENV])
+            elif os.environ.get(RECORD_ENV):
+                _env_archive = Recorder(os.environ[RECORD_ENV])
+        return _env_archive
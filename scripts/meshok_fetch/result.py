@@ -0,0 +1,43 @@
+"""Результат загрузки страницы, одинаковый для всех бэкендов."""
+
+
+class PageResult:
+    """Ответ бэкенда: итоговый URL, HTTP-статус и HTML страницы.
+
+    HTTP-бэкенды передают тело ответа байтами: оно декодируется в текст
+    только при первом обращении к content, а сканер и хранилище снимков
+    работают прямо с байтами (см. raw).
+    """
+
+    __slots__ = ('url', 'status', 'body', '_content', 'title', 'backend', 'meta')
+
+    def __init__(self, url, status, content, title=None, backend=None, meta=None):
+        self.url = url
+        self.status = status
+        if isinstance(content, (bytes, bytearray)):
+            self.body = content
+            self._content = None
+        else:
+            self.body = None
+            self._content = content
+        self.title = title
+        self.backend = backend
+        self.meta = meta if meta is not None else {}
+
+    @property
+    def content(self):
+        if self._content is None:
+            self._content = self.body.decode('utf-8', errors='replace')
+        return self._content
+
+    @property
+    def raw(self):
+        """Тело в том виде, в каком его получил бэкенд: bytes или str"""
+        return self.body if self.body is not None else self._content
+
+    @property
+    def size(self):
+        return len(self.content)
+
+    def __repr__(self):
+        return f'<PageResult {self.backend} {self.status} {self.url} {self.size} chars>'
@@ -0,0 +1,211 @@
+"""Повторы с экспоненциальной задержкой и автомат отключения хоста.
+
+Сетевая ошибка, таймаут попытки или ответ 500/502/504 повторяются до
+retries раз с задержкой random(0, min(max_delay, base_delay * 2^n))
+("full jitter": повторы разных категорий не приходят на сайт волной).
+
+Для каждого хоста работает автомат (circuit breaker): после
+failure_threshold неудач подряд хост считается лежащим, и запросы к нему
+сразу завершаются CircuitOpenError вместо ожидания таймаута. Через
+reset_timeout пропускается один пробный запрос (half-open): успех
+возвращает хост в работу, неудача снова отключает его на вдвое больший срок.
+
+Ответы 429/503 повторяет сам планировщик (scheduler) по Retry-After;
+здесь 503 только засчитывается автомату как неудача.
+"""
+
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_RETRIES = 2
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 20.0
+# Дедлайн одной попытки: мертвый хост стоит (retries + 1) * deadline, а не 30 с на каждую категорию
+DEFAULT_ATTEMPT_DEADLINE = 15.0
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+MAX_RESET_TIMEOUT = 300.0
+
+RETRY_STATUSES = (500, 502, 504)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(ConnectionError):
+    """Хост отключен автоматом: запрос не отправлялся"""
+
+
+class CircuitBreaker:
+    """Состояние хоста: closed - запросы идут, open - отказ сразу, half_open - один пробный запрос"""
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.open_for = reset_timeout
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self, now=None):
+        """Можно ли отправить запрос; в half_open разрешает только одну пробу"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if now - self.opened_at < self.open_for:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def retry_in(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.opened_at + self.open_for - now)
+
+    def success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print('✅ Host is back, circuit closed', file=sys.stderr)
+            self.state = CLOSED
+            self.failures = 0
+            self.open_for = self.reset_timeout
+            self._probing = False
+
+    def abandon(self):
+        """Попытка прервана не сетью (отмена, ошибка в коде): проба освобождается без вердикта"""
+        with self._lock:
+            self._probing = False
+
+    def failure(self, now=None):
+        """Засчитывает неудачу; возвращает True, если хост только что отключен"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                # Проба не прошла: отключаем снова, на вдвое больший срок
+                self.open_for = min(MAX_RESET_TIMEOUT, self.open_for * 2)
+            elif self.state == OPEN or self.failures < self.failure_threshold:
+                return False
+            self.state = OPEN
+            self.opened_at = now
+            self._probing = False
+            return True
+
+
+class RetryPolicy:
+    """Повторы попыток и автоматы по хостам; общий для потоков и корутин"""
+
+    def __init__(self, retries=DEFAULT_RETRIES, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 deadline=DEFAULT_ATTEMPT_DEADLINE, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.retries = max(0, retries)
+        self.attempts = self.retries + 1
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = {'retries': 0, 'failed_fast': 0}
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return breaker
+
+    def backoff(self, attempt):
+        """Задержка перед повтором номер attempt (с нуля), full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _admit(self, url, breaker):
+        if not breaker.allow():
+            with self._lock:
+                self.stats['failed_fast'] += 1
+            raise CircuitOpenError(f'{urlsplit(url).netloc} is down, failing fast '
+                                   f'(next probe in {breaker.retry_in():.0f}s)')
+
+    def _outcome(self, url, breaker, attempt, error=None, status=None):
+        """Засчитывает результат попытки; возвращает задержку перед повтором или None"""
+        failed = error is not None or (status is not None and status >= 500)
+        if not failed:
+            breaker.success()
+            return None
+        if breaker.failure():
+            print(f'🔌 {urlsplit(url).netloc}: {breaker.failures} failures in a row, '
+                  f'circuit open for {breaker.open_for:.0f}s', file=sys.stderr)
+        retryable = error is not None or status in RETRY_STATUSES
+        if not retryable or attempt + 1 >= self.attempts or breaker.state == OPEN:
+            return None
+        delay = self.backoff(attempt)
+        with self._lock:
+            self.stats['retries'] += 1
+        if error is None:
+            reason = f'HTTP {status}'
+        else:
+            reason = f'{type(error).__name__}: {error}' if str(error) else type(error).__name__
+        print(f'🔁 {reason}; retry {attempt + 1}/{self.attempts - 1} in {delay:.2f}s', file=sys.stderr)
+        return delay
+
+    def run(self, url, attempt_once, status, errors=()):
+        """attempt_once() с повторами; errors - дополнительные повторяемые исключения"""
+        breaker = self.breaker(url)
+        retryable = (OSError,) + tuple(errors)
+        for attempt in range(self.attempts):
+            self._admit(url, breaker)
+            try:
+                response = attempt_once()
+            except CircuitOpenError:
+                raise
+            except retryable as e:
+                delay = self._outcome(url, breaker, attempt, error=e)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+            delay = self._outcome(url, breaker, attempt, status=status(response))
+            if delay is None:
+                return response
+            time.sleep(delay)
+
+    async def run_async(self, url, attempt_once, status, errors=()):
+        """run для корутины; попытка дольше deadline прерывается и повторяется"""
+        import asyncio
+
+        breaker = self.breaker(url)
+        retryable = (OSError, asyncio.TimeoutError) + tuple(errors)
+        for attempt in range(self.attempts):
+            self._admit(url, breaker)
+            try:
+                response = await attempt_once()
+            except CircuitOpenError:
+                raise
+            except retryable as e:
+                delay = self._outcome(url, breaker, attempt, error=e)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                breaker.abandon()
+                raise
+            delay = self._outcome(url, breaker, attempt, status=status(response))
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
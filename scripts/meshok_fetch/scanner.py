@@ -0,0 +1,94 @@
+"""Однопроходный сканер страницы листинга по байтам ответа.
+
+Одно заранее скомпилированное регулярное выражение проходит документ
+один раз через memoryview, без декодирования всей страницы: декодируются
+только найденные фрагменты (ссылки, цены, заголовок, JSON). Ветки
+выражения начинаются с редких литералов (href=", <t, <form, знак рубля,
+{), а цена ищется от найденной валюты назад по короткому срезу - так
+нет дорогого перебора на каждой цифре документа.
+"""
+
+import re
+
+_RUBLE_SIGN = '₽'.encode('utf-8')
+_RUB = 'руб'.encode('utf-8')
+
+# Группы: 1 - id лота, 2 - номер страницы пагинации, 3 - заголовок
+SCAN_RE = re.compile(
+    rb'href="(?:/item/(\d+)[^"]*"|[^"]*?[?&]page=(\d+))'
+    rb'|<t(?:itle>([^<]*)</title>|able)'
+    rb'|<form'
+    rb'|' + re.escape(_RUBLE_SIGN) + rb'|' + re.escape(_RUB) +
+    rb'|\{[^{}]*"[^"]*"[^{}]*\}'
+)
+
+PRICE_TAIL_RE = re.compile(rb'[0-9,]+ *$')
+PRICE_LOOKBACK = 40
+
+_LT = ord('<')
+_BRACE = ord('{')
+
+
+class ScanResult:
+    __slots__ = ('title', 'item_links', 'item_ids', 'prices', 'tables', 'forms', 'json', 'max_page')
+
+    def __init__(self):
+        self.title = None
+        self.item_links = []
+        self.item_ids = []
+        self.prices = []
+        self.tables = 0
+        self.forms = 0
+        self.json = []
+        self.max_page = 1
+
+    def summary(self):
+        return {
+            'title': self.title,
+            'item_links': self.item_links,
+            'prices': self.prices,
+            'tables': self.tables,
+            'forms': self.forms,
+            'json': self.json
+        }
+
+
+def scan(data):
+    """Сканирует документ (bytes, bytearray, memoryview или str) за один проход"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    view = memoryview(data)
+    result = ScanResult()
+    item_links = result.item_links
+    item_ids = result.item_ids
+    prices = result.prices
+
+    for match in SCAN_RE.finditer(view):
+        group = match.lastindex
+        start, end = match.span()
+        if group == 1:
+            item_links.append(str(view[start + 6:end - 1], 'utf-8', 'replace'))
+            item_ids.append(int(match.group(1)))
+        elif group == 2:
+            page = int(match.group(2))
+            if page > result.max_page:
+                result.max_page = page
+        elif group == 3:
+            if result.title is None:
+                result.title = match.group(3).decode('utf-8', 'replace')
+        else:
+            first = view[start]
+            if first == _LT:
+                if view[start + 1] == 116:  # '<table'
+                    result.tables += 1
+                else:
+                    result.forms += 1
+            elif first == _BRACE:
+                result.json.append(str(view[start:end], 'utf-8', 'replace'))
+            else:
+                # Валюта: число ищем в коротком срезе перед ней
+                tail = PRICE_TAIL_RE.search(view[max(0, start - PRICE_LOOKBACK):start])
+                if tail:
+                    prices.append(str(tail.group(), 'utf-8', 'replace') + str(view[start:end], 'utf-8'))
+
+    return result
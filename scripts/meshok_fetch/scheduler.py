@@ -0,0 +1,245 @@
+"""Вежливый планировщик запросов: token bucket и лимит одновременных запросов на хост.
+
+Вместо фиксированных пауз между запросами каждый бэкенд отправляет запрос
+через scheduler.call(url, send): запрос уходит, как только у хоста есть
+токен и свободный слот, поэтому на свободном сайте обход идет с заданной
+скоростью без лишнего ожидания. Ответ 429/503 ставит хост на паузу на
+Retry-After (или DEFAULT_RETRY_AFTER), вдвое снижает скорость и повторяет
+запрос; каждый успешный ответ возвращает скорость к потолку на 10%.
+Поверх этого call повторяет сетевые ошибки и ответы 5xx и отключает
+лежащий хост (retry.RetryPolicy).
+
+Потолок задается через --rate/--burst/--max-in-flight в CLI или
+MESHOK_RATE / MESHOK_BURST / MESHOK_MAX_IN_FLIGHT; MESHOK_RATE=0 снимает
+ограничение скорости.
+"""
+
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from .retry import DEFAULT_ATTEMPT_DEADLINE, DEFAULT_RETRIES, RetryPolicy
+
+DEFAULT_RATE = 4.0
+DEFAULT_BURST = 8
+DEFAULT_MAX_IN_FLIGHT = 8
+
+THROTTLE_CODES = (429, 503)
+DEFAULT_RETRY_AFTER = 5.0
+# Дольше ждать не имеет смысла: ответ 429 возвращается вызывающему коду
+MAX_RETRY_AFTER = 300.0
+MAX_THROTTLE_RETRIES = 3
+
+# После 429/503 скорость падает вдвое, но не ниже этой доли потолка
+MIN_RATE_SHARE = 0.1
+RECOVERY_SHARE = 0.1
+
+ASYNC_POLL = 0.02
+
+
+def parse_retry_after(value, now=None):
+    """Секунды из Retry-After (число или HTTP-дата); None, если заголовка нет или он непонятен"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    from email.utils import parsedate_to_datetime
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (moment - now).total_seconds())
+
+
+class HostLimiter:
+    """Состояние одного хоста; все методы вызываются под блокировкой планировщика"""
+
+    __slots__ = ('ceiling', 'rate', 'burst', 'max_in_flight', 'tokens', 'updated', 'paused_until', 'in_flight')
+
+    def __init__(self, rate, burst, max_in_flight):
+        self.ceiling = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_in_flight = max_in_flight
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.in_flight = 0
+
+    def try_acquire(self, now):
+        """0 - токен и слот получены; иначе секунды до следующей попытки (None - ждать освобождения слота)"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return None
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate
+            self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def release(self, now, status, retry_after):
+        """Освобождает слот; на 429/503 ставит паузу и возвращает ее длительность"""
+        self.in_flight -= 1
+        if status in THROTTLE_CODES:
+            pause = DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+            self.paused_until = max(self.paused_until, now + pause)
+            if self.ceiling:
+                self.rate = max(self.ceiling * MIN_RATE_SHARE, self.rate / 2)
+                # После паузы без накопленного запаса: иначе хост получит всплеск запросов
+                self.tokens = min(self.tokens, 1.0)
+                self.updated = max(self.updated, self.paused_until)
+            return pause
+        if status is not None and status < 400 and self.rate < self.ceiling:
+            self.rate = min(self.ceiling, self.rate + self.ceiling * RECOVERY_SHARE)
+        return None
+
+
+def _status_attr(response):
+    return getattr(response, 'status', None)
+
+
+class Scheduler:
+    """Лимиты по хостам, общие для всех потоков и корутин процесса"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, max_in_flight=DEFAULT_MAX_IN_FLIGHT, retry=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.retry = retry or RetryPolicy()
+        self.stats = {'requests': 0, 'throttled': 0, 'waited_s': 0.0}
+        self._hosts = {}
+        self._cond = threading.Condition()
+
+    def _limiter(self, url):
+        host = urlsplit(url).netloc
+        limiter = self._hosts.get(host)
+        if limiter is None:
+            limiter = self._hosts[host] = HostLimiter(self.rate, self.burst, self.max_in_flight)
+        return limiter
+
+    def acquire(self, url):
+        """Блокирует поток до разрешения на запрос к хосту url"""
+        started = time.monotonic()
+        with self._cond:
+            limiter = self._limiter(url)
+            while True:
+                delay = limiter.try_acquire(time.monotonic())
+                if delay == 0:
+                    break
+                self._cond.wait(delay)
+            self.stats['requests'] += 1
+            self.stats['waited_s'] += time.monotonic() - started
+        return limiter
+
+    async def acquire_async(self, url):
+        """То же для asyncio: ожидание не блокирует цикл событий"""
+        import asyncio
+
+        started = time.monotonic()
+        while True:
+            with self._cond:
+                limiter = self._limiter(url)
+                delay = limiter.try_acquire(time.monotonic())
+                if delay == 0:
+                    self.stats['requests'] += 1
+                    self.stats['waited_s'] += time.monotonic() - started
+                    return limiter
+            await asyncio.sleep(ASYNC_POLL if delay is None else min(delay, 1.0))
+
+    def release(self, url, status=None, headers=None):
+        """Освобождает слот; на 429/503 возвращает паузу хоста в секундах"""
+        retry_after = parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+        with self._cond:
+            pause = self._limiter(url).release(time.monotonic(), status, retry_after)
+            if pause is not None:
+                self.stats['throttled'] += 1
+            self._cond.notify_all()
+        if pause is not None:
+            print(f'⏳ {status} from {urlsplit(url).netloc}: pausing requests for {pause:.1f}s', file=sys.stderr)
+        return pause
+
+    def _send(self, url, send, status):
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            self.acquire(url)
+            response = None
+            try:
+                response = send()
+            finally:
+                code = status(response) if response is not None else None
+                pause = self.release(url, code, getattr(response, 'headers', None))
+            if pause is None or pause > MAX_RETRY_AFTER or attempt == MAX_THROTTLE_RETRIES:
+                return response
+
+    async def _send_async(self, url, send, status):
+        import asyncio
+
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            await self.acquire_async(url)
+            response = None
+            try:
+                # Дедлайн попытки: зависший ответ прерывается и уходит в повтор
+                response = await asyncio.wait_for(send(), self.retry.deadline or None)
+            finally:
+                code = status(response) if response is not None else None
+                pause = self.release(url, code, getattr(response, 'headers', None))
+            if pause is None or pause > MAX_RETRY_AFTER or attempt == MAX_THROTTLE_RETRIES:
+                return response
+
+    def call(self, url, send, status=_status_attr, errors=()):
+        """send() с соблюдением лимитов хоста, повтором после Retry-After на 429/503
+        и повторами сетевых ошибок (OSError и errors) и 5xx по политике retry"""
+        return self.retry.run(url, lambda: self._send(url, send, status), status, errors)
+
+    async def call_async(self, url, send, status=_status_attr, errors=()):
+        """call для корутины send(); попытка ограничена retry.deadline"""
+        return await self.retry.run_async(url, lambda: self._send_async(url, send, status), status, errors)
+
+
+def _env_number(name, default, kind):
+    value = os.environ.get(name)
+    return kind(value) if value else default
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def default_scheduler():
+    """Планировщик процесса; лимиты из MESHOK_RATE / MESHOK_BURST / MESHOK_MAX_IN_FLIGHT,
+    повторы из MESHOK_RETRIES / MESHOK_ATTEMPT_TIMEOUT"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            retry = RetryPolicy(_env_number('MESHOK_RETRIES', DEFAULT_RETRIES, int),
+                                deadline=_env_number('MESHOK_ATTEMPT_TIMEOUT', DEFAULT_ATTEMPT_DEADLINE, float))
+            _default_scheduler = Scheduler(_env_number('MESHOK_RATE', DEFAULT_RATE, float),
+                                           _env_number('MESHOK_BURST', DEFAULT_BURST, int),
+                                           _env_number('MESHOK_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT, int),
+                                           retry)
+        return _default_scheduler
+
+
+def configure(rate=None, burst=None, max_in_flight=None, retries=None, attempt_timeout=None):
+    """Заменяет планировщик процесса; незаданные параметры берутся из текущего (окружение или по умолчанию)"""
+    global _default_scheduler
+    current = default_scheduler()
+    retry = RetryPolicy(current.retry.retries if retries is None else retries,
+                        deadline=current.retry.deadline if attempt_timeout is None else attempt_timeout)
+    scheduler = Scheduler(current.rate if rate is None else rate,
+                          current.burst if burst is None else burst,
+                          current.max_in_flight if max_in_flight is None else max_in_flight,
+                          retry)
+    with _default_scheduler_lock:
+        _default_scheduler = scheduler
+    return scheduler
@@ -0,0 +1,164 @@
+"""Индекс уже известных лотов для инкрементального обхода листинга.
+
+Файл data/seen-lots.idx: заголовок (MAGIC, число записей), затем
+отсортированные item_id и параллельно им отпечатки карточек (цена,
+ставки, время окончания, название), все - 64-битные числа в порядке
+байтов машины. Файл отображается в память (mmap): поиск - бинарный по
+отображению, без чтения всего индекса, так что миллион лотов - 16 МБ
+на диске и почти ничего в куче.
+
+Новые и изменившиеся лоты копятся в памяти; checkpoint() под файловой
+блокировкой сливает их с текущим файлом (его мог обновить другой процесс)
+и атомарно заменяет его через os.replace. Обход с seen=SeenIndex(...)
+(см. pagination.crawl_listing) останавливается на первой странице, где
+все лоты известны и не изменились, и отдает только новые и изменившиеся.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+from .common import DATA_DIR
+
+MAGIC = b'MSEEN\x00\x01\x00'
+HEADER = struct.Struct('=8sQ')
+
+# Состояния лота относительно индекса
+NEW, CHANGED, KNOWN = 'new', 'changed', 'known'
+
+
+def fingerprint(price, bids, end_time, title):
+    """64-битный отпечаток видимых полей карточки"""
+    data = f'{price}\x1f{bids}\x1f{end_time}\x1f{title or ""}'.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def table_fingerprints(table):
+    """Отпечатки всех лотов LotTable в порядке строк"""
+    return array('Q', map(fingerprint, table.prices, table.bids, table.end_times, table.titles))
+
+
+class SeenIndex:
+    """Отсортированные item_id с отпечатками в mmap плюс еще не сохраненные изменения"""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(DATA_DIR, 'seen-lots.idx')
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._file = self._map = self._ids = self._fingerprints = None
+        self._open()
+
+    def _open(self):
+        try:
+            file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        magic, count = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC:
+            file.close()
+            raise ValueError(f'{self.path}: not a seen-lot index')
+        if count == 0:
+            file.close()
+            return
+        self._file = file
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        end = HEADER.size + count * 8
+        self._ids = view[HEADER.size:end].cast('Q')
+        self._fingerprints = view[end:end + count * 8].cast('Q')
+        view.release()
+
+    def _close_map(self):
+        if self._map is not None:
+            self._ids.release()
+            self._fingerprints.release()
+            self._map.close()
+            self._file.close()
+        self._file = self._map = self._ids = self._fingerprints = None
+
+    def close(self):
+        with self._lock:
+            self._close_map()
+
+    def __len__(self):
+        """Число лотов в файле (без несохраненных)"""
+        return 0 if self._ids is None else len(self._ids)
+
+    def _stored(self, item_id):
+        ids = self._ids
+        if ids is None:
+            return None
+        pos = bisect_left(ids, item_id)
+        if pos < len(ids) and ids[pos] == item_id:
+            return self._fingerprints[pos]
+        return None
+
+    def _state(self, item_id, digest):
+        stored = self._pending.get(item_id)
+        if stored is None:
+            stored = self._stored(item_id)
+        if stored is None:
+            return NEW
+        return KNOWN if stored == digest else CHANGED
+
+    def update(self, table):
+        """Запоминает лоты LotTable; возвращает номера строк новых и изменившихся лотов"""
+        fresh = []
+        digests = table_fingerprints(table)
+        with self._lock:
+            for row, (item_id, digest) in enumerate(zip(table.item_ids, digests)):
+                if self._state(item_id, digest) != KNOWN:
+                    fresh.append(row)
+                    self._pending[item_id] = digest
+        return fresh
+
+    def checkpoint(self):
+        """Сливает несохраненные лоты с файлом и атомарно его заменяет; возвращает их число"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(f'{self.path}.lock', 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                # Перечитываем файл: другой процесс мог сохранить свои лоты после нашего открытия
+                self._close_map()
+                self._open()
+                ids, digests = self._merge(sorted(self._pending.items()))
+                tmp = f'{self.path}.{os.getpid()}.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(HEADER.pack(MAGIC, len(ids)))
+                    ids.tofile(f)
+                    digests.tofile(f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._close_map()
+                self._open()
+            saved = len(self._pending)
+            self._pending.clear()
+            return saved
+
+    def _merge(self, pending):
+        """Отсортированные колонки файла с вставленными/замененными pending [(id, отпечаток)]"""
+        ids, digests = array('Q'), array('Q')
+        old_ids, old_digests = self._ids, self._fingerprints
+        start = 0
+        for item_id, digest in pending:
+            if old_ids is not None:
+                pos = bisect_left(old_ids, item_id, start)
+                # Неизменный участок файла копируется целиком, без цикла по элементам
+                ids.frombytes(old_ids[start:pos].cast('B'))
+                digests.frombytes(old_digests[start:pos].cast('B'))
+                start = pos + 1 if pos < len(old_ids) and old_ids[pos] == item_id else pos
+            ids.append(item_id)
+            digests.append(digest)
+        if old_ids is not None:
+            ids.frombytes(old_ids[start:].cast('B'))
+            digests.frombytes(old_digests[start:].cast('B'))
+        return ids, digests
+
@@ -0,0 +1,250 @@
+"""Хранилище снимков страниц с адресацией по содержимому.
+
+Каждая страница хранится один раз по sha256 своего содержимого, сжатой
+(zstd, если установлен пакет zstandard, иначе gzip):
+
+    data/snapshots/objects/ab/abcdef....html.gz
+
+Манифест (category, opt, page, backend, fetched_at, hash) лежит в SQLite
+рядом с объектами, поэтому "последний снимок категории X" - это поиск
+по индексу, а не обход каталога с перечитыванием всех файлов.
+"""
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from .common import DATA_DIR
+
+ZSTD = importlib.util.find_spec('zstandard') is not None
+
+LEGACY_NAME_RE = re.compile(
+    r'^(?P<backend>.+)_good(?P<category>\d+)_opt(?P<opt>\d)(?:_page(?P<page>\d+))?_'
+    r'(?P<ts>\d{4}-\d{2}-\d{2}T\d{2}-\d{2}-\d{2})-\d+Z\.html$'
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    category_id TEXT NOT NULL,
+    opt INTEGER NOT NULL,
+    page INTEGER NOT NULL DEFAULT 1,
+    backend TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_latest ON snapshots (category_id, opt, page, fetched_at);
+CREATE INDEX IF NOT EXISTS snapshots_hash ON snapshots (hash);
+'''
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class SnapshotStore:
+    def __init__(self, root=None):
+        self.root = root or os.path.join(DATA_DIR, 'snapshots')
+        self.objects_dir = os.path.join(self.root, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, 'manifest.sqlite'), timeout=30,
+                                   check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        # WAL позволяет нескольким процессам обхода писать в манифест одновременно
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _object_path(self, digest, codec):
+        return os.path.join(self.objects_dir, digest[:2], f'{digest}.html.{codec}')
+
+    def find_object(self, digest):
+        for codec in ('zst', 'gz'):
+            path = self._object_path(digest, codec)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _write_object(self, digest, data):
+        codec = 'zst' if ZSTD else 'gz'
+        path = self._object_path(digest, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if codec == 'zst':
+            import zstandard
+            packed = zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            packed = gzip.compress(data, compresslevel=6)
+
+        # Атомарная запись: параллельный процесс не увидит половину объекта. Временное имя
+        # уникально и для потоков одного процесса (batch, браузерный пул, демон)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'{digest}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(f.fileno(), 0o644)
+                f.write(packed)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            # Объект адресован содержимым: если его успел записать другой поток, это успех
+            if os.path.exists(path):
+                return
+            raise
+
+    def put_object(self, content):
+        """Сохраняет содержимое без записи в манифест; возвращает (hash, размер, новый ли объект)"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+
+        created = self.find_object(digest) is None
+        if created:
+            self._write_object(digest, data)
+        return digest, len(data), created
+
+    def put(self, content, category_id, finished=True, backend='unknown', page=1, fetched_at=None):
+        """Сохраняет страницу; возвращает (hash, True если содержимое отличается от прошлого снимка)"""
+        digest, size, _ = self.put_object(content)
+        previous = self.latest(category_id, finished, page)
+
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT INTO snapshots (category_id, opt, page, backend, fetched_at, hash, size) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (str(category_id), 2 if finished else 1, page, backend,
+                 fetched_at or _utcnow(), digest, size)
+            )
+        return digest, previous is None or previous['hash'] != digest
+
+    def get(self, digest):
+        """HTML снимка по hash или его уникальному префиксу (KeyError, если нет или неоднозначен)"""
+        if len(digest) < 64:
+            # Один hash может встречаться в манифесте много раз: считаются разные hash
+            with self._lock:
+                rows = self._db.execute('SELECT DISTINCT hash FROM snapshots '
+                                        'WHERE hash >= ? AND hash < ? LIMIT 2',
+                                        (digest, digest + 'g')).fetchall()
+            if len(rows) > 1:
+                raise KeyError(f'ambiguous prefix {digest}: matches {rows[0]["hash"][:12]}, '
+                               f'{rows[1]["hash"][:12]}...')
+            if rows:
+                digest = rows[0]['hash']
+        path = self.find_object(digest)
+        if path is None:
+            raise KeyError(f'no snapshot {digest}')
+
+        with open(path, 'rb') as f:
+            packed = f.read()
+        if path.endswith('.zst'):
+            import zstandard
+            data = zstandard.ZstdDecompressor().decompress(packed)
+        else:
+            data = gzip.decompress(packed)
+        return data.decode('utf-8')
+
+    def latest(self, category_id, finished=True, page=1, backend=None):
+        """Запись манифеста о последнем снимке категории или None"""
+        query = 'SELECT * FROM snapshots WHERE category_id = ? AND opt = ? AND page = ?'
+        params = [str(category_id), 2 if finished else 1, page]
+        if backend:
+            query += ' AND backend = ?'
+            params.append(backend)
+        query += ' ORDER BY fetched_at DESC LIMIT 1'
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return dict(row) if row else None
+
+    def latest_pages(self):
+        """Последний снимок каждой сохраненной страницы: (category_id, opt, page)"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT s.* FROM snapshots s JOIN ('
+                ' SELECT category_id, opt, page, MAX(fetched_at) AS fetched_at FROM snapshots'
+                ' GROUP BY category_id, opt, page'
+                ') l USING (category_id, opt, page, fetched_at) ORDER BY category_id, opt, page'
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def import_legacy(self, data_dir=DATA_DIR, remove=False):
+        """Переносит старые data/<backend>_good<id>_opt<n>_<timestamp>.html в хранилище"""
+        imported = 0
+        for name in sorted(os.listdir(data_dir)):
+            match = LEGACY_NAME_RE.match(name)
+            if not match:
+                continue
+            path = os.path.join(data_dir, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            fetched_at = datetime.strptime(match['ts'], '%Y-%m-%dT%H-%M-%S').strftime('%Y-%m-%dT%H:%M:%S.000000Z')
+            self.put(data, match['category'], match['opt'] == '2', match['backend'],
+                     int(match['page'] or 1), fetched_at)
+            if remove:
+                os.remove(path)
+            imported += 1
+        return imported
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_store():
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SnapshotStore()
+        return _default_store
+
+
+def save_snapshot(content, backend, category_id, finished=True, page=1):
+    """Сохраняет страницу в хранилище по умолчанию; возвращает (hash, изменилась ли страница)"""
+    return default_store().put(content, category_id, finished, backend, page)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='snapshot-store.py', description='Snapshot store tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+    latest = sub.add_parser('latest', help='print the latest snapshot of a category')
+    latest.add_argument('category_id')
+    latest.add_argument('--active', action='store_true', help='active lots (opt=1)')
+    latest.add_argument('--page', type=int, default=1)
+    latest.add_argument('--html', action='store_true', help='print page HTML instead of manifest entry')
+    sub.add_parser('pages', help='print the latest snapshot of every saved page as NDJSON')
+    cat = sub.add_parser('cat', help='print snapshot HTML by hash')
+    cat.add_argument('hash')
+    imp = sub.add_parser('import', help='import legacy timestamped HTML dumps')
+    imp.add_argument('data_dir', nargs='?', default=DATA_DIR)
+    imp.add_argument('--remove', action='store_true', help='delete imported files')
+    args = parser.parse_args(argv)
+
+    store = default_store()
+    if args.command == 'latest':
+        entry = store.latest(args.category_id, not args.active, args.page)
+        if entry is None:
+            print(f'❌ No snapshots for category {args.category_id}', file=sys.stderr)
+            return 1
+        print(store.get(entry['hash']) if args.html else json.dumps(entry, ensure_ascii=False))
+    elif args.command == 'pages':
+        for entry in store.latest_pages():
+            print(json.dumps(entry, ensure_ascii=False))
+    elif args.command == 'cat':
+        try:
+            print(store.get(args.hash))
+        except KeyError as e:
+            print(f'❌ {e.args[0].capitalize()}', file=sys.stderr)
+            return 1
+    elif args.command == 'import':
+        print(f'✅ Imported {store.import_legacy(args.data_dir, args.remove)} files')
+    return 0
@@ -0,0 +1,258 @@
+"""Пул постоянных HTTP-соединений на http.client для stdlib-бэкендов.
+
+urllib открывает новое TCP+TLS соединение на каждый запрос; здесь
+соединения держатся открытыми по (scheme, host, port) и переиспользуются,
+так что рукопожатие TLS платится один раз на хост, а не на страницу.
+Каждый ответ несет длительности этапов (Response.timings): DNS, TCP и TLS
+для нового соединения, время до первого байта и скачивание тела.
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+import urllib.request
+from urllib.error import HTTPError
+from urllib.parse import urljoin, urlsplit
+
+from .decoding import read_decoded
+from .result import PageResult
+from .scheduler import default_scheduler
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+# Ошибки, означающие что сервер уже закрыл простаивающее соединение
+STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                ConnectionResetError, BrokenPipeError)
+
+
+def _open_socket(host, port, timeout, timings):
+    """socket.create_connection с раздельным замером DNS и TCP-подключения"""
+    started = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    resolved = time.perf_counter()
+    timings['dns'] = resolved - started
+    error = None
+    for family, kind, proto, _, address in addresses:
+        sock = socket.socket(family, kind, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+        except OSError as e:
+            sock.close()
+            error = e
+            continue
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        timings['connect'] = time.perf_counter() - resolved
+        return sock
+    raise error or OSError(f'getaddrinfo returned no addresses for {host}')
+
+
+class _TimedHTTPConnection(http.client.HTTPConnection):
+    """Соединение, записывающее этапы подключения в timings текущего запроса"""
+
+    timings = None
+
+    def connect(self):
+        self.sock = _open_socket(self.host, self.port, self.timeout, self.timings)
+
+
+class _TimedHTTPSConnection(http.client.HTTPSConnection):
+    timings = None
+
+    def connect(self):
+        sock = _open_socket(self.host, self.port, self.timeout, self.timings)
+        started = time.perf_counter()
+        self.sock = self._context.wrap_socket(sock, server_hostname=self.host)
+        self.timings['tls'] = time.perf_counter() - started
+
+
+class Response:
+    """Полностью прочитанный HTTP-ответ"""
+
+    __slots__ = ('url', 'status', 'reason', 'headers', 'body', 'wire_bytes', 'not_modified', 'timings')
+
+    def __init__(self, url, status, reason, headers, body, wire_bytes=None, timings=None):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.wire_bytes = len(body) if wire_bytes is None else wire_bytes
+        self.not_modified = False
+        self.timings = timings if timings is not None else {}
+
+    def text(self, encoding='utf-8'):
+        return self.body.decode(encoding, errors='replace')
+
+    def info(self):
+        # Интерфейс, который ждет http.cookiejar.CookieJar.extract_cookies
+        return self.headers
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise HTTPError(self.url, self.status, self.reason, self.headers, None)
+
+
+class ConnectionPool:
+    """Простаивающие соединения по хостам; потокобезопасен"""
+
+    def __init__(self, timeout=30, max_idle_per_host=4, ssl_context=None):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.stats = {'opened': 0, 'reused': 0}
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, scheme, host, port):
+        with self._lock:
+            self.stats['opened'] += 1
+        if scheme == 'https':
+            return _TimedHTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+        return _TimedHTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.stats['reused'] += 1
+                return idle.pop(), True
+        return self._new_connection(*key), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method, url, headers=None, body=None):
+        """Один запрос без редиректов и cookies; тело читается целиком и распаковывается"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        timings = {}
+        conn, reused = self._acquire(key)
+        conn.timings = timings
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+        except STALE_ERRORS:
+            conn.close()
+            if not reused:
+                raise
+            # Сервер закрыл keep-alive соединение, повторяем на свежем
+            conn = self._new_connection(*key)
+            conn.timings = timings
+            started = time.perf_counter()
+            conn.request(method, path, body=body, headers=headers or {})
+            response = conn.getresponse()
+        except Exception:
+            conn.close()
+            raise
+        headers_at = time.perf_counter()
+        # Подключение (если было) входит в интервал до заголовков, но считается отдельно
+        timings['ttfb'] = headers_at - started - sum(timings.values())
+
+        try:
+            data, wire_bytes = read_decoded(response)
+        except Exception:
+            conn.close()
+            raise
+        timings['download'] = time.perf_counter() - headers_at
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        return Response(url, response.status, response.reason, response.headers, data, wire_bytes, timings)
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+class Session:
+    """Cookies, редиректы и условные запросы поверх общего пула соединений.
+
+    Каждый запрос проходит через планировщик (scheduler.Scheduler): лимит
+    скорости на хост и повтор после Retry-After на 429/503. Без cookie_jar
+    сессия берет cookies из общего хранилища (cookie_store) и пишет туда новые.
+    """
+
+    def __init__(self, pool=None, cookie_jar=None, cache=None, scheduler=None):
+        self.pool = pool or default_pool()
+        if cookie_jar is None:
+            from .cookie_store import default_cookie_store
+            cookie_jar = default_cookie_store().jar()
+        self.cookie_jar = cookie_jar
+        self.cache = cache
+        self.scheduler = scheduler or default_scheduler()
+
+    def get(self, url, headers=None, use_cache=True):
+        headers = dict(headers or {})
+        cache = self.cache if use_cache else None
+        for _ in range(MAX_REDIRECTS + 1):
+            request_headers = cache.prepare(url, headers) if cache else headers
+            # urllib.request.Request нужен только как адаптер для CookieJar
+            cookie_request = urllib.request.Request(url, headers=request_headers)
+            self.cookie_jar.add_cookie_header(cookie_request)
+            request_headers = dict(cookie_request.header_items())
+
+            response = self.scheduler.call(url, lambda: self.pool.request('GET', url, headers=request_headers))
+            self.cookie_jar.extract_cookies(response, cookie_request)
+
+            if cache and response.status == 304:
+                response.body = cache.cached_body(url).encode('utf-8')
+                response.not_modified = True
+                return response
+
+            location = response.headers.get('Location')
+            if response.status not in REDIRECT_CODES or not location:
+                response.raise_for_status()
+                if cache and response.status == 200:
+                    cache.update(url, response.headers, response.body)
+                return response
+            url = urljoin(url, location)
+
+        raise HTTPError(url, response.status, 'Too many redirects', response.headers, None)
+
+
+def page_result(response, pool=None):
+    """PageResult из ответа пула со статистикой передачи"""
+    meta = {
+        'wire_bytes': response.wire_bytes,
+        'content_encoding': response.headers.get('Content-Encoding', 'identity'),
+        'not_modified': response.not_modified,
+        'headers': response.headers.items(),
+        'timings': dict(response.timings)
+    }
+    if pool is not None:
+        meta['connections'] = dict(pool.stats)
+    return PageResult(response.url, response.status, response.body, meta=meta)
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool():
+    """Пул, общий для всех stdlib-бэкендов процесса"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            # Таймаут сокета - дедлайн одной попытки политики повторов
+            _default_pool = ConnectionPool(timeout=default_scheduler().retry.deadline)
+        return _default_pool
@@ -0,0 +1,32 @@
+const { execFileSync } = require('child_process');
+const path = require('path');
+
+const SNAPSHOT_STORE = path.join(__dirname, 'snapshot-store.py');
+
+// Хранилище ищется в data/ от корня репозитория (или в MESHOK_DATA_DIR)
+function snapshotStore(...args) {
+  return execFileSync('python3', [SNAPSHOT_STORE, ...args], {
+    cwd: path.join(__dirname, '..'),
+    encoding: 'utf-8',
+    maxBuffer: 256 * 1024 * 1024
+  });
+}
+
+// Последние снимки сохраненных страниц из хранилища (snapshot-store.py pages)
+function listSavedPages() {
+  return snapshotStore('pages')
+    .split('\n')
+    .filter(line => line.trim())
+    .map(line => {
+      const entry = JSON.parse(line);
+      entry.name = `${entry.backend}_good${entry.category_id}_opt${entry.opt}_page${entry.page} (${entry.fetched_at})`;
+      return entry;
+    });
+}
+
+// HTML снимка по hash
+function readSavedPage(entry) {
+  return snapshotStore('cat', entry.hash);
+}
+
+module.exports = { listSavedPages, readSavedPage };
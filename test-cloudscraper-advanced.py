@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 import cloudscraper
 import json
-import time
 import random
 
+from scripts.meshok_fetch.scheduler import default_scheduler
+
+# Интервалы между запросами к meshok.net выдерживает общий планировщик
+scheduler = default_scheduler()
+
+
+def polite_get(scraper, url, **kwargs):
+    return scheduler.call(url, lambda: scraper.get(url, **kwargs), status=lambda r: r.status_code)
+
 def test_cloudscraper_advanced():
     print("🔍 Расширенный тест cloudscraper...")
     
@@ -53,11 +61,8 @@ def test_cloudscraper_advanced():
                 'Cache-Control': 'max-age=0'
             })
             
-            # Добавляем задержку
-            time.sleep(random.uniform(1, 3))
-            
             print("🌐 Переходим на Meshok...")
-            response = scraper.get('https://meshok.net/good/252', timeout=30)
+            response = polite_get(scraper, 'https://meshok.net/good/252', timeout=30)
             
             print(f"✅ Статус: {response.status_code}")
             print(f"📄 Длина: {len(response.text)}")
@@ -94,7 +99,7 @@ def test_different_urls():
         print(f"\n🌐 Тестируем: {url}")
         
         try:
-            response = scraper.get(url, timeout=30)
+            response = polite_get(scraper, url, timeout=30)
             print(f"✅ Статус: {response.status_code}")
             print(f"📄 Длина: {len(response.text)}")
             